@@ -131,6 +131,26 @@ def create_app(config_name: str | None = None) -> Flask:
         print(f"[boot][WARN] lessons domain not registered: {e}")
         traceback.print_exc()
 
+    # ─────────────────────────────────────────────────────────────
+    # Background jobs (index rebuilds, audio pruning, deletes)
+    # ─────────────────────────────────────────────────────────────
+    if app.config.get("JOBS_ENABLED", True):
+        try:
+            from app import jobs
+            jobs.start(workers=app.config.get("JOBS_WORKERS", 1), path=app.config.get("JOBS_DB_PATH"))
+            print(f"[boot] job runner started ({jobs.db_path()})")
+        except Exception as e:
+            print(f"[boot][WARN] job runner not started; tasks will run inline: {e}")
+
+    # ─────────────────────────────────────────────────────────────
+    # CLI: flask content export-static
+    # ─────────────────────────────────────────────────────────────
+    try:
+        from app.static_export import content_cli
+        app.cli.add_command(content_cli)
+    except Exception as e:
+        print(f"[boot][WARN] content CLI not registered: {e}")
+
     # ─────────────────────────────────────────────────────────────
     # Health check
     # ─────────────────────────────────────────────────────────────
@@ -0,0 +1,434 @@
+# app/dictation_align.py
+from __future__ import annotations
+
+import math
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.exercise_grading import DICTATION_DEFAULTS, normalize_dictation
+
+"""
+Dictation alignment and scoring: the server-side counterpart of renderDiff()
+in static/js/ppx-dictation.js, without its quadratic table.
+
+The player fills a full (m+1) x (n+1) DP table per check, which is quadratic
+in memory and time for paragraph dictations. Here:
+  - align() is Hirschberg's algorithm (linear-memory edit distance: cost rows
+    are computed forwards and backwards, bit-parallel, and the problem is
+    split at the optimal midpoint); small sub-problems (<= BLOCK_CELLS cells)
+    use a full table with the player's tie-breaking. The word view aligns
+    word / space / punctuation tokens with it: tokens with equal keys match,
+    words left between matches pair up in order;
+  - player_align() reproduces the player's own character backtrace from
+    bit-parallel LCS rows kept at sqrt(m) checkpoints, so the diff, the extra
+    characters and the percentage pill are exactly the player's.
+Costs are the player's: match 0, substitution 2, insertion/deletion 1, or 0
+for punctuation when ignorePunctuation. Characters are grapheme clusters;
+keys honour ignoreCase/ignoreAccents, and a match whose raw characters
+differ is "soft" (accent/case).
+
+With those costs an optimal alignment matches exactly LCS(user, reference)
+characters (punctuation removed when ignored), so "X of Y characters
+correct" is also an LCS length (one big-int row, O(m*n/64) word operations).
+"""
+
+BLOCK_CELLS = 4096
+
+# Ops: ("m", i, j) key match, ("s", i, j) substitution, ("x", i, None) extra (learner only),
+# ("g", None, j) missing (reference only); i/j index the learner/reference sequence.
+Op = Tuple[str, Optional[int], Optional[int]]
+
+_JOINERS = frozenset("\u200d\ufe0e\ufe0f")  # zero-width joiner, variation selectors
+
+
+# ─────────────────────────────────────────────────────────────
+# Characters and tokens
+# ─────────────────────────────────────────────────────────────
+
+def graphemes(text: str) -> List[str]:
+    """Grapheme clusters, approximately: base character + combining marks / joiners / skin tones."""
+    out: List[str] = []
+    for ch in text:
+        if out and (unicodedata.combining(ch) or ch in _JOINERS or out[-1][-1] == "\u200d"
+                    or "\U0001F3FB" <= ch <= "\U0001F3FF"):
+            out[-1] += ch
+        else:
+            out.append(ch)
+    return out
+
+
+def _is_punct(g: str) -> bool:
+    # /[\p{P}\p{S}]/ on the cluster
+    return any(unicodedata.category(ch)[0] in "PS" for ch in g)
+
+
+def _key(s: str, opts: Dict[str, Any]) -> str:
+    if opts.get("ignoreCase"):
+        s = s.lower()
+    if opts.get("ignoreAccents"):
+        s = "".join(ch for ch in unicodedata.normalize("NFD", s) if not unicodedata.combining(ch))
+    return s
+
+
+class _Token:
+    __slots__ = ("kind", "chars", "text", "key")
+
+    def __init__(self, kind: str, chars: List[str], opts: Dict[str, Any]) -> None:
+        self.kind = kind      # "w" word, "s" space, "p" punctuation
+        self.chars = chars
+        self.text = "".join(chars)
+        self.key = (kind, _key(self.text, opts))
+
+
+def _tokens(chars: Sequence[str], opts: Dict[str, Any]) -> List[_Token]:
+    out: List[_Token] = []
+    run: List[str] = []
+    run_kind = ""
+    for g in chars:
+        kind = "s" if g.isspace() else ("p" if _is_punct(g) else "w")
+        if kind == run_kind and kind != "p":
+            run.append(g)
+            continue
+        if run:
+            out.append(_Token(run_kind, run, opts))
+        run, run_kind = [g], kind
+    if run:
+        out.append(_Token(run_kind, run, opts))
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# Linear-memory alignment (Hirschberg)
+# ─────────────────────────────────────────────────────────────
+
+def _lcs_bits(a_keys: Sequence[Any], b_keys: Sequence[Any]) -> int:
+    """
+    Bit-parallel LCS row (Hyyroe): bit j of the result is clear where the LCS
+    of a_keys vs b_keys[:j+1] grows, so LCS(a, b[:j]) = zeros among the low j bits.
+    """
+    masks: Dict[Any, int] = {}
+    for j, k in enumerate(b_keys):
+        masks[k] = masks.get(k, 0) | (1 << j)
+    full = (1 << len(b_keys)) - 1
+    v = full
+    for k in a_keys:
+        u = v & masks.get(k, 0)
+        v = ((v + u) | (v - u)) & full
+    return v
+
+
+def _cost_row(ak: Sequence[Any], ad: Sequence[int], bk: Sequence[Any], bi: Sequence[int]) -> List[int]:
+    """
+    Last row of the edit-distance table of ak vs bk, in one row of memory.
+
+    Indel costs are 0 or 1 and a substitution costs a deletion plus an
+    insertion, so cost(a, b[:j]) = weight(a) + weight(b[:j]) - 2 * LCS of the
+    weighted elements; the LCS row comes from _lcs_bits().
+    """
+    bw = [k for k, c in zip(bk, bi) if c]
+    v = _lcs_bits([k for k, c in zip(ak, ad) if c], bw)
+    bits = bin(v)[2:].zfill(len(bw))[::-1] if bw else ""
+    row = [0] * (len(bk) + 1)
+    base = acc = sum(ad)
+    lcs = w = 0
+    for j, c in enumerate(bi, 1):
+        if c:
+            acc += 1
+            lcs += bits[w] == "0"
+            w += 1
+        row[j] = acc - 2 * lcs
+    row[0] = base
+    return row
+
+
+def _table(ak: Sequence[Any], ad: Sequence[int], bk: Sequence[Any], bi: Sequence[int],
+           a0: int, b0: int, out: List[Op]) -> None:
+    """Full table + backtrace for a small block, with the player's tie-breaking (diagonal, then delete, then insert)."""
+    m, n = len(ak), len(bk)
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    bt = [[""] * (n + 1) for _ in range(m + 1)]
+    for i in range(1, m + 1):
+        dp[i][0] = dp[i - 1][0] + ad[i - 1]
+        bt[i][0] = "x"
+    for j in range(1, n + 1):
+        dp[0][j] = dp[0][j - 1] + bi[j - 1]
+        bt[0][j] = "g"
+    for i in range(1, m + 1):
+        ka, da, prev, cur, tags = ak[i - 1], ad[i - 1], dp[i - 1], dp[i], bt[i]
+        for j in range(1, n + 1):
+            if ka == bk[j - 1]:
+                best, tag = prev[j - 1], "m"
+            else:
+                best, tag = prev[j - 1] + 2, "s"
+            if prev[j] + da < best:
+                best, tag = prev[j] + da, "x"
+            if cur[j - 1] + bi[j - 1] < best:
+                best, tag = cur[j - 1] + bi[j - 1], "g"
+            cur[j] = best
+            tags[j] = tag
+    ops: List[Op] = []
+    i, j = m, n
+    while i > 0 or j > 0:
+        tag = bt[i][j]
+        if tag in ("m", "s"):
+            ops.append((tag, a0 + i - 1, b0 + j - 1))
+            i, j = i - 1, j - 1
+        elif tag == "x":
+            ops.append(("x", a0 + i - 1, None))
+            i -= 1
+        else:
+            ops.append(("g", None, b0 + j - 1))
+            j -= 1
+    ops.reverse()
+    out.extend(ops)
+
+
+def _hirschberg(ak: Sequence[Any], ad: Sequence[int], bk: Sequence[Any], bi: Sequence[int],
+                a0: int, b0: int, out: List[Op]) -> None:
+    m, n = len(ak), len(bk)
+    # Equal prefixes/suffixes are always part of an optimal alignment (learners are mostly right)
+    p = 0
+    while p < m and p < n and ak[p] == bk[p]:
+        out.append(("m", a0 + p, b0 + p))
+        p += 1
+    s = 0
+    while s < m - p and s < n - p and ak[m - 1 - s] == bk[n - 1 - s]:
+        s += 1
+    ak, ad, bk, bi = ak[p:m - s], ad[p:m - s], bk[p:n - s], bi[p:n - s]
+    a_off, b_off = a0 + p, b0 + p
+    if not ak:
+        out.extend(("g", None, b_off + j) for j in range(len(bk)))
+    elif not bk:
+        out.extend(("x", a_off + i, None) for i in range(len(ak)))
+    elif len(ak) * len(bk) <= BLOCK_CELLS or len(ak) == 1:
+        _table(ak, ad, bk, bi, a_off, b_off, out)
+    else:
+        mid = len(ak) // 2
+        fwd = _cost_row(ak[:mid], ad[:mid], bk, bi)
+        bwd = _cost_row(ak[:mid - 1:-1], ad[:mid - 1:-1], bk[::-1], bi[::-1])
+        n_core = len(bk)
+        split = min(range(n_core + 1), key=lambda j: fwd[j] + bwd[n_core - j])
+        _hirschberg(ak[:mid], ad[:mid], bk[:split], bi[:split], a_off, b_off, out)
+        _hirschberg(ak[mid:], ad[mid:], bk[split:], bi[split:], a_off + mid, b_off + split, out)
+    out.extend(("m", a0 + m - s + k, b0 + n - s + k) for k in range(s))
+
+
+def align(a_keys: Sequence[Any], a_del: Sequence[int], b_keys: Sequence[Any], b_ins: Sequence[int]) -> List[Op]:
+    """Optimal ops turning learner sequence a into reference b (costs: match 0, sub 2, indel per element)."""
+    out: List[Op] = []
+    _hirschberg(list(a_keys), list(a_del), list(b_keys), list(b_ins), 0, 0, out)
+    return out
+
+
+def edit_cost(ops: List[Op], a_del: Sequence[int], b_ins: Sequence[int]) -> int:
+    return sum(2 if op == "s" else a_del[i] if op == "x" else b_ins[j] if op == "g" else 0 for op, i, j in ops)
+
+
+def lcs_length(a_keys: Sequence[Any], b_keys: Sequence[Any]) -> int:
+    """Length of the longest common subsequence (bit-parallel, one int of len(b) bits)."""
+    return len(b_keys) - bin(_lcs_bits(a_keys, b_keys)).count("1")
+
+
+def player_align(a_keys: Sequence[Any], a_del: Sequence[int], b_keys: Sequence[Any], b_ins: Sequence[int]) -> List[Op]:
+    """
+    The player's own alignment: its backtrace from (m, n) (diagonal, then
+    extra, then missing on ties) over the same DP values, which are
+    weight(a[:i]) + weight(b[:j]) - 2 * LCS of the weighted elements. The LCS
+    rows come from the bit-parallel recurrence; every K-th row (K = sqrt of the
+    rows) is kept and a block of K rows is recomputed when the backtrace
+    reaches it, so memory is O(sqrt(m) * n) bits instead of the player's
+    (m+1) x (n+1) table. Costs must be 0 or 1, as in _cost_row().
+    """
+    m, n = len(a_keys), len(b_keys)
+    fa = [k for k, c in zip(a_keys, a_del) if c]
+    fb = [k for k, c in zip(b_keys, b_ins) if c]
+    pa, pb = [0] * (m + 1), [0] * (n + 1)
+    for i, c in enumerate(a_del, 1):
+        pa[i] = pa[i - 1] + c
+    for j, c in enumerate(b_ins, 1):
+        pb[j] = pb[j - 1] + c
+    masks: Dict[Any, int] = {}
+    for j, k in enumerate(fb):
+        masks[k] = masks.get(k, 0) | (1 << j)
+    full = (1 << len(fb)) - 1
+    step = max(1, math.isqrt(len(fa)))
+    checkpoints = {0: full}
+    v = full
+    for r, k in enumerate(fa, 1):
+        u = v & masks.get(k, 0)
+        v = ((v + u) | (v - u)) & full
+        if r % step == 0:
+            checkpoints[r] = v
+    block: Dict[int, int] = {}
+
+    def row(r: int) -> int:
+        if r not in block:
+            base = r - r % step
+            block.clear()
+            v = block[base] = checkpoints[base]
+            for t in range(base, min(base + step, len(fa))):
+                u = v & masks.get(fa[t], 0)
+                v = block[t + 1] = ((v + u) | (v - u)) & full
+        return block[r]
+
+    def dp(i: int, j: int) -> int:
+        c = pb[j]
+        return pa[i] + c - 2 * (c - bin(row(pa[i]) & ((1 << c) - 1)).count("1"))
+
+    ops: List[Op] = []
+    i, j = m, n
+    while i > 0 and j > 0:
+        row(pa[i - 1])  # load the block holding rows pa[i-1] and pa[i]
+        if a_keys[i - 1] == b_keys[j - 1]:
+            best, tag = dp(i - 1, j - 1), "m"
+        else:
+            best, tag = dp(i - 1, j - 1) + 2, "s"
+        cost = dp(i - 1, j) + a_del[i - 1]
+        if cost < best:
+            best, tag = cost, "x"
+        if dp(i, j - 1) + b_ins[j - 1] < best:
+            tag = "g"
+        if tag in ("m", "s"):
+            ops.append((tag, i - 1, j - 1))
+            i, j = i - 1, j - 1
+        elif tag == "x":
+            ops.append(("x", i - 1, None))
+            i -= 1
+        else:
+            ops.append(("g", None, j - 1))
+            j -= 1
+    ops.extend(("x", k, None) for k in range(i - 1, -1, -1))
+    ops.extend(("g", None, k) for k in range(j - 1, -1, -1))
+    ops.reverse()
+    return ops
+
+
+# ─────────────────────────────────────────────────────────────
+# Dictation scoring
+# ─────────────────────────────────────────────────────────────
+
+def _char_ops(user: Sequence[str], ref: Sequence[str], opts: Dict[str, Any], diff: List[List[Any]]) -> int:
+    """Align two grapheme runs and append the display runs to diff; returns the scored extra characters."""
+    free = bool(opts.get("ignorePunctuation"))
+    ad = [0 if free and _is_punct(g) else 1 for g in user]
+    bi = [0 if free and _is_punct(g) else 1 for g in ref]
+    extras = 0
+    for op, i, j in player_align([_key(g, opts) for g in user], ad, [_key(g, opts) for g in ref], bi):
+        if op == "m":
+            a, b = user[i], ref[j]
+            _push(diff, "match" if a == b else "soft", a, b)
+        elif op == "s":
+            _push(diff, "sub", user[i], ref[j])
+        elif op == "x":
+            _push(diff, "extra", user[i], "")
+            extras += ad[i]
+        else:
+            _push(diff, "miss", "", ref[j])
+    return extras
+
+
+def _push(diff: List[List[Any]], op: str, a: str, b: str) -> None:
+    # Consecutive characters with the same op become one run
+    if diff and diff[-1][0] == op:
+        diff[-1][1] += a
+        diff[-1][2] += b
+    else:
+        diff.append([op, a, b])
+
+
+def score_dictation(user: Any, transcript: Any, variants: Optional[Sequence[str]] = None,
+                    options: Optional[Dict[str, Any]] = None, attempt: int = 1) -> Dict[str, Any]:
+    """
+    Align a learner's dictation against the reference transcript.
+
+    Honours every dictation option validate_exercise() accepts:
+      ignoreCase / ignoreAccents   soft matches (same key, different characters)
+      ignorePunctuation            punctuation is free to skip and not scored
+      normalizeWhitespace          applies to "exact"; the diff, like the player's, is over the raw text
+      multiline                    when false, line breaks in the answer count as spaces
+      minCharsToEnableCheck        shorter answers are not checked ("checked": false)
+      attemptsMax / allowRetry     "locked" / "attempts_left" for this attempt number
+      autoPlay                     playback only; no effect on scoring
+    Returns exact (normalized equality with the transcript or a variant, the
+    grader's criterion), correct/total reference characters, extras (scored
+    extra characters) and score, the player's percentage pill
+    correct / (total + extras), word ops, and diff: display runs [op, learner text, reference text] with
+    op in match|soft|sub|miss|extra, as the player renders them.
+    """
+    opts = dict(DICTATION_DEFAULTS, **(options or {}))
+    user = str(user or "")
+    ref = str(transcript or "")
+    if not opts.get("multiline"):
+        user = user.replace("\r\n", " ").replace("\n", " ").replace("\r", " ")
+    max_attempts = int(opts.get("attemptsMax") or 0)
+    out: Dict[str, Any] = {
+        "locked": (not opts.get("allowRetry")) or (max_attempts > 0 and attempt >= max_attempts),
+        "attempts_left": None if max_attempts == 0 else max(0, max_attempts - attempt),
+    }
+    min_chars = int(opts.get("minCharsToEnableCheck") or 1)  # the player never checks an empty answer
+    if len(user.strip()) < min_chars:
+        out.update(checked=False, reason="too_short", min_chars=min_chars)
+        return out
+
+    norm_user = normalize_dictation(user, opts)
+    exact = bool(ref) and any(norm_user == normalize_dictation(r, opts) for r in [ref, *(variants or [])])
+
+    free = bool(opts.get("ignorePunctuation"))
+    ug, rg = graphemes(user), graphemes(ref)
+    ut, rt = _tokens(ug, opts), _tokens(rg, opts)
+    ops = align([t.key for t in ut], [0 if free and t.kind == "p" else 1 for t in ut],
+                [t.key for t in rt], [0 if free and t.kind == "p" else 1 for t in rt])
+
+    words: List[Dict[str, str]] = []
+    counts = {"match": 0, "soft": 0, "sub": 0, "miss": 0, "extra": 0}
+    diff: List[List[Any]] = []
+    gap_u: List[_Token] = []
+    gap_r: List[_Token] = []
+
+    def close_gap() -> None:
+        if not gap_u and not gap_r:
+            return
+        # Word view of the gap: words pair up in order, leftovers are extra/missing
+        wu = [t.text for t in gap_u if t.kind == "w" or (t.kind == "p" and not free)]
+        wr = [t.text for t in gap_r if t.kind == "w" or (t.kind == "p" and not free)]
+        for k in range(max(len(wu), len(wr))):
+            op = "sub" if k < len(wu) and k < len(wr) else ("extra" if k < len(wu) else "miss")
+            words.append({"op": op, "a": wu[k] if k < len(wu) else "", "b": wr[k] if k < len(wr) else ""})
+            counts[op] += 1
+        gap_u.clear()
+        gap_r.clear()
+
+    for op, i, j in ops:
+        if op != "m":
+            if i is not None:
+                gap_u.append(ut[i])
+            if j is not None:
+                gap_r.append(rt[j])
+            continue
+        close_gap()
+        a, b = ut[i], rt[j]
+        if b.kind != "s":
+            wop = "match" if a.text == b.text else "soft"
+            words.append({"op": wop, "a": a.text, "b": b.text})
+            counts[wop] += 1
+    close_gap()
+    extras = _char_ops(ug, rg, opts, diff)
+
+    # Scored characters: an optimal alignment matches exactly their LCS
+    uk = [_key(g, opts) for g in ug if not (free and _is_punct(g))]
+    rk = [_key(g, opts) for g in rg if not (free and _is_punct(g))]
+    correct = lcs_length(uk, rk)
+    total = len(rk)
+    out.update(
+        checked=True,
+        exact=exact,
+        correct=correct,
+        total=total,
+        extras=extras,
+        # The player's pill: correct / (reference + extra characters), Math.round
+        score=math.floor(100 * correct / (total + extras) + 0.5) if total + extras else 0,
+        counts=counts,
+        words=words,
+        diff=diff,
+    )
+    return out
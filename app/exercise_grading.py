@@ -0,0 +1,375 @@
+# app/exercise_grading.py
+from __future__ import annotations
+
+import html
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+"""
+Server-side grading for published exercises (tf, mcq, fitb, dnd, dictation),
+with the same rules as the browser players in static/js/ppx-*.js.
+
+Each exercise version is compiled once into a Grader holding only its answer
+key (tf answers, mcq correct-option sets per language, fitb blank option sets,
+dnd token -> column maps, normalized dictation references) and cached by the
+version's checksum, so grading a response is a dict lookup plus a comparison.
+
+Scores count the same units as the players' summaries: items for tf/mcq/
+dictation, blanks for fitb, tokens for dnd. Unanswered units count as wrong.
+"""
+
+GRADER_CACHE_SIZE = 1024
+MAX_SUBMISSIONS = 1000     # per POST /api/exercises/grade
+MAX_RESPONSES = 20000      # item responses per call, all submissions together
+MAX_ANSWER_CHARS = 2000    # text in one response's answer
+MAX_DIFF_ITEMS = 50        # responses per call in submissions asking for "diff"
+MAX_BODY_BYTES = 2 * 1024 * 1024
+
+_FITB_BLANK = re.compile(r"\*([^*]+)\*")
+_TAGS = re.compile(r"<[^>]*>")
+_SPACES = re.compile(r"\s+")
+
+# Player defaults (ppx-dictation.js); data.options overrides them
+DICTATION_DEFAULTS = {
+    "ignoreCase": True, "ignorePunctuation": True, "normalizeWhitespace": True, "ignoreAccents": True,
+    "minCharsToEnableCheck": 1, "allowRetry": False, "attemptsMax": 1, "autoPlay": False, "multiline": False,
+}
+
+
+# ─────────────────────────────────────────────────────────────
+# Normalization
+# ─────────────────────────────────────────────────────────────
+
+class _DropTable(dict):
+    """str.translate table deleting the characters for which `drop(ch)` is true; filled lazily."""
+
+    def __init__(self, drop: Callable[[str], bool]) -> None:
+        super().__init__()
+        self._drop = drop
+
+    def __missing__(self, code: int) -> Optional[int]:
+        value = None if self._drop(chr(code)) else code
+        self[code] = value
+        return value
+
+
+# \p{P}\p{S} and \p{Diacritic} in the player; combining marks after NFD stand in for the latter
+_PUNCT = _DropTable(lambda ch: unicodedata.category(ch)[0] in "PS")
+_MARKS = _DropTable(lambda ch: unicodedata.combining(ch) != 0)
+
+
+def normalize_dictation(text: Any, opts: Dict[str, Any]) -> str:
+    """ppx-dictation.js norm(): whitespace, case, accents, punctuation, in that order."""
+    s = str(text or "")
+    if opts.get("normalizeWhitespace"):
+        s = _SPACES.sub(" ", s).strip()
+    if opts.get("ignoreCase"):
+        s = s.lower()
+    if opts.get("ignoreAccents"):
+        s = unicodedata.normalize("NFD", s).translate(_MARKS)
+    if opts.get("ignorePunctuation"):
+        s = s.translate(_PUNCT)
+    return s
+
+
+def _plain_text(value: Any) -> str:
+    # element.textContent of the player's innerHTML
+    return html.unescape(_TAGS.sub("", str(value or "")))
+
+
+def _item_keys(item: Dict[str, Any], pos: int) -> List[str]:
+    """Names a response may use for an item: its id and its order (dictation items have no id)."""
+    keys = []
+    if item.get("id") not in (None, ""):
+        keys.append(str(item["id"]))
+    order = item.get("order")
+    keys.append(str(order if order not in (None, "") else pos + 1))
+    return keys
+
+
+# ─────────────────────────────────────────────────────────────
+# Compiled answer keys: compile_<type>(item) -> (key, units); grade_<type>(key, answer, lang) -> (earned, detail)
+# ─────────────────────────────────────────────────────────────
+
+def _compile_tf(item: Dict[str, Any], ex: Dict[str, Any]) -> Tuple[Any, int]:
+    return str(item.get("answer")).lower(), 1
+
+
+def _grade_tf(key: str, answer: Any, lang: str) -> Tuple[float, Optional[Dict[str, Any]]]:
+    if isinstance(answer, bool):
+        answer = "true" if answer else "false"
+    return (1.0 if str(answer).strip().lower() == key else 0.0), None
+
+
+def _mcq_correct(options: Any) -> frozenset:
+    return frozenset(i for i, o in enumerate(options or []) if isinstance(o, dict) and o.get("correct"))
+
+
+def _compile_mcq(item: Dict[str, Any], ex: Dict[str, Any]) -> Tuple[Any, int]:
+    # getOptions(): the UI language's array, then the other one, then "options"
+    es = item.get("options_es") or item.get("options_en") or item.get("options") or []
+    en = item.get("options_en") or item.get("options_es") or item.get("options") or []
+    return {"es": _mcq_correct(es), "en": _mcq_correct(en)}, 1
+
+
+def _grade_mcq(key: Dict[str, frozenset], answer: Any, lang: str) -> Tuple[float, Optional[Dict[str, Any]]]:
+    if not isinstance(answer, (list, tuple, set)):
+        answer = [answer]
+    try:
+        picked = frozenset(int(a) for a in answer if not isinstance(a, bool))
+    except (TypeError, ValueError):
+        return 0.0, None
+    return (1.0 if picked == key["en" if lang == "en" else "es"] else 0.0), None
+
+
+def _compile_fitb(item: Dict[str, Any], ex: Dict[str, Any]) -> Tuple[Any, int]:
+    # Blanks come from *a/b* markers in the text; item.blanks[i].options overrides each one
+    # (an empty list included, as in the player)
+    text = _plain_text(item.get("text") or item.get("text_es") or item.get("text_en") or "")
+    meta = item.get("blanks") if isinstance(item.get("blanks"), list) else []
+    blanks = []
+    for i, m in enumerate(_FITB_BLANK.finditer(text)):
+        opts = [s.strip() for s in m.group(1).split("/") if s.strip()]
+        override = meta[i].get("options") if i < len(meta) and isinstance(meta[i], dict) else None
+        if override not in (None, ""):
+            opts = override if isinstance(override, list) else [override]
+        blanks.append(frozenset(str(o).lower() for o in opts))
+    return tuple(blanks), len(blanks)
+
+
+def _grade_fitb(key: Tuple[frozenset, ...], answer: Any, lang: str) -> Tuple[float, Optional[Dict[str, Any]]]:
+    if not key:
+        return 0.0, None  # content-only step
+    if isinstance(answer, str):
+        answer = [answer]
+    if not isinstance(answer, (list, tuple)):
+        answer = []
+    marks = [str(answer[i] if i < len(answer) and answer[i] is not None else "").strip().lower() in opts
+             for i, opts in enumerate(key)]
+    return float(sum(marks)), {"blanks": marks}
+
+
+def _compile_dnd(item: Dict[str, Any], ex: Dict[str, Any]) -> Tuple[Any, int]:
+    tokens = {str(t["id"]): t.get("correct") for t in item.get("tokens") or [] if isinstance(t, dict) and t.get("id")}
+    return tokens, len(tokens)
+
+
+def _grade_dnd(key: Dict[str, Any], answer: Any, lang: str) -> Tuple[float, Optional[Dict[str, Any]]]:
+    # answer: {token id: column id}; unplaced tokens are wrong
+    placed = answer if isinstance(answer, dict) else {}
+    marks = {tok: bool(col) and placed.get(tok) == col for tok, col in key.items()}
+    return float(sum(marks.values())), {"tokens": marks}
+
+
+def _compile_dictation(item: Dict[str, Any], ex: Dict[str, Any]) -> Tuple[Any, int]:
+    opts = dict(DICTATION_DEFAULTS, **(ex.get("options") if isinstance(ex.get("options"), dict) else {}))
+    refs = frozenset()
+    if item.get("transcript"):
+        variants = item.get("variants") if isinstance(item.get("variants"), list) else []
+        refs = frozenset(normalize_dictation(r, opts) for r in [item["transcript"], *variants])
+    return (refs, opts, item.get("transcript"), item.get("variants") or []), 1
+
+
+def _grade_dictation(key: Tuple[frozenset, Dict[str, Any], Any, List[str]], answer: Any, lang: str) -> Tuple[float, Optional[Dict[str, Any]]]:
+    refs, opts = key[0], key[1]
+    return (1.0 if refs and normalize_dictation(answer, opts) in refs else 0.0), None
+
+
+_TYPES: Dict[str, Tuple[Callable, Callable]] = {
+    "tf": (_compile_tf, _grade_tf),
+    "mcq": (_compile_mcq, _grade_mcq),
+    "fitb": (_compile_fitb, _grade_fitb),
+    "dnd": (_compile_dnd, _grade_dnd),
+    "dictation": (_compile_dictation, _grade_dictation),
+}
+
+
+class Grader:
+    """Answer key of one exercise version."""
+
+    __slots__ = ("type", "slug", "version", "checksum", "total", "_items", "_grade")
+
+    def __init__(self, ex: Dict[str, Any]) -> None:
+        self.type = str(ex.get("type") or "")
+        if self.type not in _TYPES:
+            raise ValueError(f"no grader for exercise type {self.type!r}")
+        compile_item, self._grade = _TYPES[self.type]
+        self.slug = ex.get("slug")
+        self.version = f'{int(ex["version"]):03d}' if str(ex.get("version") or "").isdigit() else ex.get("version")
+        self.checksum = ex.get("checksum")
+        self._items: Dict[str, Tuple[str, Any, int]] = {}  # response key -> (item id, answer key, units)
+        units_all = counted = 0
+        for pos, item in enumerate(ex.get("items") or []):
+            if not isinstance(item, dict):
+                continue
+            key, units = compile_item(item, ex)
+            names = _item_keys(item, pos)
+            for name in names:
+                self._items.setdefault(name, (names[0], key, units))
+            units_all += units
+            counted += 1
+        # fitb with no blanks at all falls back to counting items, like the player summary
+        self.total = units_all or counted
+
+    def grade(self, responses: List[Dict[str, Any]], lang: str = "es", diff: bool = False) -> Dict[str, Any]:
+        """
+        responses: [{"item": id or order, "answer": ..., "attempt"?: n}]. The last
+        response for an item wins. Returns earned/total units, score (0-100) and
+        per-item results; with diff, dictation items also carry the character
+        alignment against the transcript (app/dictation_align.py).
+        """
+        latest: Dict[str, Any] = {}
+        unknown: List[Any] = []
+        for r in responses:
+            if not isinstance(r, dict):
+                continue
+            hit = self._items.get(str(r.get("item")))
+            if hit is None:
+                unknown.append(r.get("item"))
+                continue
+            latest[hit[0]] = (hit, r)
+        grade = self._grade
+        earned = 0.0
+        items = []
+        for item_id, ((_, key, units), r) in latest.items():
+            got, detail = grade(key, r.get("answer"), lang)
+            earned += got
+            row = {"item": item_id, "correct": got >= units if units else True,
+                   "score": round(got / units, 4) if units else 1.0}
+            if detail:
+                row.update(detail)
+            if diff and self.type == "dictation":
+                from app.dictation_align import score_dictation
+                attempt = r.get("attempt") if isinstance(r.get("attempt"), int) else 1
+                row["diff"] = score_dictation(r.get("answer"), key[2], key[3], key[1], attempt=attempt)
+            items.append(row)
+        out = {
+            "type": self.type,
+            "slug": self.slug,
+            "version": self.version,
+            "earned": earned,
+            "total": self.total,
+            "score": round(100 * earned / self.total) if self.total else 0,
+            "answered": len(items),
+            "items": items,
+        }
+        if unknown:
+            out["unknown_items"] = unknown
+        return out
+
+
+def compile_grader(ex: Dict[str, Any]) -> Grader:
+    return Grader(ex)
+
+
+# ─────────────────────────────────────────────────────────────
+# Cache (checksum -> Grader)
+# ─────────────────────────────────────────────────────────────
+
+_lock = threading.Lock()
+_graders: "OrderedDict[str, Grader]" = OrderedDict()
+_stats = {"hits": 0, "compiled": 0}
+
+
+def grader_for(ex_type: str, slug: str, version: Optional[str] = None) -> Optional[Grader]:
+    """
+    Grader for a published exercise: its current version, or an older version
+    that was published too. None if there is no such exercise/version.
+    """
+    from app.exercises_store import load_exercise, published_version
+    pub = published_version(ex_type, slug)
+    if not pub:
+        return None
+    ver = pub[0] if version in (None, "", "current") else str(version)
+    if len(ver) != 3 or not ver.isdigit() or ver > pub[0]:
+        return None
+    # Versions are immutable: the checksum (or, without one, the version path) names the key
+    cache_key = pub[1] if ver == pub[0] and pub[1] else f"{ex_type}/{slug}@{ver}"
+    with _lock:
+        g = _graders.get(cache_key)
+        if g is not None:
+            _graders.move_to_end(cache_key)
+            _stats["hits"] += 1
+            return g
+    ex = load_exercise(ex_type, slug, version=ver)
+    if not ex or str(ex.get("status") or "").lower() != "published" or ex.get("type") != ex_type:
+        return None
+    try:
+        g = Grader(ex)
+    except (ValueError, TypeError, KeyError):
+        return None
+    with _lock:
+        _graders[cache_key] = g
+        _stats["compiled"] += 1
+        while len(_graders) > GRADER_CACHE_SIZE:
+            _graders.popitem(last=False)
+    return g
+
+
+def cache_stats() -> Dict[str, int]:
+    with _lock:
+        return {"size": len(_graders), **_stats}
+
+
+# ─────────────────────────────────────────────────────────────
+# Batch grading
+# ─────────────────────────────────────────────────────────────
+
+def grade_submission(sub: Dict[str, Any], lang: str = "es") -> Dict[str, Any]:
+    """{"type", "slug", "version"?, "responses": [...], "lang"?, "diff"?} -> grade result or {"error"}."""
+    ex_type = str(sub.get("type") or "").strip()
+    slug = str(sub.get("slug") or "").strip()
+    g = grader_for(ex_type, slug, sub.get("version")) if ex_type in _TYPES and slug else None
+    if g is None:
+        return {"type": ex_type, "slug": slug, "error": "not_found"}
+    responses = sub.get("responses")
+    out = g.grade(responses if isinstance(responses, list) else [], str(sub.get("lang") or lang),
+                  diff=bool(sub.get("diff")))
+    if sub.get("id") is not None:
+        out["id"] = sub["id"]  # echoed so clients can match results to their attempts
+    return out
+
+
+def _answer_chars(answer: Any, budget: int) -> int:
+    """Characters of text in an answer (strings, list items, dict keys and values); stops past budget."""
+    if isinstance(answer, str):
+        return len(answer)
+    if isinstance(answer, dict):
+        answer = [*answer.keys(), *answer.values()]
+    if isinstance(answer, (list, tuple)):
+        n = 0
+        for part in answer:
+            n += _answer_chars(part, budget - n)
+            if n > budget:
+                break
+        return n
+    return 0 if answer is None else len(str(answer))
+
+
+def check_limits(submissions: List[Any]) -> Optional[str]:
+    """Why a batch of submissions is too large to grade, or None. Checked before any grading work."""
+    if len(submissions) > MAX_SUBMISSIONS:
+        return f"too many submissions (max {MAX_SUBMISSIONS})"
+    n_responses = n_diff = 0
+    for sub in submissions:
+        responses = sub.get("responses") if isinstance(sub, dict) else None
+        if not isinstance(responses, list):
+            continue
+        n_responses += len(responses)
+        if n_responses > MAX_RESPONSES:
+            return f"too many responses (max {MAX_RESPONSES})"
+        if sub.get("diff"):
+            n_diff += len(responses)
+            if n_diff > MAX_DIFF_ITEMS:
+                return f"too many responses with diff (max {MAX_DIFF_ITEMS})"
+        for r in responses:
+            if isinstance(r, dict) and _answer_chars(r.get("answer"), MAX_ANSWER_CHARS) > MAX_ANSWER_CHARS:
+                return f"answer too long (max {MAX_ANSWER_CHARS} characters)"
+    return None
+
+
+def grade_batch(submissions: List[Dict[str, Any]], lang: str = "es") -> List[Dict[str, Any]]:
+    return [grade_submission(s, lang) if isinstance(s, dict) else {"error": "invalid"} for s in submissions]
@@ -1,6 +1,7 @@
 # app/exercises_store.py
 from __future__ import annotations
-import os, json, re, hashlib, tempfile, shutil
+import os, json, re, gzip, hashlib, tempfile, shutil, threading, time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
@@ -11,6 +12,12 @@ try:
 except Exception:  # pragma: no cover
     current_app = None  # type: ignore
 
+try:
+    # POSIX advisory locks for index writers; without fcntl writes are not serialized across processes
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
 
 # ─────────────────────────────────────────────────────────────
 # Path helpers
@@ -20,12 +27,13 @@ def _app_root() -> str:
         return current_app.root_path
     return os.getcwd()
 
-def _base_dir() -> str:
+def _base_path() -> str:
     """
     Base directory for exercises, defaulting to <project_root>/data/exercises.
     If EXERCISES_DIR is set in Flask config:
       - absolute paths are used as-is
       - relative paths are resolved under <project_root>/data/
+    Pure path computation: read paths never create directories.
     """
     cfg = (getattr(current_app, "config", {}) or {}) if current_app else {}
     rel = cfg.get("EXERCISES_DIR", os.path.join("exercises"))  # default subdir under data/
@@ -35,7 +43,13 @@ def _base_dir() -> str:
     except Exception:
         # Fallback to previous behavior (rare)
         data_root = os.path.join(_app_root(), "data")
-    base = rel if os.path.isabs(rel) else os.path.join(data_root, rel)
+    return rel if os.path.isabs(rel) else os.path.join(data_root, rel)
+
+def _slug_path(ex_type: str, slug: str) -> str:
+    return os.path.join(_base_path(), ex_type, slug)
+
+def _base_dir() -> str:
+    base = _base_path()
     os.makedirs(base, exist_ok=True)
     return base
 
@@ -49,14 +63,15 @@ def _slug_dir(ex_type: str, slug: str) -> str:
     os.makedirs(p, exist_ok=True)
     return p
 
+# Files are written through _atomic_write (which creates parents), so these stay read-safe.
 def _index_path() -> str:
-    return os.path.join(_base_dir(), "index.json")
+    return os.path.join(_base_path(), "index.json")
 
 def _version_path(ex_type: str, slug: str, ver: str) -> str:
-    return os.path.join(_slug_dir(ex_type, slug), f"{ver}.json")
+    return os.path.join(_slug_path(ex_type, slug), f"{ver}.json")
 
 def _current_path(ex_type: str, slug: str) -> str:
-    return os.path.join(_slug_dir(ex_type, slug), "current.json")
+    return os.path.join(_slug_path(ex_type, slug), "current.json")
 
 
 # ─────────────────────────────────────────────────────────────
@@ -81,9 +96,10 @@ def _atomic_write(path: str, data: str) -> None:
             pass
 
 def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    # Shared stat-validated cache (app.storage.content_cache); returns a private copy
+    from app.storage import content_cache  # avoid early import loops
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return content_cache.load(path)
     except FileNotFoundError:
         return None
 
@@ -252,13 +268,14 @@ def validate_exercise(payload: Dict[str, Any]) -> Tuple[bool, List[str]]:
 # Versioning helpers
 # ─────────────────────────────────────────────────────────────
 def _list_versions(ex_type: str, slug: str) -> List[str]:
-    folder = _slug_dir(ex_type, slug)
+    folder = _slug_path(ex_type, slug)
     if not os.path.isdir(folder):
         return []
-    vers = []
+    vers = set()
     for name in os.listdir(folder):
-        if re.fullmatch(r"\d{3}\.json", name):
-            vers.append(name[:3])
+        # plain, reverse-delta and gzip-tier versions (see compact_history)
+        if re.fullmatch(r"\d{3}\.(?:json|delta\.json|json\.gz)", name):
+            vers.add(name[:3])
     return sorted(vers)
 
 def _next_version(ex_type: str, slug: str) -> str:
@@ -272,6 +289,559 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
 
+# ─────────────────────────────────────────────────────────────
+# Version history: reverse deltas + cold tier
+#   NNN.json        plain (always the latest and the current version)
+#   NNN.delta.json  {"format", "base": "MMM", "ops": [...]}: RFC 6902 ops turning
+#                   the next version MMM back into NNN
+#   NNN.json.gz     gzip of the original NNN.json (keyframe; also used when a
+#                   delta would not be smaller)
+# A run of deltas is cut by a keyframe every HISTORY_CHAIN_MAX versions, so
+# rebuilding any version applies at most that many patches.
+# ─────────────────────────────────────────────────────────────
+DELTA_FORMAT = "ppx-delta-v1"
+HISTORY_CHAIN_MAX = int(os.getenv("EXERCISES_HISTORY_CHAIN_MAX", "8"))
+
+def _delta_path(ex_type: str, slug: str, ver: str) -> str:
+    return os.path.join(_slug_path(ex_type, slug), f"{ver}.delta.json")
+
+def _cold_path(ex_type: str, slug: str, ver: str) -> str:
+    return os.path.join(_slug_path(ex_type, slug), f"{ver}.json.gz")
+
+def _ptr(path: str, key: Any) -> str:
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+def _json_diff(a: Any, b: Any, path: str = "") -> List[Dict[str, Any]]:
+    """JSON Patch ops turning a into b (dict keys by name; lists by common prefix/suffix)."""
+    if type(a) is not type(b):
+        return [{"op": "replace", "path": path, "value": b}]
+    if isinstance(a, dict):
+        ops = [{"op": "remove", "path": _ptr(path, k)} for k in a if k not in b]
+        for k, v in b.items():
+            if k not in a:
+                ops.append({"op": "add", "path": _ptr(path, k), "value": v})
+            elif a[k] != v:
+                ops.extend(_json_diff(a[k], v, _ptr(path, k)))
+        return ops
+    if isinstance(a, list):
+        n = min(len(a), len(b))
+        i = 0
+        while i < n and a[i] == b[i]:
+            i += 1
+        j = 0
+        while j < n - i and a[len(a) - 1 - j] == b[len(b) - 1 - j]:
+            j += 1
+        old, new = a[i:len(a) - j], b[i:len(b) - j]
+        common = min(len(old), len(new))
+        ops = []
+        for k in range(common):
+            ops.extend(_json_diff(old[k], new[k], _ptr(path, i + k)))
+        ops.extend({"op": "remove", "path": _ptr(path, i + common)} for _ in range(len(old) - common))
+        ops.extend({"op": "add", "path": _ptr(path, i + k), "value": new[k]} for k in range(common, len(new)))
+        return ops
+    return [] if a == b else [{"op": "replace", "path": path, "value": b}]
+
+def _json_patch(doc: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply _json_diff ops (add/remove/replace) to doc in place; returns the result."""
+    for op in ops:
+        if op["path"] == "":
+            doc = op.get("value")
+            continue
+        parts = [p.replace("~1", "/").replace("~0", "~") for p in op["path"].split("/")[1:]]
+        parent = doc
+        for p in parts[:-1]:
+            parent = parent[int(p)] if isinstance(parent, list) else parent[p]
+        last = parts[-1]
+        if isinstance(parent, list):
+            idx = len(parent) if last == "-" else int(last)
+            if op["op"] == "add":
+                parent.insert(idx, op["value"])
+            elif op["op"] == "remove":
+                del parent[idx]
+            else:
+                parent[idx] = op["value"]
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return doc
+
+def _load_version(ex_type: str, slug: str, ver: str, depth: int = 0) -> Optional[Dict[str, Any]]:
+    """Version NNN from whichever form it is stored in (plain, delta or gzip)."""
+    data = _read_json(_version_path(ex_type, slug, ver))
+    if data is not None:
+        return data
+    delta = _read_json(_delta_path(ex_type, slug, ver))
+    if delta is not None and delta.get("format") == DELTA_FORMAT and depth <= 4 * HISTORY_CHAIN_MAX:
+        base = _load_version(ex_type, slug, str(delta.get("base") or ""), depth + 1)
+        return None if base is None else _json_patch(base, delta.get("ops") or [])
+    try:
+        with gzip.open(_cold_path(ex_type, slug, ver), "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def _stored_size(ex_type: str, slug: str, ver: str) -> int:
+    for p in (_version_path(ex_type, slug, ver), _delta_path(ex_type, slug, ver), _cold_path(ex_type, slug, ver)):
+        try:
+            return os.path.getsize(p)
+        except OSError:
+            continue
+    return 0
+
+def compact_history(ex_type: str, slug: str) -> Dict[str, int]:
+    """
+    Convert plain older versions of one exercise into reverse deltas (or gzip
+    keyframes). The latest and the current version stay plain. Every
+    delta is verified by rebuilding the version in memory before it is
+    written; otherwise the version goes to the gzip tier. Returns {"versions", "converted", "bytes_before", "bytes_after"}.
+    """
+    vers = _list_versions(ex_type, slug)
+    cur = _read_json(_current_path(ex_type, slug)) or {}
+    keep = {vers[-1]} if vers else set()
+    if "version" in cur:
+        keep.add(f'{int(cur["version"]):03d}')
+    before = sum(_stored_size(ex_type, slug, v) for v in vers)
+    converted = 0
+    run = 0  # consecutive deltas directly below the version being looked at
+    for pos, ver in enumerate(vers):
+        plain = _version_path(ex_type, slug, ver)
+        if not os.path.exists(plain):
+            run = run + 1 if os.path.exists(_delta_path(ex_type, slug, ver)) else 0
+            continue
+        if ver in keep:
+            run = 0
+            continue
+        with open(plain, "rb") as f:
+            raw = f.read()
+        original = json.loads(raw)
+        nxt = vers[pos + 1]
+        delta = None
+        if run + 1 < HISTORY_CHAIN_MAX:
+            base = _load_version(ex_type, slug, nxt)
+            if base is not None:
+                ops = _json_diff(base, original)
+                # Verify before anything is written: the patch must rebuild this version exactly
+                if _json_patch(_load_version(ex_type, slug, nxt), ops) == original:
+                    delta = json.dumps({"format": DELTA_FORMAT, "base": nxt, "ops": ops}, ensure_ascii=False, separators=(",", ":"))
+        packed = gzip.compress(raw, mtime=0)
+        if delta is not None and len(delta.encode("utf-8")) < len(packed):
+            _atomic_write(_delta_path(ex_type, slug, ver), delta)
+            run += 1
+        else:
+            fd, tmp = tempfile.mkstemp(prefix=".ppx-", dir=os.path.dirname(plain))
+            with os.fdopen(fd, "wb") as f:
+                f.write(packed)
+            os.replace(tmp, _cold_path(ex_type, slug, ver))
+            run = 0
+        os.remove(plain)
+        converted += 1
+    after = sum(_stored_size(ex_type, slug, v) for v in vers)
+    return {"versions": len(vers), "converted": converted, "bytes_before": before, "bytes_after": after}
+
+def _job_compact_history(ex_type: str, slug: str) -> None:
+    compact_history(ex_type, slug)
+
+
+# ─────────────────────────────────────────────────────────────
+# Sharded index storage
+#   _index/<type>.snapshot.json   {"seq": N, "entries": {"type/slug": meta}} as of the last compaction
+#   _index/<type>.journal.jsonl   {"seq": N, "op": "base"}, then one {"seq", "op": "put"|"del",
+#                                 "key", "meta"} per line since the snapshot
+#   _index/.lock                  fcntl lock serializing writers and compaction
+#
+# A save appends one journal line (O(1) I/O whatever the library size);
+# compaction folds the journal into a new snapshot and restarts the journal
+# with a "base" line carrying the snapshot's seq. Readers take no lock: they merge snapshot + journal
+# tail, skip ops already in the snapshot and retry on a seq gap (a
+# compaction landed between the two reads). A legacy index.json is read as
+# is until the first write migrates it into shards (-> index.legacy.json).
+# ─────────────────────────────────────────────────────────────
+INDEX_DIRNAME = "_index"
+JOURNAL_COMPACT_OPS = int(os.getenv("EXERCISES_JOURNAL_COMPACT_OPS", "500"))
+
+def _index_dir() -> str:
+    return os.path.join(_base_path(), INDEX_DIRNAME)
+
+def _snapshot_path(ex_type: str) -> str:
+    return os.path.join(_index_dir(), f"{ex_type}.snapshot.json")
+
+def _journal_path(ex_type: str) -> str:
+    return os.path.join(_index_dir(), f"{ex_type}.journal.jsonl")
+
+def index_sources() -> List[str]:
+    """Files/directories the index is read from (legacy index.json and the shard directory)."""
+    return [_index_path(), _index_dir()]
+
+def _stat_sig(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _shard_types() -> List[str]:
+    found = set(VALID_TYPES)
+    try:
+        for name in os.listdir(_index_dir()):
+            if name.endswith(".snapshot.json") or name.endswith(".journal.jsonl"):
+                found.add(name.split(".", 1)[0])
+    except OSError:
+        pass
+    return sorted(found)
+
+@contextmanager
+def _index_write_lock():
+    """Exclusive lock for index writers (no-op where fcntl is unavailable)."""
+    os.makedirs(_index_dir(), exist_ok=True)
+    fd = os.open(os.path.join(_index_dir(), ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+_index_mutex = threading.RLock()  # guards _shards / _index_view within the process
+_shards: Dict[str, "_Shard"] = {}
+
+class _Shard:
+    """Merged state of one type's snapshot + journal, plus how far it was read."""
+    __slots__ = ("entries", "touched", "seq", "snap_seq", "snap_sig", "journal_ino", "offset")
+
+    def __init__(self) -> None:
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.touched: Dict[str, int] = {}  # key -> seq of its last journal op (lets views update incrementally)
+        self.seq = 0
+        self.snap_seq = 0
+        self.snap_sig: Optional[Tuple[int, int, int]] = None
+        self.journal_ino: Optional[int] = None
+        self.offset = 0
+
+def _read_journal(shard: _Shard, path: str) -> bool:
+    """
+    Apply journal ops after shard.offset/shard.seq. Returns False on a seq
+    gap. Only complete lines are consumed (an append may be in flight).
+    """
+    try:
+        with open(path, "rb") as f:
+            ino = os.fstat(f.fileno()).st_ino
+            if ino != shard.journal_ino:
+                shard.journal_ino, shard.offset = ino, 0
+            f.seek(shard.offset)
+            data = f.read()
+    except FileNotFoundError:
+        return True
+    end = data.rfind(b"\n") + 1
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            op = json.loads(line)
+            seq = int(op["seq"])
+        except Exception:
+            continue  # torn/corrupt line: skip it
+        if op.get("op") == "base":
+            if seq > shard.seq:
+                return False  # journal restarted after a snapshot newer than ours
+            continue
+        if seq <= shard.seq:
+            continue  # already folded into the snapshot
+        if seq != shard.seq + 1:
+            return False
+        if op.get("op") == "del":
+            shard.entries.pop(op.get("key"), None)
+        elif isinstance(op.get("meta"), dict):
+            shard.entries[op["key"]] = op["meta"]
+        shard.touched[op.get("key")] = seq
+        shard.seq = seq
+    shard.offset += end
+    return True
+
+def _load_shard(ex_type: str) -> _Shard:
+    for attempt in range(10):
+        shard = _Shard()
+        shard.snap_sig = _stat_sig(_snapshot_path(ex_type))
+        snap = _read_json(_snapshot_path(ex_type)) or {}
+        shard.entries = {k: v for k, v in (snap.get("entries") or {}).items() if isinstance(v, dict)}
+        shard.seq = shard.snap_seq = int(snap.get("seq") or 0)
+        if _read_journal(shard, _journal_path(ex_type)):
+            return shard
+        time.sleep(0.005 * (attempt + 1))  # a compaction is replacing snapshot + journal
+    shard.snap_sig = None  # best effort; the next refresh reloads
+    return shard
+
+def _refresh_shard(ex_type: str, shard: Optional[_Shard]) -> Tuple[_Shard, bool]:
+    """(current shard, changed). Reads only the journal tail when the snapshot is unchanged."""
+    if shard is not None and _stat_sig(_snapshot_path(ex_type)) == shard.snap_sig:
+        jsig = _stat_sig(_journal_path(ex_type))
+        if jsig is None and shard.journal_ino is None:
+            return shard, False
+        if jsig is not None and jsig[2] == shard.journal_ino:
+            if jsig[1] == shard.offset:
+                return shard, False
+            if jsig[1] > shard.offset:
+                before = shard.seq
+                if _read_journal(shard, _journal_path(ex_type)):
+                    return shard, shard.seq != before
+    return _load_shard(ex_type), True
+
+def _compact_shard_locked(ex_type: str, shard: _Shard) -> None:
+    """Fold the journal into a new snapshot (caller holds the write lock and a fresh shard)."""
+    snap = {"seq": shard.seq, "entries": shard.entries}
+    _atomic_write(_snapshot_path(ex_type), json.dumps(snap, ensure_ascii=False, separators=(",", ":")))
+    _atomic_write(_journal_path(ex_type), json.dumps({"seq": shard.seq, "op": "base"}) + "\n")
+    with _index_mutex:
+        _shards.pop(ex_type, None)
+
+def _current_shard(ex_type: str) -> Tuple[_Shard, bool]:
+    with _index_mutex:
+        shard, changed = _refresh_shard(ex_type, _shards.get(ex_type))
+        _shards[ex_type] = shard
+        return shard, changed
+
+def _migrate_legacy_locked() -> None:
+    """Split a legacy index.json into per-type snapshots (caller holds the write lock)."""
+    legacy = _index_path()
+    if not os.path.exists(legacy):
+        return
+    by_type: Dict[str, Dict[str, Any]] = {}
+    for key, meta in (_read_json(legacy) or {}).items():
+        if isinstance(meta, dict):
+            by_type.setdefault(key.split("/", 1)[0], {})[key] = meta
+    for ex_type, entries in by_type.items():
+        shard, _ = _current_shard(ex_type)
+        shard.entries.update(entries)
+        _compact_shard_locked(ex_type, shard)
+    os.replace(legacy, os.path.join(_base_path(), "index.legacy.json"))
+
+def _trim_torn_tail(path: str) -> None:
+    """
+    Cut a partial last line left by a writer that crashed mid-append (caller
+    holds the write lock). Appending after it would glue the next op onto the
+    fragment, readers would skip the combined line and its seq would be reused.
+    """
+    try:
+        with open(path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if not size:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            pos = size
+            while pos > 0:
+                step = min(4096, pos)
+                f.seek(pos - step)
+                nl = f.read(step).rfind(b"\n")
+                if nl >= 0:
+                    pos = pos - step + nl + 1
+                    break
+                pos -= step
+            f.truncate(pos)
+    except FileNotFoundError:
+        pass
+
+def _index_append(key: str, meta: Optional[Dict[str, Any]], soft_delete: bool = False) -> bool:
+    """
+    Journal one index change: put meta, delete (meta None), or mark the
+    current entry archived (soft_delete). Returns False if the key is missing
+    for a delete. Compacts the shard once its journal is long enough.
+    """
+    ex_type = key.split("/", 1)[0]
+    with _index_write_lock():
+        _migrate_legacy_locked()
+        shard, _ = _current_shard(ex_type)  # journal tail only; we are the sole writer now
+        if meta is None or soft_delete:
+            current = shard.entries.get(key)
+            if current is None:
+                return False
+            if soft_delete:
+                meta = dict(current, status="archived", updated_at=_now_iso())
+        op = {"seq": shard.seq + 1, "op": "put" if meta is not None else "del", "key": key, "meta": meta}
+        _trim_torn_tail(_journal_path(ex_type))
+        with open(_journal_path(ex_type), "a", encoding="utf-8") as f:
+            f.write(json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n")
+        if op["seq"] - shard.snap_seq >= JOURNAL_COMPACT_OPS:
+            shard, _ = _current_shard(ex_type)
+            _compact_shard_locked(ex_type, shard)
+    return True
+
+def compact_index(force: bool = False) -> Dict[str, int]:
+    """
+    Migrate a legacy index.json and compact every shard whose journal is
+    non-empty (force) or past JOURNAL_COMPACT_OPS. Returns {type: ops folded}.
+    """
+    out: Dict[str, int] = {}
+    with _index_write_lock():
+        _migrate_legacy_locked()
+        for ex_type in _shard_types():
+            shard, _ = _current_shard(ex_type)
+            pending = shard.seq - shard.snap_seq
+            if pending and (force or pending >= JOURNAL_COMPACT_OPS):
+                _compact_shard_locked(ex_type, shard)
+                out[ex_type] = pending
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# In-memory index
+#   One merged view of the shards per process, rebuilt when a shard's seq
+#   changes, with secondary indexes so listing/filtering is a set lookup.
+# ─────────────────────────────────────────────────────────────
+INDEXED_FIELDS = ("type", "status", "level")
+
+def _norm_field(field: str, value: Any) -> str:
+    """Normalized index key: status defaults to draft, level is upper-case, type lower-case."""
+    if field == "status":
+        return str(value or "draft").strip().lower()
+    if field == "level":
+        return str(value or "").strip().upper()
+    return str(value or "").strip().lower()
+
+class ExerciseIndex:
+    """
+    Read-only merged view of the index. entries/published are shared by every
+    request in the process: callers must not mutate them. A newer view is
+    derived with updated(), which copies only the buckets it touches.
+    """
+
+    def __init__(self, entries: Dict[str, Dict[str, Any]], generation: Any, sources: Optional[Dict[str, Tuple[Any, int]]] = None) -> None:
+        self.generation = generation
+        self.sources = sources or {}  # type -> (shard, seq) this view reflects
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.by_field: Dict[str, Dict[str, set]] = {f: {} for f in INDEXED_FIELDS}
+        self.by_tax: Dict[str, set] = {}  # every path prefix -> keys
+        self.published: Dict[str, Tuple[str, str]] = {}  # key -> (version, checksum)
+        self._owned: Optional[set] = None  # during updated(): ids of buckets already copied
+        for key, meta in entries.items():
+            self._link(key, meta)
+
+    @staticmethod
+    def _tax_prefixes(meta: Dict[str, Any]) -> set:
+        out = set()
+        for p in meta.get("taxonomy_paths") or []:
+            parts = [seg for seg in str(p).strip().strip("/").split("/") if seg]
+            for i in range(1, len(parts) + 1):
+                out.add("/".join(parts[:i]))
+        return out
+
+    def _bucket(self, mapping: Dict[str, set], value: str) -> set:
+        bucket = mapping.get(value)
+        if bucket is None:
+            bucket = mapping[value] = set()
+        elif self._owned is not None and id(bucket) not in self._owned:
+            bucket = mapping[value] = set(bucket)  # still shared with the previous view
+        else:
+            return bucket
+        if self._owned is not None:
+            self._owned.add(id(bucket))
+        return bucket
+
+    def _link(self, key: str, meta: Dict[str, Any]) -> None:
+        self.entries[key] = meta
+        for f in INDEXED_FIELDS:
+            self._bucket(self.by_field[f], _norm_field(f, meta.get(f))).add(key)
+        for prefix in self._tax_prefixes(meta):
+            self._bucket(self.by_tax, prefix).add(key)
+        if _norm_field("status", meta.get("status")) == "published":
+            ver = str(meta.get("version") or "")
+            if re.fullmatch(r"\d{3}", ver):
+                self.published[key] = (ver, str(meta.get("checksum") or ""))
+
+    def _unlink(self, key: str, meta: Dict[str, Any]) -> None:
+        self.entries.pop(key, None)
+        self.published.pop(key, None)
+        buckets = [(self.by_field[f], _norm_field(f, meta.get(f))) for f in INDEXED_FIELDS]
+        buckets += [(self.by_tax, prefix) for prefix in self._tax_prefixes(meta)]
+        for mapping, value in buckets:
+            if value in mapping:
+                bucket = self._bucket(mapping, value)
+                bucket.discard(key)
+                if not bucket:
+                    del mapping[value]
+
+    def updated(self, changes: Dict[str, Optional[Dict[str, Any]]], generation: Any, sources: Dict[str, Tuple[Any, int]]) -> "ExerciseIndex":
+        """New view with changes applied (meta None = removed); self is left untouched."""
+        new = ExerciseIndex.__new__(ExerciseIndex)
+        new.generation, new.sources = generation, sources
+        new.entries = dict(self.entries)
+        new.by_field = {f: dict(m) for f, m in self.by_field.items()}
+        new.by_tax = dict(self.by_tax)
+        new.published = dict(self.published)
+        new._owned = set()
+        for key, meta in changes.items():
+            old = new.entries.get(key)
+            if old is not None:
+                new._unlink(key, old)
+            if meta is not None:
+                new._link(key, meta)
+        new._owned = None
+        return new
+
+    def select(self, tax: Optional[str] = None, **fields: Any) -> List[str]:
+        """
+        Keys matching every given field (normalized comparison, see
+        _norm_field) and, if tax is set, having a taxonomy path equal to or
+        below it. Empty/None values do not filter. Sorted for stable output.
+        """
+        sets = []
+        for f, value in fields.items():
+            if f not in self.by_field:
+                raise KeyError(f"not an indexed field: {f}")
+            if value is None or value == "":
+                continue
+            sets.append(self.by_field[f].get(_norm_field(f, value), set()))
+        tax = (tax or "").strip().strip("/")
+        if tax:
+            sets.append(self.by_tax.get(tax, set()))
+        if not sets:
+            return sorted(self.entries)
+        sets.sort(key=len)
+        return sorted(sets[0].intersection(*sets[1:]))
+
+_index_view: Optional[ExerciseIndex] = None
+
+def exercise_index() -> ExerciseIndex:
+    """
+    Current in-memory index. generation identifies its content: per shard
+    (type, seq), or the legacy file's stat before migration.
+    """
+    global _index_view
+    with _index_mutex:
+        legacy = _index_path()
+        if os.path.exists(legacy):
+            gen: Any = ("legacy", _stat_sig(legacy))
+            if _index_view is None or _index_view.generation != gen:
+                raw = _read_json(legacy) or {}
+                _index_view = ExerciseIndex({k: v for k, v in raw.items() if isinstance(v, dict)}, gen)
+            return _index_view
+        sources = {t: (shard, shard.seq) for t, shard in ((t, _current_shard(t)[0]) for t in _shard_types())}
+        gen = tuple((t, seq) for t, (_, seq) in sources.items() if seq)
+        view = _index_view
+        if view is not None and view.generation == gen:
+            view.sources = sources  # same content; a compaction may have replaced the shard objects
+            return view
+        if view is not None and view.sources.keys() == sources.keys() and all(
+                view.sources[t][0] is shard for t, (shard, _) in sources.items()):
+            # Same shard objects, only journal tails read since: apply the touched keys
+            changes: Dict[str, Optional[Dict[str, Any]]] = {}
+            for t, (shard, _) in sources.items():
+                since = view.sources[t][1]
+                for key, seq in shard.touched.items():
+                    if seq > since:
+                        changes[key] = shard.entries.get(key)
+            _index_view = view.updated(changes, gen, sources)
+        else:
+            entries: Dict[str, Dict[str, Any]] = {}
+            for shard, _ in sources.values():
+                entries.update(shard.entries)
+            _index_view = ExerciseIndex(entries, gen, sources)
+        return _index_view
+
+
 # ─────────────────────────────────────────────────────────────
 # Public API
 # ─────────────────────────────────────────────────────────────
@@ -285,31 +855,44 @@ def load_exercise(ex_type: str, slug: str, version: str = "current") -> Optional
         if not cur or "version" not in cur:
             return None
         version = f'{int(cur["version"]):03d}'
-    path = _version_path(ex_type, slug, version)
-    return _read_json(path)
+    return _load_version(ex_type, slug, version)
 
 def list_exercises(filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
-    Returns index metadata dict. If filters provided, returns a filtered subset.
+    Returns index metadata dict. If filters provided, returns a filtered subset:
+    type/status/level use the normalized secondary indexes, "taxonomy_prefix"
+    matches a path or any descendant, other fields must match exactly.
+    Served from the in-memory index; the returned entries are copies.
     """
-    idx = _read_json(_index_path()) or {}
+    view = exercise_index()
     if not filters:
-        return idx
+        return {k: dict(v) for k, v in view.entries.items()}
+    filters = dict(filters)
+    tax = filters.pop("taxonomy_prefix", None)
+    keys = view.select(tax=tax, **{f: filters.pop(f) for f in INDEXED_FIELDS if f in filters})
     out = {}
-    for k, v in idx.items():
-        ok = True
-        for fk, fv in filters.items():
-            if v.get(fk) != fv:
-                ok = False
-                break
-        if ok:
-            out[k] = v
+    for k in keys:
+        v = view.entries[k]
+        if all(v.get(fk) == fv for fk, fv in filters.items()):
+            out[k] = dict(v)
     return out
 
+def index_version() -> Any:
+    """Hashable version of the index content; changes whenever an exercise is saved or deleted."""
+    return exercise_index().generation
+
+def published_versions() -> Dict[str, Tuple[str, str]]:
+    """Map of every published exercise to its current (version, checksum). Do not mutate."""
+    return exercise_index().published
+
+def published_version(ex_type: str, slug: str) -> Optional[Tuple[str, str]]:
+    """(version, checksum) of the current published version, or None if not published."""
+    return exercise_index().published.get(f"{ex_type}/{slug}")
+
 def save_exercise(payload: Dict[str, Any], user: str = "admin") -> Tuple[bool, List[str], Optional[Dict[str, Any]]]:
     """
     Validates and saves payload as the next immutable version, updates
-    current.json and global index.json. Returns (ok, errs, saved_payload).
+    current.json and appends the index entry. Returns (ok, errs, saved_payload).
     """
     ok, errs = validate_exercise(payload)
     if not ok:
@@ -337,11 +920,9 @@ def save_exercise(payload: Dict[str, Any], user: str = "admin") -> Tuple[bool, L
     # Update current pointer
     _atomic_write(_current_path(ex_type, slug), json.dumps({"version": version}, ensure_ascii=False))
 
-    # Update global index.json
-    idx_path = _index_path()
-    idx = _read_json(idx_path) or {}
+    # Journal the index entry (one append, whatever the library size)
     key = f"{ex_type}/{slug}"
-    idx[key] = {
+    _index_append(key, {
         "title_es": payload.get("title_es"),
         "title_en": payload.get("title_en"),
         "type": ex_type,
@@ -354,38 +935,39 @@ def save_exercise(payload: Dict[str, Any], user: str = "admin") -> Tuple[bool, L
         "status": payload.get("status", "draft"),
         "updated_at": _now_iso(),
         "checksum": payload["checksum"],
-    }
-    _atomic_write(idx_path, json.dumps(idx, ensure_ascii=False, indent=2))
+    })
+
+    # The previous version moves to the delta/gzip tier (runs inline when no job runner is active)
+    try:
+        from app import jobs
+        jobs.enqueue("exercises.compact_history", {"ex_type": ex_type, "slug": slug},
+                     dedupe_key=f"exercises.compact_history:{key}")
+    except Exception:
+        pass
 
     return True, [], payload
 
 def delete_exercise(ex_type: str, slug: str, hard: bool = False) -> bool:
     """
     Delete an exercise.
-    - Soft delete (default): mark as 'archived' in index.json, keep files.
+    - Soft delete (default): mark as 'archived' in the index, keep files.
     - Hard delete: remove all files and index entry entirely.
     """
-    idx_path = _index_path()
-    idx = _read_json(idx_path) or {}
     key = f"{ex_type}/{slug}"
-    if key not in idx:
+    if key not in exercise_index().entries:
         return False
 
     if hard:
         # Remove folder and index entry
-        folder = os.path.join(_type_dir(ex_type), slug)
+        folder = _slug_path(ex_type, slug)
         try:
-            shutil.rmtree(folder, ignore_errors=True)
+            from app import jobs
+            jobs.discard_tree(Path(folder))
         except Exception:
-            pass
-        idx.pop(key, None)
-    else:
-        # Soft delete
-        idx[key]["status"] = "archived"
-        idx[key]["updated_at"] = _now_iso()
-
-    _atomic_write(idx_path, json.dumps(idx, ensure_ascii=False, indent=2))
-    return True
+            shutil.rmtree(folder, ignore_errors=True)
+        return _index_append(key, None)
+    # Soft delete
+    return _index_append(key, None, soft_delete=True)
 
 def restore_exercise(ex_type: str, slug: str, version: str) -> Tuple[bool, Optional[str]]:
     """
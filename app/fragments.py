@@ -0,0 +1,87 @@
+# app/fragments.py
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+# ─────────────────────────────────────────────────────────────
+# Rendered-fragment cache (article bodies, module pages)
+# ─────────────────────────────────────────────────────────────
+
+class FragmentCache:
+    """
+    Process-wide LRU of rendered HTML fragments.
+
+    Entries are keyed by whatever identifies the fragment (slug, article
+    language, module slug, UI language, ...) and stored together with the
+    version of the content they were rendered from; a hit whose version
+    differs is re-rendered. Only content-derived markup belongs here: per-user
+    chrome (admin bar, i18n pencils, cookies) is rendered by the page on every
+    request around the cached fragment. The cache is bounded by the characters
+    it holds.
+    """
+
+    def __init__(self, max_chars: int = 16 * 1024 * 1024) -> None:
+        self.max_chars = max_chars
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Hashable, Tuple[Hashable, str]]" = OrderedDict()
+        self._chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_render(self, key: Hashable, version: Hashable, render: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Cached fragment for key at version, else render() (stored unless it
+        returns None, which callers use for "not found"). A None version
+        (content missing) always renders and is never cached.
+        """
+        if version is not None:
+            with self._lock:
+                item = self._items.get(key)
+                if item is not None and item[0] == version:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return item[1]
+                self.misses += 1
+        html = render()
+        if html is not None and version is not None:
+            self._store(key, version, html)
+        return html
+
+    def _store(self, key: Hashable, version: Hashable, html: str) -> None:
+        if len(html) > self.max_chars // 4:
+            return  # one fragment may not take over the cache
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._chars -= len(old[1])
+            self._items[key] = (version, html)
+            self._chars += len(html)
+            while self._chars > self.max_chars and self._items:
+                _, (_, dropped) = self._items.popitem(last=False)
+                self._chars -= len(dropped)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._chars = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "chars": self._chars,
+                "max_chars": self.max_chars,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+            }
+
+
+fragment_cache = FragmentCache(int(os.getenv("FRAGMENT_CACHE_MAX_CHARS", str(16 * 1024 * 1024))))
@@ -0,0 +1,620 @@
+# app/glossary_search.py
+from __future__ import annotations
+
+import html
+import math
+import re
+from array import array
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+"""
+Search structures used by the in-memory glossary index (app.glossary_store.GlossaryIndex).
+
+Everything here works on strings that are already normalized with
+glossary_store._norm (lowercase, accents stripped), except FullTextIndex,
+which is handed the normalizer. Nothing touches the disk.
+"""
+
+# -------------------------------
+# Trigram posting lists (substring search)
+# -------------------------------
+
+GRAM = 3
+
+
+def trigrams(text: str) -> Set[str]:
+    """Distinct overlapping trigrams of a normalized string (empty for strings shorter than 3)."""
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class TrigramIndex:
+    """
+    Inverted index trigram -> doc ids, used to narrow substring queries.
+
+    A query's trigrams must all occur in a matching document, so intersecting
+    their posting lists yields a candidate superset that the caller verifies
+    with a plain `in` check. Postings are compact int arrays; doc ids are never
+    reused, so removing or replacing a document only tombstones its old id and
+    the postings are compacted once tombstones outnumber live documents.
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, array] = {}
+        self.doc_keys: List[Optional[str]] = []
+        self.key_doc: Dict[str, int] = {}
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self.key_doc)
+
+    def add(self, key: str, texts: Iterable[str]) -> None:
+        """Index (or re-index) `key` under the union of the trigrams of `texts`."""
+        self.remove(key)
+        doc = len(self.doc_keys)
+        self.doc_keys.append(key)
+        self.key_doc[key] = doc
+        grams: Set[str] = set()
+        for text in texts:
+            if text:
+                grams |= trigrams(text)
+        postings = self.postings
+        for g in grams:
+            plist = postings.get(g)
+            if plist is None:
+                postings[g] = array("i", (doc,))
+            else:
+                plist.append(doc)
+
+    def remove(self, key: str) -> None:
+        doc = self.key_doc.pop(key, None)
+        if doc is None:
+            return
+        self.doc_keys[doc] = None
+        self.dead += 1
+        if self.dead > max(64, len(self.key_doc)):
+            self._compact()
+
+    def _compact(self) -> None:
+        remap: Dict[int, int] = {}
+        keys: List[Optional[str]] = []
+        for doc, key in enumerate(self.doc_keys):
+            if key is not None:
+                remap[doc] = len(keys)
+                keys.append(key)
+        postings: Dict[str, array] = {}
+        for g, plist in self.postings.items():
+            kept = array("i", (remap[d] for d in plist if d in remap))
+            if kept:
+                postings[g] = kept
+        self.postings = postings
+        self.doc_keys = keys
+        self.key_doc = {key: doc for doc, key in enumerate(keys) if key is not None}
+        self.dead = 0
+
+    def candidates(self, query: str) -> Optional[Set[str]]:
+        """
+        Keys whose indexed texts contain every trigram of `query`.
+        Returns None when the query is too short to use the index (caller scans).
+        """
+        grams = trigrams(query)
+        if not grams:
+            return None
+        # Local references: a concurrent _compact() swaps both objects together
+        postings, keys = self.postings, self.doc_keys
+        lists = []
+        for g in grams:
+            plist = postings.get(g)
+            if not plist:
+                return set()
+            lists.append(plist)
+        lists.sort(key=len)
+        docs = set(lists[0])
+        for plist in lists[1:]:
+            docs.intersection_update(plist)
+            if not docs:
+                break
+        return {keys[d] for d in docs if keys[d] is not None}
+
+
+# -------------------------------
+# Sense facet bitmaps (list filters)
+# -------------------------------
+
+FACETS = ("countries", "pos", "register", "freq", "status", "sensitivity", "domain", "tone")
+
+
+def _facet_tokens(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        return (value,)
+    if isinstance(value, (set, frozenset, list, tuple)):
+        return [v for v in value if isinstance(v, str)]
+    return ()
+
+
+def mask_of(bits: Iterable[int], size: int) -> int:
+    """Bitmap (Python int) with the given bit positions set; built in one pass."""
+    buf = bytearray((size >> 3) + 1)
+    for b in bits:
+        buf[b >> 3] |= 1 << (b & 7)
+    return int.from_bytes(buf, "little")
+
+
+def bits_of(mask: int) -> List[int]:
+    """Positions of the set bits of mask, ascending."""
+    out: List[int] = []
+    if mask <= 0:
+        return out
+    s = format(mask, "b")[::-1]
+    i = s.find("1")
+    while i != -1:
+        out.append(i)
+        i = s.find("1", i + 1)
+    return out
+
+
+class FacetIndex:
+    """
+    Per-sense bitmaps keyed by (facet, token), one bit per sense.
+
+    "Some sense of the entry matches every filter" becomes: OR the bitmaps of
+    the requested tokens within a facet, AND across facets, then map the
+    surviving bits back to entry keys. Bitmaps are plain Python ints. Removed
+    senses are only cleared from `live`; their bits are dropped when the index
+    is rebuilt once dead senses outnumber live ones.
+    """
+
+    def __init__(self) -> None:
+        self.bitmaps: Dict[str, Dict[str, int]] = {f: {} for f in FACETS}
+        self.sense_keys: List[Optional[str]] = []
+        self.sense_rows: List[Optional[Dict[str, Any]]] = []
+        self.key_bits: Dict[str, List[int]] = {}
+        self.live = 0
+        self.dead = 0
+
+    def load(self, entries: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> None:
+        """Bulk build from (key, sense facet rows); bitmaps are assembled once at the end."""
+        positions: Dict[str, Dict[str, List[int]]] = {f: {} for f in FACETS}
+        keys: List[Optional[str]] = []
+        rows: List[Optional[Dict[str, Any]]] = []
+        key_bits: Dict[str, List[int]] = {}
+        for key, senses in entries:
+            bits = key_bits[key] = []
+            for row in senses:
+                bit = len(keys)
+                keys.append(key)
+                rows.append(row)
+                bits.append(bit)
+                for facet in FACETS:
+                    for tok in _facet_tokens(row.get(facet)):
+                        positions[facet].setdefault(tok, []).append(bit)
+        size = len(keys)
+        self.bitmaps = {f: {tok: mask_of(b, size) for tok, b in positions[f].items()} for f in FACETS}
+        self.sense_keys, self.sense_rows, self.key_bits = keys, rows, key_bits
+        self.live = mask_of(range(size), size)
+        self.dead = 0
+
+    def add(self, key: str, senses: List[Dict[str, Any]]) -> None:
+        self.remove(key)
+        bits = self.key_bits[key] = []
+        for row in senses:
+            bit = len(self.sense_keys)
+            self.sense_keys.append(key)
+            self.sense_rows.append(row)
+            bits.append(bit)
+            flag = 1 << bit
+            for facet in FACETS:
+                table = self.bitmaps[facet]
+                for tok in _facet_tokens(row.get(facet)):
+                    table[tok] = table.get(tok, 0) | flag
+            self.live |= flag
+
+    def remove(self, key: str) -> None:
+        bits = self.key_bits.pop(key, None)
+        if bits is None:
+            return
+        for bit in bits:
+            self.live &= ~(1 << bit)
+            self.sense_keys[bit] = None
+            self.sense_rows[bit] = None
+        self.dead += len(bits)
+        if self.dead > max(256, len(self.sense_keys) - self.dead):
+            rows = self.sense_rows
+            self.load((k, [rows[b] for b in kbits]) for k, kbits in list(self.key_bits.items()))
+
+    def scope(self, keys: Iterable[str]) -> int:
+        """Bitmap of the live senses belonging to keys."""
+        key_bits = self.key_bits
+        return mask_of((b for k in keys for b in key_bits.get(k, ())), len(self.sense_keys)) & self.live
+
+    def _union(self, facet: str, tokens: Iterable[str]) -> int:
+        table = self.bitmaps.get(facet) or {}
+        out = 0
+        for tok in tokens:
+            out |= table.get(tok, 0)
+        return out
+
+    def match(self, filters: Dict[str, Set[str]], scope: Optional[int] = None) -> int:
+        """Bitmap of senses (within scope) matching every non-empty facet filter."""
+        mask = self.live if scope is None else scope
+        for facet, tokens in filters.items():
+            if tokens and mask:
+                mask &= self._union(facet, tokens)
+        return mask
+
+    def keys(self, mask: int) -> Set[str]:
+        """Entry keys owning at least one sense in mask."""
+        sense_keys = self.sense_keys
+        return {sense_keys[b] for b in bits_of(mask)} - {None}
+
+    def counts(self, filters: Dict[str, Set[str]], scope: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Entries per facet token within scope. Each facet is counted with the
+        filters of the other facets applied, i.e. how many entries the result
+        would hold with that token selected in its facet.
+        """
+        base = self.live if scope is None else scope
+        unions = {f: self._union(f, t) for f, t in filters.items() if t}
+        out: Dict[str, Dict[str, int]] = {}
+        for facet in FACETS:
+            mask = base
+            for other, u in unions.items():
+                if other != facet:
+                    mask &= u
+            row: Dict[str, int] = {}
+            if mask:
+                for tok, bm in list(self.bitmaps[facet].items()):
+                    hit = mask & bm
+                    if hit:
+                        row[tok] = len(self.keys(hit))
+            out[facet] = row
+        return out
+
+
+# -------------------------------
+# Edit-distance lookup (typo-tolerant search)
+# -------------------------------
+
+def distance_to(pattern: str) -> Callable[[str], int]:
+    """
+    Levenshtein distance from a fixed pattern to any text, using the Myers /
+    Hyyrö bit-parallel algorithm: one column of the DP matrix is a pair of int
+    bit-vectors, so each text character costs a handful of int operations
+    instead of len(pattern) cell updates.
+    """
+    m = len(pattern)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1) if m else 0
+
+    def dist(text: str) -> int:
+        if not m:
+            return len(text)
+        pv, mv, score = mask, 0, m
+        for ch in text:
+            eq = peq.get(ch, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | ~(xh | pv)
+            mh = pv & xh
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
+            ph = (ph << 1) | 1
+            mh <<= 1
+            pv = (mh | ~(xv | ph)) & mask
+            mv = ph & xv & mask
+        return score
+
+    return dist
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Edit distance (insert/delete/substitute, cost 1 each)."""
+    if a == b:
+        return 0
+    return distance_to(a)(b)
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over terms with the Levenshtein metric.
+
+    Children are keyed by their distance to the parent; the triangle inequality
+    means a query with tolerance k only descends into children keyed d-k..d+k,
+    so most of the tree is skipped for small k.
+    """
+
+    def __init__(self) -> None:
+        self.root: Optional[list] = None  # [term, {distance: child}]
+        self.size = 0
+
+    def add(self, term: str) -> None:
+        if self.root is None:
+            self.root = [term, {}]
+            self.size = 1
+            return
+        node = self.root
+        dist = distance_to(term)
+        while True:
+            d = dist(node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = [term, {}]
+                self.size += 1
+                return
+            node = child
+
+    def search(self, query: str, max_dist: int) -> List[Tuple[int, str]]:
+        """(distance, term) pairs within max_dist of query."""
+        out: List[Tuple[int, str]] = []
+        if self.root is None:
+            return out
+        dist = distance_to(query)
+        stack = [self.root]
+        while stack:
+            term, children = stack.pop()
+            d = dist(term)
+            if d <= max_dist:
+                out.append((d, term))
+            lo, hi = d - max_dist, d + max_dist
+            for k, child in children.items():
+                if lo <= k <= hi:
+                    stack.append(child)
+        return out
+
+
+class FuzzyIndex:
+    """
+    Term -> keys map behind a BKTree. Terms that no key uses any more stay in
+    the tree (BK-trees cannot delete) and are skipped at query time; the tree is
+    rebuilt once they outnumber the live terms.
+    """
+
+    def __init__(self) -> None:
+        self.tree = BKTree()
+        self.term_keys: Dict[str, Set[str]] = {}
+        self.key_terms: Dict[str, Set[str]] = {}
+        self.dead = 0
+
+    def add(self, key: str, terms: Iterable[str]) -> None:
+        self.remove(key)
+        own = self.key_terms[key] = {t for t in terms if t}
+        for term in own:
+            keys = self.term_keys.get(term)
+            if keys is None:
+                self.term_keys[term] = {key}
+                self.tree.add(term)
+            else:
+                if not keys:
+                    self.dead -= 1
+                keys.add(key)
+
+    def remove(self, key: str) -> None:
+        for term in self.key_terms.pop(key, ()):
+            keys = self.term_keys.get(term)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    self.dead += 1
+        if self.dead > max(256, len(self.term_keys) - self.dead):
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        tree = BKTree()
+        term_keys = {t: keys for t, keys in self.term_keys.items() if keys}
+        for term in term_keys:
+            tree.add(term)
+        self.tree, self.term_keys, self.dead = tree, term_keys, 0
+
+    def search(self, query: str, max_dist: int) -> Dict[str, Tuple[int, str]]:
+        """Best (distance, term) per key for terms within max_dist of query."""
+        best: Dict[str, Tuple[int, str]] = {}
+        term_keys = self.term_keys
+        for d, term in self.tree.search(query, max_dist):
+            for key in tuple(term_keys.get(term) or ()):
+                if key not in best or (d, term) < best[key]:
+                    best[key] = (d, term)
+        return best
+
+
+# -------------------------------
+# Sorted prefix keys (autocomplete)
+# -------------------------------
+
+class PrefixIndex:
+    """
+    Sorted (term, key) pairs; completions of a prefix are one bisect plus a
+    forward walk. Updates rebuild the list and swap it in, so readers never see
+    a half-updated list.
+    """
+
+    def __init__(self) -> None:
+        self.pairs: List[Tuple[str, str]] = []
+        self.key_terms: Dict[str, List[str]] = {}
+
+    def load(self, entries: Iterable[Tuple[str, Iterable[str]]]) -> None:
+        key_terms = {key: sorted({t for t in terms if t}) for key, terms in entries}
+        self.pairs = sorted((t, key) for key, terms in key_terms.items() for t in terms)
+        self.key_terms = key_terms
+
+    def add(self, key: str, terms: Iterable[str]) -> None:
+        new = sorted({t for t in terms if t})
+        if self.key_terms.get(key) == new:
+            return
+        pairs = [p for p in self.pairs if p[1] != key] if key in self.key_terms else list(self.pairs)
+        for t in new:
+            insort(pairs, (t, key))
+        self.key_terms[key] = new
+        self.pairs = pairs
+
+    def remove(self, key: str) -> None:
+        if self.key_terms.pop(key, None) is not None:
+            self.pairs = [p for p in self.pairs if p[1] != key]
+
+    def complete(
+        self,
+        prefix: str,
+        limit: int,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, str]]:
+        """Up to limit (term, key) pairs with term starting with prefix, one per key, in term order."""
+        pairs = self.pairs
+        out: List[Tuple[str, str]] = []
+        seen: Set[str] = set()
+        i = bisect_left(pairs, (prefix,))
+        n = len(pairs)
+        while i < n and len(out) < limit:
+            term, key = pairs[i]
+            if not term.startswith(prefix):
+                break
+            i += 1
+            if key in seen or (accept is not None and not accept(key)):
+                continue
+            seen.add(key)
+            out.append((term, key))
+        return out
+
+
+# -------------------------------
+# Full-text index (BM25 ranking)
+# -------------------------------
+
+FULLTEXT_VERSION = 1
+WORD_RE = re.compile(r"\w+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Term frequency multiplier per field: headword and alt forms outrank body text
+FIELD_WEIGHTS = {
+    "word": 3,
+    "alt_form": 2,
+    "equivalent_en": 2,
+    "definition_es": 1,
+    "definition_en": 1,
+    "example_es": 1,
+    "example_en": 1,
+}
+
+
+class FullTextIndex:
+    """
+    BM25 inverted index over plain-text fields of each document.
+
+    Documents are lists of [field, sense_index, text] with HTML already
+    stripped; the texts are kept for snippets. The state is a JSON-ready
+    payload (postings term -> {key: weighted tf}, per-doc length and texts), so
+    it can be persisted as-is and reloaded without re-tokenizing anything.
+    `normalize` must be the same folding used for queries (glossary _norm).
+    """
+
+    def __init__(self, normalize: Callable[[str], str], payload: Optional[Dict[str, Any]] = None) -> None:
+        self.normalize = normalize
+        payload = payload or {}
+        self.postings: Dict[str, Dict[str, int]] = payload.get("postings") or {}
+        self.docs: Dict[str, Dict[str, Any]] = payload.get("docs") or {}
+        self.total_len = int(payload.get("total_len") or 0)
+
+    @staticmethod
+    def valid_payload(payload: Any) -> bool:
+        return (
+            isinstance(payload, dict)
+            and payload.get("version") == FULLTEXT_VERSION
+            and isinstance(payload.get("postings"), dict)
+            and isinstance(payload.get("docs"), dict)
+        )
+
+    def payload(self) -> Dict[str, Any]:
+        return {
+            "version": FULLTEXT_VERSION,
+            "total_len": self.total_len,
+            "postings": self.postings,
+            "docs": self.docs,
+        }
+
+    def tokens(self, text: str) -> List[str]:
+        return WORD_RE.findall(self.normalize(text))
+
+    def _term_freqs(self, texts: List[List[Any]]) -> Dict[str, int]:
+        tf: Dict[str, int] = {}
+        for field, _sense, text in texts:
+            weight = FIELD_WEIGHTS.get(field, 1)
+            for tok in self.tokens(text):
+                tf[tok] = tf.get(tok, 0) + weight
+        return tf
+
+    def add(self, key: str, texts: List[List[Any]]) -> None:
+        self.remove(key)
+        tf = self._term_freqs(texts)
+        for term, n in tf.items():
+            self.postings.setdefault(term, {})[key] = n
+        length = sum(tf.values())
+        self.docs[key] = {"len": length, "texts": texts}
+        self.total_len += length
+
+    def remove(self, key: str) -> None:
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        for term in self._term_freqs(doc.get("texts") or []):
+            plist = self.postings.get(term)
+            if plist is not None:
+                plist.pop(key, None)
+                if not plist:
+                    del self.postings[term]
+        self.total_len -= int(doc.get("len") or 0)
+
+    def search(self, query: str) -> List[Tuple[float, str]]:
+        """(score, key) for documents containing any query term, best first."""
+        terms = set(self.tokens(query))
+        n_docs = len(self.docs)
+        if not terms or not n_docs:
+            return []
+        avgdl = (self.total_len / n_docs) or 1.0
+        scores: Dict[str, float] = {}
+        for term in terms:
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            idf = math.log(1.0 + (n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+            for key, tf in plist.items():
+                dl = (self.docs.get(key) or {}).get("len") or 0
+                norm = BM25_K1 * (1.0 - BM25_B + BM25_B * dl / avgdl)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+        return sorted(((s, k) for k, s in scores.items()), key=lambda p: (-p[0], p[1]))
+
+    def snippet(self, key: str, query: str, width: int = 160) -> Optional[Dict[str, Any]]:
+        """
+        HTML-escaped excerpt of the text with the most query-term hits, hits
+        wrapped in <mark>. Returns {field, sense, html} or None.
+        """
+        terms = set(self.tokens(query))
+        best = None
+        for field, sense, text in (self.docs.get(key) or {}).get("texts") or []:
+            hits = [m for m in WORD_RE.finditer(text) if self.normalize(m.group()) in terms]
+            if hits and (best is None or len(hits) > len(best[3])):
+                best = (field, sense, text, hits)
+        if best is None:
+            return None
+        field, sense, text, hits = best
+        start = max(0, hits[0].start() - width // 3)
+        if start:
+            start = text.rfind(" ", 0, start) + 1  # do not cut the leading word
+        end = min(len(text), start + width)
+        if end < len(text) and text.find(" ", end) != -1:
+            end = text.find(" ", end)
+        parts = ["…" if start > 0 else ""]
+        pos = start
+        for m in hits:
+            if m.start() < pos or m.end() > end:
+                continue
+            parts.append(html.escape(text[pos:m.start()]))
+            parts.append("<mark>" + html.escape(m.group()) + "</mark>")
+            pos = m.end()
+        parts.append(html.escape(text[pos:end]))
+        parts.append("…" if end < len(text) else "")
+        return {"field": field, "sense": sense, "html": "".join(parts)}
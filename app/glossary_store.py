@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 import re
+import threading
 import unicodedata
+from html import unescape
+from bisect import bisect_left
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Iterable
-import shutil
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set, Tuple, Iterable, Iterator
+import os
 import shutil
 
+try:
+    # POSIX advisory lock serializing artifact writers across processes (gunicorn workers, job runners)
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
 from app.storage import get_data_root, get_project_root, read_json, write_json
+from app.glossary_search import FacetIndex, FullTextIndex, FuzzyIndex, PrefixIndex, TrigramIndex
 from app.pos_catalog import canonicalize, POS_VALUES as CANONICAL_POS_VALUES
 
 # -------------------------------
@@ -187,17 +198,25 @@ def make_slug(text: str) -> str:
 
 
 def slug_exists(slug: str) -> bool:
-    try:
-        return entry_path(slug).exists()
-    except Exception:
-        return False
-
-
-def unique_slug(text: str) -> str:
+    """Whether slug is taken, from the in-memory slug set (no filesystem probe)."""
+    with _DEFER_LOCK:
+        pending = _DEFER["pending"]
+        if slug in pending:
+            return pending[slug] is not None
+        deferring = bool(_DEFER["depth"])
+    # During a bulk import the entries dir changes on every row; use the index as
+    # built before the import (plus the pending writes above) instead of rebuilding it.
+    index = _INDEX if deferring and _INDEX is not None else get_index()
+    return slug in index.metas
+
+
+def unique_slug(text: str, reserved: Optional[Iterable[str]] = None) -> str:
+    """Slug for text that is not taken (nor in `reserved`, e.g. slugs allocated earlier in a batch)."""
     base = make_slug(text)
+    taken = reserved if reserved is not None else ()
     s = base
     i = 2
-    while slug_exists(s):
+    while s in taken or slug_exists(s):
         s = f"{base}-{i}"
         i += 1
     return s
@@ -290,15 +309,43 @@ def save_entry(payload: Dict[str, Any]) -> Tuple[bool, List[str]]:
     ok, errs = validate_entry(data)
     if not ok:
         return False, errs
+    if _defer_record(data["slug"], data):
+        # Inside deferred_indexes(): prune + index rebuild happen once on exit
+        if not write_json(entry_path(data["slug"]), data, pretty=True):
+            return False, ["Failed to write entry JSON"]
+        return True, []
     if not write_json(entry_path(data["slug"]), data, pretty=True):
         return False, ["Failed to write entry JSON"]
-    # Prune orphaned audio files (entry + examples) to match current payload
-    _prune_audio_files(data["slug"], data)
+    _index_upsert(data)
+    # Orphaned audio pruning + derived index files run as background jobs (app.jobs)
+    _enqueue_entry_jobs(data["slug"], prune=True)
+    return True, []
+
+
+def _enqueue_entry_jobs(slug: str, prune: bool = False) -> None:
+    """Queue the on-disk follow-up work for one changed entry (best-effort)."""
+    from app import jobs
     try:
-        _update_indexes()
+        if prune:
+            jobs.enqueue("glossary.prune_audio", {"slug": slug}, dedupe_key=f"glossary.prune_audio:{slug}")
+        jobs.enqueue("glossary.update_entry_indexes", {"slug": slug}, dedupe_key=f"glossary.update_entry_indexes:{slug}")
     except Exception:
         pass
-    return True, []
+
+
+def _job_prune_audio(slug: str) -> None:
+    data = load_entry(slug)
+    if data is not None:
+        _prune_audio_files(slug, data)
+
+
+def _job_update_entry_indexes(slug: str) -> None:
+    # Re-read the entry when the job runs: coalesced or late jobs apply the latest state
+    _update_indexes_for(slug, _artifact_countries(slug), load_entry(slug))
+
+
+def _job_rebuild_indexes() -> None:
+    _update_indexes()
 
 # -------------------------------
 # Utilities: rename/migrate an entry slug (JSON + audio)
@@ -308,7 +355,7 @@ def migrate_entry_slug(old_slug: str, new_slug: str) -> bool:
     """Move entry from old_slug to new_slug.
     - Deletes old JSON file if present (expects new JSON already written)
     - Moves centralized audio folders under data/glossary/audio/{entry|examples}/{slug}/
-    - Rebuilds indexes
+    - Queues the index update for the old slug
     Returns True on best-effort success.
     """
     try:
@@ -331,11 +378,9 @@ def migrate_entry_slug(old_slug: str, new_slug: str) -> bool:
                 p_old.unlink()
         except Exception:
             pass
-        # Rebuild indexes
-        try:
-            _update_indexes()
-        except Exception:
-            pass
+        _index_remove(old_slug)
+        # Drop the old slug from the derived indexes
+        _enqueue_entry_jobs(old_slug)
         return True
     except Exception:
         return False
@@ -349,6 +394,7 @@ def delete_entry(slug: str) -> bool:
     if not SLUG_RE.match(slug):
         return False
     ok = True
+    deferred = _defer_record(slug, None)
     try:
         # Remove entry JSON
         p = entry_path(slug)
@@ -356,84 +402,550 @@ def delete_entry(slug: str) -> bool:
             p.unlink(missing_ok=True)  # type: ignore[arg-type]
     except Exception:
         ok = False
-    # Remove centralized audio folders if present
+    _index_remove(slug)
+    # Remove centralized audio folders if present (moved aside now, deleted by a background job)
+    from app import jobs
     try:
         base = get_data_root() / 'glossary' / 'audio'
         for kind in ('entry', 'examples'):
             d = base / kind / slug
             if d.exists() and d.is_dir():
-                shutil.rmtree(d, ignore_errors=True)
+                jobs.discard_tree(d)
     except Exception:
         ok = False
-    # Rebuild indexes (best-effort)
-    try:
-        _update_indexes()
-    except Exception:
-        pass
+    # Update derived indexes (best-effort)
+    if not deferred:
+        _enqueue_entry_jobs(slug)
     return ok
 
+# -------------------------------
+# Bulk import: deferred index maintenance
+# -------------------------------
+
+_DEFER_LOCK = threading.RLock()
+_DEFER: Dict[str, Any] = {"depth": 0, "pending": {}}
+
+
+def _defer_record(slug: str, data: Optional[Dict[str, Any]]) -> bool:
+    """Record a write/delete while deferred_indexes() is active; False when not deferring."""
+    with _DEFER_LOCK:
+        if not _DEFER["depth"]:
+            return False
+        _DEFER["pending"][slug] = data
+        return True
+
+
+@contextmanager
+def deferred_indexes() -> Iterator[None]:
+    """
+    Defer audio pruning and index maintenance for every save_entry/delete_entry
+    made inside the block. On exit, one audio-prune job per saved slug and a
+    single index rebuild job are queued (run inline when no job runner is
+    active) and the in-memory index is refreshed. Nested blocks flush with the
+    outermost one.
+    """
+    with _DEFER_LOCK:
+        _DEFER["depth"] += 1
+    try:
+        yield
+    finally:
+        with _DEFER_LOCK:
+            _DEFER["depth"] -= 1
+            outermost = not _DEFER["depth"]
+            pending: Dict[str, Any] = {}
+            if outermost:
+                pending, _DEFER["pending"] = _DEFER["pending"], {}
+        if pending:
+            from app import jobs
+            if _INDEX is not None:
+                _INDEX.signature = None  # rebuilt from disk on next use
+            try:
+                for slug, data in pending.items():
+                    if data is not None:
+                        jobs.enqueue("glossary.prune_audio", {"slug": slug}, dedupe_key=f"glossary.prune_audio:{slug}")
+                jobs.enqueue("glossary.rebuild_indexes", dedupe_key="glossary.rebuild_indexes")
+            except Exception:
+                pass
+
+
+def save_entries(payloads: Iterable[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Bulk save: normalize and validate every payload first, then write the valid
+    ones with index maintenance deferred (see deferred_indexes()).
+    Returns (saved_count, errors) where errors are {"slug", "errors"} rows.
+    """
+    valid: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    for payload in payloads:
+        data = _normalize_for_save(payload)
+        ok, errs = validate_entry(data)
+        if ok:
+            valid.append(data)
+        else:
+            errors.append({"slug": data.get("slug"), "errors": errs})
+    saved = 0
+    with deferred_indexes():
+        for data in valid:
+            if write_json(entry_path(data["slug"]), data, pretty=True):
+                _defer_record(data["slug"], data)
+                saved += 1
+            else:
+                errors.append({"slug": data["slug"], "errors": ["Failed to write entry JSON"]})
+    return saved, errors
+
 # -------------------------------
 # List meta
 # -------------------------------
 
-def list_entries_meta() -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    for slug in list_slugs():
-        data = load_entry(slug) or {}
-        word = (data.get("word") or slug).strip()
-        senses = data.get("senses") or []
-        sense_countries: set[str] = set()
-        register_set: set[str] = set()
-        status_set: set[str] = set()
-        sensitivity_set: set[str] = set()
-        domain_set: set[str] = set()
-        tone_set: set[str] = set()
-        examples_count = 0
-
-        for s in senses:
-            for c in (s.get("countries") or []):
-                if isinstance(c, str):
-                    sense_countries.add(c)
-            reg = s.get("register")
-            if isinstance(reg, str) and reg.strip():
-                register_set.add(reg.strip())
-            # status/sensitivity may be a list or a string
-            st = s.get("status")
-            if isinstance(st, list):
-                status_set.update([x for x in st if isinstance(x, str) and x.strip()])
-            elif isinstance(st, str) and st.strip():
-                status_set.add(st.strip())
-            se = s.get("sensitivity")
-            if isinstance(se, list):
-                sensitivity_set.update([x for x in se if isinstance(x, str) and x.strip()])
-            elif isinstance(se, str) and se.strip():
-                sensitivity_set.add(se.strip())
-            domain_set.update([d for d in (s.get("domain") or []) if isinstance(d, str) and d.strip()])
-            tone_set.update([t for t in (s.get("tone") or []) if isinstance(t, str) and t.strip()])
-            examples_count += len(s.get("examples") or [])
-
-        first = senses[0] if senses else {}
-        def _clean_html(val: str) -> str:
-            txt = re.sub(r"<[^>]+>", "", val or "").strip()
-            return txt
-
-        items.append({
-            "slug": slug,
-            "word": word,
-            "countries": sorted(sense_countries),
-            "pos": first.get("pos"),
-            "register": sorted(register_set),
-            "freq": first.get("freq"),
-            "status": sorted(status_set),
-            "sensitivity": sorted(sensitivity_set),
-            "domain": sorted(domain_set),
-            "tone": sorted(tone_set),
-            "has_audio": bool((data.get("audio") or "").strip()),
-            "definition_es": _clean_html(first.get("definition_es") or ""),
-            "definition_en": _clean_html(first.get("definition_en") or ""),
-            "examples_count": examples_count,
+def _clean_html(val: str) -> str:
+    return re.sub(r"<[^>]+>", "", val or "").strip()
+
+
+def _entry_meta(slug: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    word = (data.get("word") or slug).strip()
+    senses = data.get("senses") or []
+    sense_countries: set[str] = set()
+    register_set: set[str] = set()
+    status_set: set[str] = set()
+    sensitivity_set: set[str] = set()
+    domain_set: set[str] = set()
+    tone_set: set[str] = set()
+    examples_count = 0
+
+    for s in senses:
+        for c in (s.get("countries") or []):
+            if isinstance(c, str):
+                sense_countries.add(c)
+        reg = s.get("register")
+        if isinstance(reg, str) and reg.strip():
+            register_set.add(reg.strip())
+        # status/sensitivity may be a list or a string
+        st = s.get("status")
+        if isinstance(st, list):
+            status_set.update([x for x in st if isinstance(x, str) and x.strip()])
+        elif isinstance(st, str) and st.strip():
+            status_set.add(st.strip())
+        se = s.get("sensitivity")
+        if isinstance(se, list):
+            sensitivity_set.update([x for x in se if isinstance(x, str) and x.strip()])
+        elif isinstance(se, str) and se.strip():
+            sensitivity_set.add(se.strip())
+        domain_set.update([d for d in (s.get("domain") or []) if isinstance(d, str) and d.strip()])
+        tone_set.update([t for t in (s.get("tone") or []) if isinstance(t, str) and t.strip()])
+        examples_count += len(s.get("examples") or [])
+
+    first = senses[0] if senses else {}
+    return {
+        "slug": slug,
+        "word": word,
+        "countries": sorted(sense_countries),
+        "pos": first.get("pos"),
+        "register": sorted(register_set),
+        "freq": first.get("freq"),
+        "status": sorted(status_set),
+        "sensitivity": sorted(sensitivity_set),
+        "domain": sorted(domain_set),
+        "tone": sorted(tone_set),
+        "has_audio": bool((data.get("audio") or "").strip()),
+        "definition_es": _clean_html(first.get("definition_es") or ""),
+        "definition_en": _clean_html(first.get("definition_en") or ""),
+        "examples_count": examples_count,
+    }
+
+
+def _as_token_set(val: Any) -> frozenset:
+    """status/sensitivity/domain/tone may be stored as a list or a single string."""
+    if isinstance(val, list):
+        return frozenset(x for x in val if isinstance(x, str) and x)
+    if isinstance(val, str) and val:
+        return frozenset([val])
+    return frozenset()
+
+
+def _sense_facets(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-sense filter tokens, as used by the public list filters."""
+    out: List[Dict[str, Any]] = []
+    for s in (data.get("senses") or []):
+        if not isinstance(s, dict):
+            continue
+        out.append({
+            "countries": frozenset(c for c in (s.get("countries") or []) if isinstance(c, str)),
+            "pos": s.get("pos") or None,
+            "register": s.get("register") or None,
+            "freq": s.get("freq") or None,
+            "status": _as_token_set(s.get("status")),
+            "sensitivity": _as_token_set(s.get("sensitivity")),
+            "domain": _as_token_set(s.get("domain")),
+            "tone": _as_token_set(s.get("tone")),
         })
-    return items
+    return out
+
+
+def _search_norms(slug: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized strings checked by search_entries() (word, slug, alt spellings, first sense)."""
+    first = (data.get("senses") or [{}])[:1]
+    defs: List[str] = []
+    forms: List[str] = []
+    for s in first:
+        if not isinstance(s, dict):
+            continue
+        defs = [_norm(s.get("definition_es") or ""), _norm(s.get("definition_en") or "")]
+        for af in (s.get("alt_forms") or []):
+            if isinstance(af, dict):
+                forms.append(_norm(str(af.get("form") or "")))
+    return {
+        "word": _norm((data.get("word") or slug).strip()),
+        "slug": _norm(slug),
+        "alts": [_norm(str(a)) for a in (data.get("alt_spellings") or [])],
+        "defs": defs,
+        "forms": forms,
+    }
+
+
+def _first_definitions(data: Dict[str, Any]) -> Tuple[str, str]:
+    senses = data.get("senses") or []
+    first = senses[0] if senses and isinstance(senses[0], dict) else {}
+    return (first.get("definition_es") or ""), (first.get("definition_en") or "")
+
+
+# -------------------------------
+# In-memory index (process-level)
+# -------------------------------
+
+class GlossaryIndex:
+    """
+    Process-level view of data/glossary/entries/*.json.
+
+    Holds the list metas (its keys double as the slug set), the normalized
+    strings search_entries() matches on (plus a trigram index over them), a
+    normalized word -> slugs map for duplicate checks, a BK-tree and a sorted
+    prefix list of headword spellings for fuzzy lookups and autocomplete, and
+    per-sense facet sets and bitmaps, so list/search/filter/duplicate/country
+    lookups never open an entry file. Built once on first use, then updated in
+    place by save_entry, delete_entry and migrate_entry_slug. The BM25 full-text
+    index is loaded lazily from _index/fulltext.json on the first ranked search
+    and reloaded whenever that file changes on disk.
+
+    Writes from other processes (other gunicorn workers, scripts) are picked up
+    through a directory signature: write_json() renames into entries/, which
+    bumps the directory mtime, so one stat() per lookup is enough to notice.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self.signature: Optional[Tuple[int, int]] = None
+        self.slugs: List[str] = []
+        self.metas: Dict[str, Dict[str, Any]] = {}
+        self.norms: Dict[str, Dict[str, Any]] = {}
+        self.senses: Dict[str, List[Dict[str, Any]]] = {}
+        self.first_defs: Dict[str, Tuple[str, str]] = {}
+        self.words: Dict[str, List[str]] = {}
+        self.trigrams = TrigramIndex()
+        self.facets = FacetIndex()
+        self.fuzzy = FuzzyIndex()
+        self.prefixes = PrefixIndex()
+        self.fulltext: Optional[FullTextIndex] = None
+        self.fulltext_stat: Optional[Tuple[int, int]] = None
+
+    # --- maintenance ---
+
+    @staticmethod
+    def current_signature() -> Optional[Tuple[int, int]]:
+        try:
+            return (_entries_root().stat().st_mtime_ns, _root().stat().st_mtime_ns)
+        except Exception:
+            return None
+
+    def build(self) -> None:
+        with self._lock:
+            signature = self.current_signature()
+            self.load((slug, load_entry(slug) or {}) for slug in list_slugs())
+            self.signature = signature
+
+    def load(self, entries: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Replace the contents with (slug, entry) pairs; also used to index synthetic data in benchmarks."""
+        with self._lock:
+            self.slugs = []
+            self.metas, self.norms, self.senses, self.first_defs, self.words = {}, {}, {}, {}, {}
+            self.trigrams = TrigramIndex()
+            self.fuzzy = FuzzyIndex()
+            spellings: Dict[str, List[str]] = {}
+            for slug, data in entries:
+                spellings[slug] = self._put(slug, data)
+            self.slugs = sorted(self.metas)
+            prefixes = PrefixIndex()
+            prefixes.load(spellings.items())
+            self.prefixes = prefixes
+            self.fulltext = None
+            facets = FacetIndex()
+            facets.load((slug, self.senses[slug]) for slug in self.slugs)
+            self.facets = facets
+
+    def _put(self, slug: str, data: Dict[str, Any]) -> List[str]:
+        self.metas[slug] = _entry_meta(slug, data)
+        old = self.norms.get(slug)
+        norms = self.norms[slug] = _search_norms(slug, data)
+        if old is None or old["word"] != norms["word"]:
+            if old is not None:
+                self._unlink_word(old["word"], slug)
+            same = self.words.get(norms["word"]) or []
+            self.words[norms["word"]] = sorted(same + [slug])
+        self.trigrams.add(slug, _norm_texts(norms))
+        spellings = _spellings(slug, data)
+        self.fuzzy.add(slug, spellings)
+        self.senses[slug] = _sense_facets(data)
+        self.first_defs[slug] = _first_definitions(data)
+        return spellings
+
+    def _unlink_word(self, word: str, slug: str) -> None:
+        rest = [s for s in (self.words.get(word) or []) if s != slug]
+        if rest:
+            self.words[word] = rest
+        else:
+            self.words.pop(word, None)
+
+    def upsert(self, data: Dict[str, Any]) -> None:
+        slug = (data.get("slug") or "").strip()
+        if not slug:
+            return
+        with self._lock:
+            spellings = self._put(slug, data)
+            self.facets.add(slug, self.senses[slug])
+            self.prefixes.add(slug, spellings)
+            if self.fulltext is not None:
+                self.fulltext.add(slug, _fulltext_texts(slug, data))
+            if slug not in self.slugs:
+                slugs = list(self.slugs)
+                slugs.insert(bisect_left(slugs, slug), slug)
+                # swap instead of mutating so concurrent readers iterate a stable list
+                self.slugs = slugs
+            self.signature = self.current_signature()
+
+    def remove(self, slug: str) -> None:
+        with self._lock:
+            if slug in self.metas:
+                self.slugs = [s for s in self.slugs if s != slug]
+                self._unlink_word(self.norms[slug]["word"], slug)
+                for table in (self.metas, self.norms, self.senses, self.first_defs):
+                    table.pop(slug, None)
+                self.trigrams.remove(slug)
+                self.facets.remove(slug)
+                self.fuzzy.remove(slug)
+                self.prefixes.remove(slug)
+                if self.fulltext is not None:
+                    self.fulltext.remove(slug)
+            self.signature = self.current_signature()
+
+    def refresh_if_stale(self) -> None:
+        if self.signature is None or self.signature != self.current_signature():
+            self.build()
+
+    # --- lookups ---
+
+    def iter_metas(self) -> Iterable[Dict[str, Any]]:
+        metas = self.metas
+        for slug in self.slugs:
+            meta = metas.get(slug)
+            if meta is not None:
+                yield meta
+
+    def meta(self, slug: str) -> Optional[Dict[str, Any]]:
+        return self.metas.get(slug)
+
+    def sense_facets(self, slug: str) -> List[Dict[str, Any]]:
+        return self.senses.get(slug) or []
+
+    def search(
+        self,
+        qn: str,
+        country: Optional[str] = None,
+        allowed: Optional[set] = None,
+        limit: Optional[int] = None,
+        use_trigrams: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Metas (slug order) whose normalized strings contain qn, filtered by country.
+        Queries of 3+ characters intersect trigram postings and verify the
+        candidates; shorter ones (or use_trigrams=False) scan the normalized strings.
+        """
+        slugs: Iterable[str] = self.slugs
+        if qn and use_trigrams:
+            candidates = self.trigrams.candidates(qn)
+            if candidates is not None:
+                slugs = sorted(candidates)
+        results: List[Dict[str, Any]] = []
+        for slug in slugs:
+            meta = self.metas.get(slug)
+            if meta is None:
+                continue
+            countries = meta.get("countries") or []
+            if country and country not in countries:
+                continue
+            if allowed is not None and not any(c in allowed for c in countries):
+                continue
+            if qn and not _norms_contain(self.norms.get(slug) or {}, qn):
+                continue
+            results.append(meta)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def fuzzy_search(
+        self,
+        qn: str,
+        max_dist: int,
+        country: Optional[str] = None,
+        allowed: Optional[set] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Metas whose word, alt spellings or alt forms are within max_dist edits
+        of qn, closest first; each row is a copy of the meta with `distance`
+        and the `matched` (normalized) spelling.
+        """
+        results: List[Dict[str, Any]] = []
+        for slug, (dist, term) in self.fuzzy.search(qn, max_dist).items():
+            meta = self.metas.get(slug)
+            if meta is None:
+                continue
+            countries = meta.get("countries") or []
+            if country and country not in countries:
+                continue
+            if allowed is not None and not any(c in allowed for c in countries):
+                continue
+            row = dict(meta)
+            row["distance"] = dist
+            row["matched"] = term
+            results.append(row)
+        results.sort(key=lambda r: (r["distance"], (r.get("word") or r.get("slug") or "").lower()))
+        return results[:limit] if limit is not None else results
+
+    def ranked_search(
+        self,
+        q: str,
+        country: Optional[str] = None,
+        allowed: Optional[set] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25-ranked matches over every sense (definitions, equivalents, examples,
+        alt forms); rows are meta copies with `score` and a highlighted `snippet`.
+        """
+        with self._lock:
+            if self.fulltext is not None and _fulltext_stat() != self.fulltext_stat:
+                self.fulltext = None  # rewritten by another process since we loaded it
+            if self.fulltext is None:
+                self.fulltext, self.fulltext_stat = _load_fulltext(self.slugs)
+            fulltext = self.fulltext
+            results: List[Dict[str, Any]] = []
+            for score, slug in fulltext.search(q):
+                meta = self.metas.get(slug)
+                if meta is None:
+                    continue
+                countries = meta.get("countries") or []
+                if country and country not in countries:
+                    continue
+                if allowed is not None and not any(c in allowed for c in countries):
+                    continue
+                row = dict(meta)
+                row["score"] = round(score, 4)
+                row["snippet"] = fulltext.snippet(slug, q)
+                results.append(row)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def suggest(
+        self,
+        prefix: str,
+        limit: int,
+        country: Optional[str] = None,
+        allowed: Optional[set] = None,
+    ) -> List[Dict[str, Any]]:
+        """Top `limit` entries with a spelling starting with prefix (normalized term order)."""
+        metas = self.metas
+
+        def accept(slug: str) -> bool:
+            countries = (metas.get(slug) or {}).get("countries") or []
+            if country and country not in countries:
+                return False
+            return allowed is None or any(c in allowed for c in countries)
+
+        out: List[Dict[str, Any]] = []
+        for term, slug in self.prefixes.complete(prefix, limit, accept):
+            meta = metas.get(slug) or {}
+            out.append({"slug": slug, "word": meta.get("word") or slug, "matched": term})
+        return out
+
+    def facet_filter(
+        self,
+        slugs: Iterable[str],
+        filters: Dict[str, Set[str]],
+        with_counts: bool = False,
+    ) -> Tuple[Set[str], Optional[Dict[str, Dict[str, int]]]]:
+        """
+        Slugs (among `slugs`) with at least one sense matching every facet filter,
+        plus optional per-facet token counts over the same slugs.
+        """
+        with self._lock:
+            facets = self.facets
+            scope = facets.scope(slugs)
+            matched = facets.keys(facets.match(filters, scope))
+            counts = facets.counts(filters, scope) if with_counts else None
+        return matched, counts
+
+
+_INDEX: Optional[GlossaryIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index() -> GlossaryIndex:
+    """Return the process-level GlossaryIndex, building or refreshing it as needed."""
+    global _INDEX
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                idx = GlossaryIndex()
+                idx.build()
+                _INDEX = idx
+    _INDEX.refresh_if_stale()
+    return _INDEX
+
+
+def sense_facets(slug: str) -> List[Dict[str, Any]]:
+    """Per-sense filter tokens for an entry (countries/pos/register/freq/status/...)."""
+    return get_index().sense_facets(slug)
+
+
+def facet_filter(
+    slugs: Iterable[str],
+    filters: Dict[str, Iterable[str]],
+    with_counts: bool = False,
+) -> Tuple[Set[str], Optional[Dict[str, Dict[str, int]]]]:
+    """
+    Sense-level filtering for the public list: keep the slugs where some sense
+    matches all filters (facet -> accepted tokens; facets: countries, pos,
+    register, freq, status, sensitivity, domain, tone). With with_counts, also
+    return {facet: {token: entries}} for the UI filter badges.
+    """
+    clean = {f: set(v) for f, v in (filters or {}).items() if v}
+    return get_index().facet_filter(slugs, clean, with_counts)
+
+
+def _index_upsert(data: Dict[str, Any]) -> None:
+    # Nothing to do until the index is first used; it will be built from disk then.
+    if _INDEX is not None:
+        _INDEX.upsert(data)
+
+
+def _index_remove(slug: str) -> None:
+    if _INDEX is not None:
+        _INDEX.remove(slug)
+
+
+def list_entries_meta() -> List[Dict[str, Any]]:
+    """List metas in slug order. Returned dicts are shared with the index; treat as read-only."""
+    return list(get_index().iter_metas())
 
 def find_duplicate_entries(word: str, countries: Optional[Iterable[str]] = None, exclude_slug: Optional[str] = None) -> List[Dict[str, Any]]:
     norm_word = _norm(word or '')
@@ -441,20 +953,15 @@ def find_duplicate_entries(word: str, countries: Optional[Iterable[str]] = None,
         return []
     exclude = (exclude_slug or '').strip().lower()
     allowed_countries = {c.upper() for c in (countries or []) if isinstance(c, str) and c.strip()}
+    index = get_index()
     matches: List[Dict[str, Any]] = []
-    for slug in list_slugs():
+    for slug in index.words.get(norm_word) or ():
         if exclude and slug == exclude:
             continue
-        data = load_entry(slug) or {}
-        entry_norm = _norm(data.get("word") or slug)
-        if entry_norm != norm_word:
-            continue
-        senses = data.get("senses") or []
         found_countries: set[str] = set()
         matched = False
-        for sense in senses:
-            sense_countries = [str(c).upper().strip() for c in (sense.get("countries") or []) if isinstance(c, str) and c.strip()]
-            sense_countries = [c for c in sense_countries if c]
+        for sense in index.sense_facets(slug):
+            sense_countries = [c.upper().strip() for c in sense["countries"] if c.strip()]
             if allowed_countries and not allowed_countries.intersection(sense_countries):
                 continue
             found_countries.update(sense_countries)
@@ -463,12 +970,13 @@ def find_duplicate_entries(word: str, countries: Optional[Iterable[str]] = None,
         if allowed_countries and not found_countries:
             continue
         if matched or not allowed_countries:
+            def_es, def_en = index.first_defs.get(slug) or ("", "")
             matches.append({
                 "slug": slug,
-                "word": (data.get("word") or slug),
+                "word": index.metas[slug]["word"],
                 "countries": sorted(found_countries),
-                "definition_es": (senses[0].get("definition_es") if senses and isinstance(senses[0], dict) else "") or "",
-                "definition_en": (senses[0].get("definition_en") if senses and isinstance(senses[0], dict) else "") or "",
+                "definition_es": def_es,
+                "definition_en": def_en,
             })
     return matches
 
@@ -482,59 +990,264 @@ def _index_root() -> Path:
     (p / "by_country").mkdir(parents=True, exist_ok=True)
     return p
 
-def _update_indexes() -> None:
-    # Rebuild by-country and a light search index; also materialize per-country entry views and master all.json
-    metas = list_entries_meta()
-    # by_country
-    byc: dict[str, list[dict]] = {}
-    for m in metas:
-        for c in (m.get("countries") or []):
-            byc.setdefault(c, []).append({"slug": m["slug"], "word": m.get("word") or m["slug"]})
-    for code, rows in byc.items():
-        rows.sort(key=lambda r: (r["word"].lower(), r["slug"]))
-        write_json(_index_root() / "by_country" / f"{code}.json", rows, pretty=True)
-        # Materialize country-specific entry files (filtered by sense country)
-        out_dir = _countries_root() / code
-        out_dir.mkdir(parents=True, exist_ok=True)
-        for m in rows:
-            slug = m["slug"]
-            data = load_entry(slug) or {}
-            senses = []
-            for s in (data.get("senses") or []):
-                sc = set(s.get("countries") or [])
-                if code in sc:
-                    senses.append(s)
-            entry_view = {
-                "word": data.get("word") or slug,
-                "slug": slug,
-                "audio": data.get("audio"),
-                "alt_spellings": data.get("alt_spellings") or [],
-                "senses": senses,
-            }
-            write_json(out_dir / f"{slug}.json", entry_view, pretty=True)
-    # search index
-    items: list[dict] = []
-    for m in metas:
-        d = load_entry(m["slug"]) or {}
-        first = (d.get("senses") or [{}])[0]
-        snip = (first.get("definition_en") or first.get("definition_es") or "")
+_ARTIFACTS_LOCK = threading.RLock()
+_ARTIFACTS_HELD = threading.local()
+
+
+@contextmanager
+def _artifacts_lock() -> Iterator[None]:
+    """
+    Exclusive lock for artifact writers: the thread lock plus an fcntl lock on
+    _index/.lock, so read-modify-write updates from different processes cannot
+    overwrite each other. Re-entrant within a thread.
+    """
+    with _ARTIFACTS_LOCK:
+        depth = getattr(_ARTIFACTS_HELD, "depth", 0)
+        if depth or fcntl is None:
+            _ARTIFACTS_HELD.depth = depth + 1
+            try:
+                yield
+            finally:
+                _ARTIFACTS_HELD.depth = depth
+            return
+        fd = os.open(str(_index_root() / ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
         try:
-            snip = re.sub(r"<[^>]+>", "", snip).strip()
-        except Exception:
-            pass
-        items.append({
-            "slug": m["slug"],
-            "word": m.get("word") or m["slug"],
-            "countries": m.get("countries") or [],
-            "pos": first.get("pos"),
-            "snippet": snip[:240]
-        })
-    write_json(_index_root() / "search.json", items, pretty=True)
-    # master all.json (full entries array)
-    all_entries: list[dict] = []
-    for m in metas:
-        all_entries.append(load_entry(m["slug"]) or {})
-    write_json(_master_root() / "all.json", all_entries, pretty=True)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            _ARTIFACTS_HELD.depth = 1
+            yield
+        finally:
+            _ARTIFACTS_HELD.depth = 0
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+def _country_view(slug: str, data: Dict[str, Any], code: str) -> Dict[str, Any]:
+    """Entry view for one country (only senses tagged with that country)."""
+    senses = [s for s in (data.get("senses") or []) if code in set(s.get("countries") or [])]
+    return {
+        "word": data.get("word") or slug,
+        "slug": slug,
+        "audio": data.get("audio"),
+        "alt_spellings": data.get("alt_spellings") or [],
+        "senses": senses,
+    }
+
+
+def _search_row(meta: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    first = (data.get("senses") or [{}])[0]
+    snip = (first.get("definition_en") or first.get("definition_es") or "")
+    try:
+        snip = re.sub(r"<[^>]+>", "", snip).strip()
+    except Exception:
+        pass
+    return {
+        "slug": meta["slug"],
+        "word": meta.get("word") or meta["slug"],
+        "countries": meta.get("countries") or [],
+        "pos": first.get("pos"),
+        "snippet": snip[:240],
+    }
+
+
+def _fulltext_texts(slug: str, data: Dict[str, Any]) -> List[List[Any]]:
+    """[field, sense_index, plain text] rows indexed for BM25 search (sense_index -1: entry level)."""
+    rows: List[List[Any]] = [["word", -1, (data.get("word") or slug).strip()]]
+    rows += [["alt_form", -1, str(a)] for a in (data.get("alt_spellings") or []) if str(a).strip()]
+    for i, s in enumerate(data.get("senses") or []):
+        if not isinstance(s, dict):
+            continue
+        for field in ("definition_es", "definition_en"):
+            text = unescape(_clean_html(s.get(field) or ""))
+            if text:
+                rows.append([field, i, text])
+        for eq in (s.get("equivalents_en") or []):
+            if isinstance(eq, str) and eq.strip():
+                rows.append(["equivalent_en", i, eq.strip()])
+        for af in (s.get("alt_forms") or []):
+            if isinstance(af, dict) and str(af.get("form") or "").strip():
+                rows.append(["alt_form", i, str(af.get("form")).strip()])
+        for ex in (s.get("examples") or []):
+            if not isinstance(ex, dict):
+                continue
+            for lang in ("es", "en"):
+                text = unescape(_clean_html(str(ex.get(lang) or ""))).replace("`", "")
+                if text:
+                    rows.append([f"example_{lang}", i, text])
+    return rows
+
+
+def _fulltext_index(entries: Iterable[Tuple[str, Dict[str, Any]]]) -> FullTextIndex:
+    index = FullTextIndex(_norm)
+    for slug, data in entries:
+        index.add(slug, _fulltext_texts(slug, data))
+    return index
+
+
+def _fulltext_stat() -> Optional[Tuple[int, int]]:
+    try:
+        st = (_index_root() / "fulltext.json").stat()
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _fulltext_payload(index: FullTextIndex, entries: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+    """fulltext.json contents, stamped with the entries signature the postings were built from."""
+    payload = index.payload()
+    payload["entries"] = list(entries) if entries else None
+    return payload
+
+
+def _load_fulltext(slugs: List[str]) -> Tuple[FullTextIndex, Optional[Tuple[int, int]]]:
+    """
+    Full-text index from _index/fulltext.json, and the file's (mtime, size) it
+    was read at; rebuilt from the entries (and written back) if the file is
+    missing, from an older format, does not cover exactly the current slugs or
+    was stamped for a different state of entries/ (an edited entry).
+    """
+    path = _index_root() / "fulltext.json"
+    stat = _fulltext_stat()
+    payload = read_json(path)
+    entries = GlossaryIndex.current_signature()
+    if (FullTextIndex.valid_payload(payload) and set(payload["docs"]) == set(slugs)
+            and entries is not None and payload.get("entries") == list(entries)):
+        return FullTextIndex(_norm, payload), stat
+    index = _fulltext_index((slug, load_entry(slug) or {}) for slug in slugs)
+    with _artifacts_lock():
+        _write_artifact(path, _fulltext_payload(index, entries))
+        return index, _fulltext_stat()
+
+
+def _write_artifact(path: Path, payload: Any) -> None:
+    # fulltext.json is machine-only and the largest artifact: keep it compact
+    write_json(path, payload, pretty=path.name != "fulltext.json")
+
+
+def _artifact_countries(slug: str) -> List[str]:
+    """Countries that currently have an on-disk view for slug (countries/<CODE>/<slug>.json)."""
+    return sorted(d.name for d in _countries_root().iterdir() if d.is_dir() and (d / f"{slug}.json").exists())
+
+
+def _by_country_row(meta: Dict[str, Any]) -> Dict[str, str]:
+    return {"slug": meta["slug"], "word": meta.get("word") or meta["slug"]}
+
+
+def _by_country_key(row: Dict[str, str]) -> Tuple[str, str]:
+    return (row["word"].lower(), row["slug"])
+
+
+def _index_artifacts() -> Dict[Path, Any]:
+    """
+    Compute every derived artifact from the entry files (each entry is read once):
+      _index/by_country/<CODE>.json, countries/<CODE>/<slug>.json,
+      _index/search.json, _index/fulltext.json and _master/all.json.
+    """
+    signature = GlossaryIndex.current_signature()
+    entries = [(slug, load_entry(slug) or {}) for slug in list_slugs()]
+    out: Dict[Path, Any] = {}
+    byc: Dict[str, List[Dict[str, str]]] = {}
+    search_rows: List[Dict[str, Any]] = []
+    for slug, data in entries:
+        meta = _entry_meta(slug, data)
+        for code in meta["countries"]:
+            byc.setdefault(code, []).append(_by_country_row(meta))
+            out[_countries_root() / code / f"{slug}.json"] = _country_view(slug, data, code)
+        search_rows.append(_search_row(meta, data))
+    for code, rows in byc.items():
+        rows.sort(key=_by_country_key)
+        out[_index_root() / "by_country" / f"{code}.json"] = rows
+    out[_index_root() / "search.json"] = search_rows
+    out[_index_root() / "fulltext.json"] = _fulltext_payload(_fulltext_index(entries), signature)
+    out[_master_root() / "all.json"] = [data for _, data in entries]
+    return out
+
+
+def _artifact_files_on_disk() -> set[Path]:
+    found = set(p for p in (_index_root() / "by_country").glob("*.json"))
+    for d in _countries_root().iterdir():
+        if d.is_dir():
+            found.update(d.glob("*.json"))
+    return found
+
+
+def _update_indexes() -> None:
+    """Full rebuild of every derived artifact; also removes views for countries an entry no longer has."""
+    with _artifacts_lock():
+        artifacts = _index_artifacts()
+        for path, payload in artifacts.items():
+            _write_artifact(path, payload)
+        for stale in _artifact_files_on_disk() - set(artifacts):
+            try:
+                stale.unlink()
+            except Exception:
+                pass
+
+
+def _update_indexes_for(slug: str, old_countries: Iterable[str], data: Optional[Dict[str, Any]]) -> None:
+    """
+    Incremental update after one entry changed (data=None when it was removed).
+    Touches only that slug's by-country rows and country views, its search.json
+    row, its fulltext.json postings and its position in _master/all.json. Falls back to a full rebuild if a
+    shared artifact is missing or out of step with the entries on disk. The
+    whole read-modify-write runs under _artifacts_lock().
+    """
+    with _artifacts_lock():
+        meta = _entry_meta(slug, data) if data is not None else None
+        new_countries = set(meta["countries"]) if meta else set()
+        for code in sorted(set(old_countries) | new_countries):
+            byc_path = _index_root() / "by_country" / f"{code}.json"
+            rows = [r for r in (read_json(byc_path) or []) if isinstance(r, dict) and r.get("slug") != slug]
+            view_path = _countries_root() / code / f"{slug}.json"
+            if meta and code in new_countries:
+                rows.append(_by_country_row(meta))
+                rows.sort(key=_by_country_key)
+                write_json(view_path, _country_view(slug, data, code), pretty=True)
+            else:
+                view_path.unlink(missing_ok=True)  # type: ignore[arg-type]
+            if rows:
+                write_json(byc_path, rows, pretty=True)
+            else:
+                byc_path.unlink(missing_ok=True)  # type: ignore[arg-type]
+
+        expected = len(list_slugs())
+        search_path = _index_root() / "search.json"
+        fulltext_path = _index_root() / "fulltext.json"
+        master_path = _master_root() / "all.json"
+        search_rows = read_json(search_path)
+        fulltext_payload = read_json(fulltext_path)
+        all_entries = read_json(master_path)
+        if (not isinstance(search_rows, list) or not isinstance(all_entries, list)
+                or not FullTextIndex.valid_payload(fulltext_payload) or not fulltext_payload.get("entries")):
+            _update_indexes()
+            return
+        search_rows = _splice_by_slug(search_rows, slug, _search_row(meta, data) if meta else None)
+        all_entries = _splice_by_slug(all_entries, slug, data)
+        fulltext = FullTextIndex(_norm, fulltext_payload)
+        if meta:
+            fulltext.add(slug, _fulltext_texts(slug, data))
+        else:
+            fulltext.remove(slug)
+        if len(search_rows) != expected or len(all_entries) != expected or len(fulltext.docs) != expected:
+            _update_indexes()
+            return
+        write_json(search_path, search_rows, pretty=True)
+        _write_artifact(fulltext_path, _fulltext_payload(fulltext, GlossaryIndex.current_signature()))
+        write_json(master_path, all_entries, pretty=True)
+
+
+def _splice_by_slug(rows: List[Any], slug: str, row: Optional[Any]) -> List[Any]:
+    """Replace/insert/remove the row for slug in a slug-ordered list."""
+    slugs = [(r.get("slug") if isinstance(r, dict) else None) or "" for r in rows]
+    if slug in slugs:
+        pos = slugs.index(slug)
+        if row is None:
+            return rows[:pos] + rows[pos + 1:]
+        return rows[:pos] + [row] + rows[pos + 1:]
+    if row is None:
+        return rows
+    pos = bisect_left(slugs, slug)
+    return rows[:pos] + [row] + rows[pos:]
+
 
 def rebuild_indexes() -> bool:
     try:
@@ -543,6 +1256,25 @@ def rebuild_indexes() -> bool:
     except Exception:
         return False
 
+
+def check_indexes() -> List[str]:
+    """
+    Compare the artifacts on disk with a full rebuild computed in memory.
+    Returns a list of problems (empty when incremental maintenance is consistent).
+    """
+    problems: List[str] = []
+    root = _root()
+    expected = _index_artifacts()
+    for path, payload in expected.items():
+        current = read_json(path)
+        if current is None:
+            problems.append(f"missing: {path.relative_to(root).as_posix()}")
+        elif current != payload:
+            problems.append(f"differs: {path.relative_to(root).as_posix()}")
+    for stale in sorted(_artifact_files_on_disk() - set(expected)):
+        problems.append(f"stale: {stale.relative_to(root).as_posix()}")
+    return problems
+
 # -------------------------------
 # Search (with optional allow-list of countries)
 # -------------------------------
@@ -557,7 +1289,6 @@ def search_entries(
     ctry = (country or "").upper().strip() or None
     allowed_set = set(str(c).upper() for c in (allowed_countries or [])) if allowed_countries is not None else None
 
-    results: List[Dict[str, Any]] = []
     limit_value: Optional[int]
     if limit is None:
         limit_value = None
@@ -566,45 +1297,109 @@ def search_entries(
             limit_value = max(1, int(limit))
         except Exception:
             limit_value = None
-    for meta in list_entries_meta():
-        countries = meta.get("countries") or []
-        if ctry and ctry not in countries:
-            continue
-        if allowed_set is not None and not any(c in allowed_set for c in countries):
+    return get_index().search(qn, ctry, allowed_set, limit_value)
+
+
+def ranked_search_entries(
+    q: str,
+    country: Optional[str] = None,
+    limit: Optional[int] = None,
+    allowed_countries: Optional[Iterable[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    BM25 full-text search over all senses, examples, equivalents and alt forms.
+    Rows are ranked by `score` and carry a `snippet` ({field, sense, html} with
+    <mark> around matched words, or None).
+    """
+    if not (q or "").strip():
+        return []
+    ctry = (country or "").upper().strip() or None
+    allowed_set = set(str(c).upper() for c in (allowed_countries or [])) if allowed_countries is not None else None
+    limit_value: Optional[int] = None
+    if limit is not None:
+        try:
+            limit_value = max(1, int(limit))
+        except Exception:
+            limit_value = None
+    return get_index().ranked_search(q, ctry, allowed_set, limit_value)
+
+
+def fuzzy_search_entries(
+    q: str,
+    country: Optional[str] = None,
+    limit: Optional[int] = None,
+    allowed_countries: Optional[Iterable[str]] = None,
+    max_distance: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Typo-tolerant lookup over word, alt_spellings and alt_forms[].form.
+    Default tolerance grows with the query: exact for 1-2 chars, 1 edit up to
+    5 chars, 2 edits beyond. Rows are ranked by distance, then word.
+    """
+    qn = _norm(q or "")
+    if not qn:
+        return []
+    if max_distance is None:
+        max_distance = 0 if len(qn) <= 2 else 1 if len(qn) <= 5 else 2
+    max_distance = max(0, min(3, int(max_distance)))
+    ctry = (country or "").upper().strip() or None
+    allowed_set = set(str(c).upper() for c in (allowed_countries or [])) if allowed_countries is not None else None
+    limit_value: Optional[int] = None
+    if limit is not None:
+        try:
+            limit_value = max(1, int(limit))
+        except Exception:
+            limit_value = None
+    return get_index().fuzzy_search(qn, max_distance, ctry, allowed_set, limit_value)
+
+
+def suggest_entries(
+    q: str,
+    country: Optional[str] = None,
+    limit: int = 10,
+    allowed_countries: Optional[Iterable[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Autocomplete: [{slug, word, matched}] for entries whose word/alt spelling starts with q."""
+    qn = _norm(q or "")
+    if not qn:
+        return []
+    ctry = (country or "").upper().strip() or None
+    allowed_set = set(str(c).upper() for c in (allowed_countries or [])) if allowed_countries is not None else None
+    try:
+        limit_value = max(1, int(limit))
+    except Exception:
+        limit_value = 10
+    return get_index().suggest(qn, limit_value, ctry, allowed_set)
+
+
+def _spellings(slug: str, data: Dict[str, Any]) -> List[str]:
+    """Normalized spellings an entry can be found under (fuzzy search, autocomplete)."""
+    terms = [_norm((data.get("word") or slug).strip())]
+    terms += [_norm(str(a)) for a in (data.get("alt_spellings") or [])]
+    for s in (data.get("senses") or []):
+        if not isinstance(s, dict):
             continue
-        if qn:
-            if qn not in _norm(meta.get("word") or "") and qn not in _norm(meta.get("slug") or ""):
-                full = load_entry(meta.get("slug") or "") or {}
-                found = False
-                # entry-level alt_spellings quick check
-                try:
-                    for alt in (full.get("alt_spellings") or []):
-                        if qn in _norm(str(alt)):
-                            found = True
-                            break
-                except Exception:
-                    pass
-                # first-sense quick scan: definitions and alt_forms
-                if not found:
-                    for s in (full.get("senses") or [])[:1]:
-                        if qn in _norm(s.get("definition_es") or "") or qn in _norm(s.get("definition_en") or ""):
-                            found = True
-                            break
-                        for af in (s.get("alt_forms") or []):
-                            try:
-                                if qn in _norm(str(af.get("form") or "")):
-                                    found = True
-                                    break
-                            except Exception:
-                                pass
-                        if found:
-                            break
-                if not found:
-                    continue
-        results.append(meta)
-        if limit_value is not None and len(results) >= limit_value:
-            break
-    return results
+        for af in (s.get("alt_forms") or []):
+            if isinstance(af, dict) and af.get("form"):
+                terms.append(_norm(str(af.get("form"))))
+    return terms
+
+
+def _norm_texts(norms: Dict[str, Any]) -> List[str]:
+    return [norms.get("word", ""), norms.get("slug", "")] + [
+        val for group in ("alts", "defs", "forms") for val in (norms.get(group) or [])
+    ]
+
+
+def _norms_contain(norms: Dict[str, Any], qn: str) -> bool:
+    """Substring match over word/slug, alt_spellings and the first sense (definitions, alt_forms)."""
+    if qn in norms.get("word", "") or qn in norms.get("slug", ""):
+        return True
+    for group in ("alts", "defs", "forms"):
+        for val in (norms.get(group) or []):
+            if qn in val:
+                return True
+    return False
 
 # -------------------------------
 # Validation
@@ -792,16 +1587,9 @@ def list_countries() -> List[Dict[str, Any]]:
 
 def entries_for_country(country: str) -> List[Dict[str, Any]]:
     code = (country or "").upper()
+    index = get_index()
     items: List[Dict[str, Any]] = []
-    for slug in list_slugs():
-        data = load_entry(slug) or {}
-        sense_countries: set[str] = set()
-        for s in (data.get("senses") or []):
-            for c in (s.get("countries") or []):
-                if isinstance(c, str):
-                    sense_countries.add(c)
-        if code in sense_countries:
-            items.append({"slug": slug, "word": (data.get("word") or slug)})
+    for slug in index.slugs:
+        if any(code in sense["countries"] for sense in index.sense_facets(slug)):
+            items.append({"slug": slug, "word": index.metas[slug]["word"]})
     return sorted(items, key=lambda x: (x["word"].lower(), x["slug"]))
-
-
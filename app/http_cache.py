@@ -0,0 +1,90 @@
+# app/http_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Callable, Hashable
+
+from flask import Response, current_app, g, make_response, request
+from flask_login import current_user
+
+from app.fragments import FragmentCache
+from app.langs import ui_version
+
+# ─────────────────────────────────────────────────────────────
+# Role-aware HTTP caching for public pages
+#
+# Anonymous visitors: strong ETag over (build, path + query, UI language, UI
+# strings, grammar taxonomy version, content versions supplied by the route), Cache-Control
+# public/max-age/stale-while-revalidate, Vary: Cookie, 304 on If-None-Match,
+# and optionally an in-process page cache keyed by that ETag.
+# Signed-in users (admin bar, i18n pencils): no-store, as before.
+# ─────────────────────────────────────────────────────────────
+
+NO_STORE = "no-store, no-cache, must-revalidate, max-age=0"
+
+page_cache = FragmentCache(int(os.getenv("PAGE_CACHE_MAX_CHARS", str(32 * 1024 * 1024))))
+
+
+def is_anonymous() -> bool:
+    try:
+        return not getattr(current_user, "is_authenticated", False)
+    except Exception:
+        return False
+
+
+def no_store(resp: Response) -> Response:
+    resp.headers["Cache-Control"] = NO_STORE
+    resp.headers["Pragma"] = "no-cache"
+    return resp
+
+
+def _taxonomy_version() -> Hashable:
+    # Taxonomy titles hot-reload (common/taxonomy.py) and appear on exercise/article pages
+    try:
+        from common.taxonomy import get_taxonomy
+        return get_taxonomy("grammar").version
+    except Exception:
+        return None
+
+
+def page_etag(versions: Hashable) -> str:
+    basis = repr((
+        current_app.config.get("STATIC_ASSETS_VERSION"),
+        request.path,
+        sorted(request.args.items(multi=True)),
+        getattr(g, "app_lang", None),
+        ui_version(),
+        _taxonomy_version(),
+        versions,
+    ))
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()[:24]
+
+
+def public_page(versions: Hashable, render: Callable[[], str]) -> Response:
+    """
+    Response for a public page whose HTML is render().
+
+    `versions` must capture everything the page depends on besides the URL and
+    the UI language (content versions, cookie-selected article language, ...).
+    For anonymous GET/HEAD requests render() is skipped entirely on a 304 and,
+    with PUBLIC_PAGE_CACHE on, on an in-process cache hit.
+    """
+    cfg = current_app.config
+    if not cfg.get("PUBLIC_CACHE_ENABLED", True) or request.method not in ("GET", "HEAD") or not is_anonymous():
+        return no_store(make_response(render()))
+
+    etag = page_etag(versions)
+    if request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+    elif cfg.get("PUBLIC_PAGE_CACHE", False):
+        resp = make_response(page_cache.get_or_render(etag, etag, render))
+    else:
+        resp = make_response(render())
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = (
+        f"public, max-age={int(cfg.get('PUBLIC_CACHE_MAX_AGE', 60))}, "
+        f"stale-while-revalidate={int(cfg.get('PUBLIC_CACHE_SWR', 600))}"
+    )
+    resp.vary.add("Cookie")
+    return resp
@@ -0,0 +1,345 @@
+# app/jobs.py
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.storage import get_data_root, get_project_root
+
+"""
+Background jobs for slow content maintenance (index rebuilds, audio pruning,
+exercise history compaction, directory removal).
+
+Jobs live in a small SQLite queue (instance/jobs.sqlite3 by default), so they
+survive restarts and can be claimed by any worker process. Request handlers
+call enqueue() and return; runner threads started by create_app() execute the
+jobs. When no runner is active in the process (scripts, shells, tests),
+enqueue() runs the task inline, so callers behave exactly as before.
+
+Pending jobs with the same dedupe key are coalesced: ten "rebuild glossary
+indexes" requests queued while the first is still waiting become one job.
+"""
+
+# Task name -> "module:function". Resolved lazily so that this module does not
+# import the stores (which import it).
+TASKS: Dict[str, str] = {
+    "glossary.update_entry_indexes": "app.glossary_store:_job_update_entry_indexes",
+    "glossary.rebuild_indexes": "app.glossary_store:_job_rebuild_indexes",
+    "glossary.prune_audio": "app.glossary_store:_job_prune_audio",
+    "exercises.compact_history": "app.exercises_store:_job_compact_history",
+    "fs.remove_tree": "app.jobs:_job_remove_tree",
+}
+
+MAX_ATTEMPTS = 3
+LEASE_SECONDS = 600          # a running job whose worker died is retried after this
+RETENTION_SECONDS = 7 * 86400  # finished jobs kept for the status endpoint / metrics
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    coalesced INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    run_after REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_until REAL,
+    worker TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, run_after);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs(dedupe_key, status);
+"""
+
+_STATE: Dict[str, Any] = {"db_path": None, "threads": [], "stop": None}
+_WAKE = threading.Event()
+_LOCAL = threading.local()
+
+
+# ─────────────────────────────────────────────────────────────
+# Storage
+# ─────────────────────────────────────────────────────────────
+
+def db_path() -> Path:
+    p = _STATE.get("db_path") or os.getenv("JOBS_DB_PATH") or (get_project_root() / "instance" / "jobs.sqlite3")
+    return Path(p)
+
+
+def _conn() -> sqlite3.Connection:
+    path = str(db_path())
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is None or getattr(_LOCAL, "path", None) != path:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.DatabaseError:
+            pass
+        conn.executescript(_SCHEMA)
+        _LOCAL.conn, _LOCAL.path = conn, path
+    return conn
+
+
+def _row(r: sqlite3.Row) -> Dict[str, Any]:
+    d = dict(r)
+    try:
+        d["payload"] = json.loads(d.get("payload") or "{}")
+    except Exception:
+        pass
+    return d
+
+
+# ─────────────────────────────────────────────────────────────
+# Public API
+# ─────────────────────────────────────────────────────────────
+
+def is_running() -> bool:
+    """True when runner threads are active in this process."""
+    return any(t.is_alive() for t in _STATE["threads"])
+
+
+def enqueue(kind: str, payload: Optional[Dict[str, Any]] = None, dedupe_key: Optional[str] = None) -> Optional[int]:
+    """
+    Queue a task and return its job id (the id of the pending job it was
+    coalesced into, if dedupe_key matches one). Without a runner in this
+    process the task runs inline and None is returned.
+    """
+    if kind not in TASKS:
+        raise ValueError(f"Unknown job kind: {kind!r}")
+    payload = payload or {}
+    if not is_running():
+        _resolve(kind)(**payload)
+        return None
+    conn = _conn()
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        job_id = None
+        if dedupe_key:
+            hit = conn.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND status = 'pending' ORDER BY id LIMIT 1",
+                (dedupe_key,),
+            ).fetchone()
+            if hit is not None:
+                job_id = hit["id"]
+                conn.execute("UPDATE jobs SET coalesced = coalesced + 1 WHERE id = ?", (job_id,))
+        if job_id is None:
+            cur = conn.execute(
+                "INSERT INTO jobs (kind, payload, dedupe_key, enqueued_at, run_after) VALUES (?, ?, ?, ?, ?)",
+                (kind, json.dumps(payload, ensure_ascii=False), dedupe_key, now, now),
+            )
+            job_id = cur.lastrowid
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    _WAKE.set()
+    return job_id
+
+
+def discard_tree(path: Path) -> bool:
+    """
+    Remove a directory tree without blocking the caller: the tree is renamed
+    into data/_trash/ right away (so the path is free and no longer listed)
+    and deleted by a background job. Returns False if nothing was there.
+    """
+    path = Path(path)
+    if not path.exists():
+        return False
+    trash = get_data_root() / "_trash"
+    try:
+        trash.mkdir(parents=True, exist_ok=True)
+        target = trash / f"{path.name}-{time.time_ns()}"
+        path.rename(target)
+    except Exception:
+        # Different filesystem or locked file: remove in place
+        target = path
+    enqueue("fs.remove_tree", {"path": str(target)})
+    return True
+
+
+def get_job(job_id: int) -> Optional[Dict[str, Any]]:
+    r = _conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _row(r) if r is not None else None
+
+
+def list_jobs(status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    conn = _conn()
+    if status:
+        rows = conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit)).fetchall()
+    else:
+        rows = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    return [_row(r) for r in rows]
+
+
+def metrics(window: int = 200) -> Dict[str, Any]:
+    """
+    Queue depth per status/kind and latency over the last `window` finished
+    jobs: wait (enqueued -> started) and run (started -> finished), in ms.
+    """
+    conn = _conn()
+    by_status = {r["status"]: r["n"] for r in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")}
+    pending_by_kind = {
+        r["kind"]: r["n"]
+        for r in conn.execute("SELECT kind, COUNT(*) AS n FROM jobs WHERE status = 'pending' GROUP BY kind")
+    }
+    coalesced = conn.execute("SELECT COALESCE(SUM(coalesced), 0) AS n FROM jobs").fetchone()["n"]
+    rows = conn.execute(
+        "SELECT started_at - enqueued_at AS wait, finished_at - started_at AS run FROM jobs "
+        "WHERE status IN ('done', 'failed') AND started_at IS NOT NULL AND finished_at IS NOT NULL "
+        "ORDER BY finished_at DESC LIMIT ?",
+        (window,),
+    ).fetchall()
+
+    def _stats(values: List[float]) -> Dict[str, Optional[float]]:
+        if not values:
+            return {"avg_ms": None, "p95_ms": None, "max_ms": None}
+        values = sorted(values)
+        p95 = values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))]
+        return {
+            "avg_ms": round(1000 * sum(values) / len(values), 1),
+            "p95_ms": round(1000 * p95, 1),
+            "max_ms": round(1000 * values[-1], 1),
+        }
+
+    return {
+        "runner": is_running(),
+        "depth": by_status.get("pending", 0),
+        "running": by_status.get("running", 0),
+        "done": by_status.get("done", 0),
+        "failed": by_status.get("failed", 0),
+        "pending_by_kind": pending_by_kind,
+        "coalesced": coalesced,
+        "wait": _stats([max(0.0, r["wait"]) for r in rows]),
+        "run": _stats([max(0.0, r["run"]) for r in rows]),
+        "sample": len(rows),
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────────────
+
+def start(workers: int = 1, path: Optional[os.PathLike | str] = None, poll: float = 1.0) -> None:
+    """Start runner threads in this process (idempotent)."""
+    if path is not None:
+        _STATE["db_path"] = str(path)
+    if is_running():
+        return
+    try:
+        conn = _conn()
+        conn.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                     (time.time() - RETENTION_SECONDS,))
+    except Exception:
+        return
+    stop = threading.Event()
+    _STATE["stop"] = stop
+    _STATE["threads"] = []
+    for i in range(max(1, int(workers))):
+        t = threading.Thread(target=_loop, args=(stop, poll), name=f"jobs-{i}", daemon=True)
+        t.start()
+        _STATE["threads"].append(t)
+
+
+def stop(timeout: float = 5.0) -> None:
+    ev = _STATE.get("stop")
+    if ev is not None:
+        ev.set()
+        _WAKE.set()
+    for t in _STATE["threads"]:
+        t.join(timeout)
+    _STATE["threads"] = []
+
+
+def _loop(stop: threading.Event, poll: float) -> None:
+    worker = f"{os.getpid()}:{threading.current_thread().name}"
+    while not stop.is_set():
+        try:
+            job = _claim(worker)
+        except Exception:
+            job = None
+        if job is None:
+            _WAKE.wait(poll)
+            _WAKE.clear()
+            continue
+        _run(job)
+
+
+def _claim(worker: str) -> Optional[Dict[str, Any]]:
+    conn = _conn()
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        r = conn.execute(
+            "SELECT * FROM jobs WHERE (status = 'pending' AND run_after <= ?) "
+            "OR (status = 'running' AND lease_until < ?) ORDER BY id LIMIT 1",
+            (now, now),
+        ).fetchone()
+        if r is not None:
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, lease_until = ?, "
+                "attempts = attempts + 1, worker = ? WHERE id = ?",
+                (now, now + LEASE_SECONDS, worker, r["id"]),
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    if r is None:
+        return None
+    job = _row(r)
+    job["attempts"] += 1
+    return job
+
+
+def _run(job: Dict[str, Any]) -> None:
+    conn = _conn()
+    try:
+        payload = job["payload"] if isinstance(job["payload"], dict) else {}
+        _resolve(job["kind"])(**payload)
+    except Exception as e:
+        now = time.time()
+        if job["attempts"] < MAX_ATTEMPTS:
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', run_after = ?, error = ? WHERE id = ?",
+                (now + 2 ** job["attempts"], f"{type(e).__name__}: {e}", job["id"]),
+            )
+        else:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = ? WHERE id = ?",
+                (now, f"{type(e).__name__}: {e}", job["id"]),
+            )
+        return
+    conn.execute("UPDATE jobs SET status = 'done', finished_at = ?, error = NULL WHERE id = ?", (time.time(), job["id"]))
+
+
+def _resolve(kind: str) -> Callable[..., Any]:
+    module, _, name = TASKS[kind].partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+# ─────────────────────────────────────────────────────────────
+# Generic tasks
+# ─────────────────────────────────────────────────────────────
+
+def _job_remove_tree(path: str) -> None:
+    p = Path(path)
+    root = get_data_root().resolve()
+    if root not in p.resolve().parents:
+        raise ValueError(f"Refusing to remove a path outside {root}: {p}")
+    if p.is_dir():
+        shutil.rmtree(p)
+    elif p.exists():
+        p.unlink()
@@ -302,3 +302,16 @@ def ui_update_pair(key: str, es: str, en: str) -> None:
         # Compact JSON for speed; stable key order for diffs
         p.write_text(json.dumps(_UI_CACHE.get(code, {}), ensure_ascii=False, separators=(",", ":"), sort_keys=True), encoding="utf-8")
 
+def ui_version() -> Tuple:
+    """
+    (mtime_ns, size) of each UI string store; changes whenever ui_update_pair()
+    persists. Part of the ETag of every public page (app.http_cache).
+    """
+    out = []
+    for code in ("es", "en"):
+        try:
+            st = _ui_path(code).stat()
+            out.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append(None)
+    return tuple(out)
@@ -0,0 +1,357 @@
+# app/static_export.py
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from app.storage import (
+    article_json_path,
+    article_manifest_path,
+    get_data_root,
+    get_project_root,
+    load_article_catalog,
+    load_article_meta,
+)
+
+"""
+Static export of published public pages: `flask content export-static`.
+
+Every page is rendered through the app itself (anonymous test-client request,
+so the output is byte-for-byte what Flask would serve) and written with
+precompressed .gz (and .br when the optional `brotli` package is installed)
+variants next to it:
+
+  <out>/<ui>/index.html                              /
+  <out>/<ui>/articles/index.html                     /articles/
+  <out>/<ui>/articles/<slug>/index.html              /articles/<slug>/
+  <out>/<ui>/articles/<slug>/index.<al>.html         /articles/<slug>/?al=<al>   (al "base" = mother/base)
+  <out>/<ui>/articles/<slug>/<module>/index.html     /articles/<slug>/<module>/
+  <out>/<ui>/exercises/index.html                    /exercises/
+  <out>/<ui>/exercises/tax/<path>/index.html         /exercises/?tax=<path>
+  <out>/glossary/<CODE>.json                         every /glossary/api/list?country=<CODE> item
+  <out>/taxonomy/grammar[.<lang>].json               /taxonomy/grammar[?lang=]
+  <out>/taxonomy/grammar/<path>[.<lang>].json        /taxonomy/grammar/<path>[?lang=]
+
+<ui> is the site-chrome language (the `lang` cookie). A matching nginx sketch:
+
+  map $cookie_lang $ppx_ui { default es; en en; }
+  location /articles/ {
+    gzip_static on;
+    try_files /$ppx_ui$uri/index.$arg_al.html /$ppx_ui$uri/index.html @flask;
+  }
+
+Regeneration is incremental: <out>/.export-manifest.json records, per output
+file, a checksum over its inputs (source documents, templates, UI strings,
+taxonomy, STATIC_ASSETS_VERSION). Pages whose checksum is unchanged are not
+rendered again; pages that are no longer published are removed.
+"""
+
+MANIFEST_NAME = ".export-manifest.json"
+MANIFEST_VERSION = 1
+GLOSSARY_PAGE = 500  # /glossary/api/list clamps limit to 500
+
+try:  # optional: brotli variants
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+# ─────────────────────────────────────────────────────────────
+# Input checksums
+# ─────────────────────────────────────────────────────────────
+
+class _Checksums:
+    """sha1 of files / directory trees, memoized for one export run."""
+
+    def __init__(self) -> None:
+        self._memo: Dict[str, str] = {}
+
+    def of(self, path: os.PathLike | str) -> str:
+        key = os.fspath(path)
+        if key not in self._memo:
+            self._memo[key] = self._compute(Path(key))
+        return self._memo[key]
+
+    def _compute(self, p: Path) -> str:
+        h = hashlib.sha1()
+        if p.is_dir():
+            for child in sorted(p.rglob("*")):
+                if child.is_file():
+                    h.update(child.relative_to(p).as_posix().encode("utf-8"))
+                    h.update(self.of(child).encode("ascii"))
+        elif p.is_file():
+            with open(p, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    h.update(chunk)
+        else:
+            h.update(b"<missing>")
+        return h.hexdigest()
+
+
+def _page_key(sums: _Checksums, base: str, url: str, inputs: Iterable[os.PathLike | str], extra: Any = None) -> str:
+    h = hashlib.sha1()
+    h.update(base.encode("utf-8"))
+    h.update(url.encode("utf-8"))
+    for p in sorted(os.fspath(i) for i in inputs):
+        h.update(p.encode("utf-8"))
+        h.update(sums.of(p).encode("ascii"))
+    h.update(repr(extra).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _article_source(slug: str) -> Path:
+    # manifest.json names content-addressed shards, so its checksum covers them
+    manifest = article_manifest_path(slug)
+    return manifest if manifest.exists() else article_json_path(slug)
+
+
+def _is_published(row: dict, now: datetime) -> bool:
+    if (row.get("status") or "draft").lower() != "published":
+        return False
+    pub = (row.get("published_at") or "").strip()
+    if not pub:
+        return True
+    try:
+        return datetime.fromisoformat(pub.replace("Z", "+00:00")) <= now
+    except Exception:
+        return True
+
+
+# ─────────────────────────────────────────────────────────────
+# Page plan
+# ─────────────────────────────────────────────────────────────
+
+def plan_pages(ui_langs: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Every exportable page as {out, url, ui, inputs, extra, kind}. kind "html" is
+    one GET; kind "glossary" pages through the list API.
+    """
+    from app import glossary_store as glossary
+    from app.exercises_store import index_sources as exercise_index_sources
+    from app.exercises_store import published_versions
+    from common.taxonomy import load_taxonomy
+
+    now = datetime.now(timezone.utc)
+    pages: List[Dict[str, Any]] = []
+
+    published = [r for r in load_article_catalog() if _is_published(r, now)]
+    article_sources = [_article_source(r["slug"]) for r in published]
+    tax_paths = sorted(load_taxonomy("grammar")["by_path"].keys())
+    ex_index_inputs = exercise_index_sources()
+    has_published_exercises = bool(published_versions())
+
+    for ui in ui_langs:
+        pages.append({"out": f"{ui}/index.html", "url": "/", "ui": ui, "inputs": [], "extra": None})
+        # The visible set changes when a scheduled article goes live
+        pages.append({"out": f"{ui}/articles/index.html", "url": "/articles/", "ui": ui,
+                      "inputs": article_sources, "extra": [r["slug"] for r in published]})
+
+        for row in published:
+            slug = row["slug"]
+            src = [_article_source(slug)]
+            meta = load_article_meta(slug) or {}
+            modules = meta.get("modules") if isinstance(meta.get("modules"), list) else []
+            if modules:
+                for idx, m in enumerate(modules):
+                    mslug = (m.get("slug") or "").strip() or f"m{idx+1}"
+                    pages.append({"out": f"{ui}/articles/{slug}/{mslug}/index.html",
+                                  "url": f"/articles/{slug}/{mslug}/", "ui": ui, "inputs": src, "extra": None})
+                continue
+            pages.append({"out": f"{ui}/articles/{slug}/index.html", "url": f"/articles/{slug}/",
+                          "ui": ui, "inputs": src, "extra": None})
+            codes = ["base"] + sorted((meta.get("i18n") or {}).keys())
+            mother = (meta.get("mother_lang") or "").strip().lower()
+            if mother and mother not in codes:
+                codes.append(mother)
+            for code in codes:
+                pages.append({"out": f"{ui}/articles/{slug}/index.{code}.html", "url": f"/articles/{slug}/?al={code}",
+                              "ui": ui, "inputs": src, "extra": None})
+
+        pages.append({"out": f"{ui}/exercises/index.html", "url": "/exercises/", "ui": ui,
+                      "inputs": ex_index_inputs, "extra": None})
+        if has_published_exercises:
+            for path in tax_paths:
+                pages.append({"out": f"{ui}/exercises/tax/{path}/index.html", "url": f"/exercises/?tax={path}",
+                              "ui": ui, "inputs": ex_index_inputs, "extra": None})
+
+    cfg = glossary.load_config()
+    countries_root = glossary._root() / "countries"
+    for code in sorted(cfg.get("enabled_countries") or []):
+        pages.append({"out": f"glossary/{code}.json", "url": f"/glossary/api/list?country={code}", "ui": None,
+                      "inputs": [glossary._config_path, countries_root / code], "extra": None, "kind": "glossary"})
+
+    for lang in (None, "es", "en"):
+        suffix = f".{lang}" if lang else ""
+        query = f"?lang={lang}" if lang else ""
+        pages.append({"out": f"taxonomy/grammar{suffix}.json", "url": f"/taxonomy/grammar{query}",
+                      "ui": None, "inputs": [], "extra": None})
+        for path in tax_paths:
+            pages.append({"out": f"taxonomy/grammar/{path}{suffix}.json", "url": f"/taxonomy/grammar/{path}{query}",
+                          "ui": None, "inputs": [], "extra": None})
+    return [p for p in pages if _safe_rel(p["out"])]
+
+
+def _safe_rel(rel: str) -> bool:
+    parts = rel.split("/")
+    return all(part and part not in (".", "..") for part in parts)
+
+
+# ─────────────────────────────────────────────────────────────
+# Rendering + writing
+# ─────────────────────────────────────────────────────────────
+
+def _fetch(client, page: Dict[str, Any]) -> Optional[bytes]:
+    headers = {"Cookie": f"lang={page['ui']}"} if page.get("ui") else {}
+    if page.get("kind") == "glossary":
+        items: List[Any] = []
+        offset = 0
+        while True:
+            resp = client.get(f"{page['url']}&limit={GLOSSARY_PAGE}&offset={offset}", headers=headers)
+            if resp.status_code != 200:
+                return None
+            data = resp.get_json() or {}
+            items.extend(data.get("items") or [])
+            if not data.get("has_more"):
+                break
+            offset += GLOSSARY_PAGE
+        code = page["url"].rsplit("=", 1)[-1]
+        body = {"ok": True, "country": code, "total": len(items), "items": items}
+        return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    resp = client.get(page["url"], headers=headers)
+    if resp.status_code != 200:
+        return None
+    return resp.get_data()
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with io.open(tmp, "wb") as f:
+        f.write(data)
+    tmp.replace(path)
+
+
+def _write_variants(path: Path, data: bytes) -> None:
+    _write_bytes(path, data)
+    _write_bytes(path.with_name(path.name + ".gz"), gzip.compress(data, 9, mtime=0))
+    if brotli is not None:
+        _write_bytes(path.with_name(path.name + ".br"), brotli.compress(data))
+
+
+def _remove_variants(path: Path, root: Path) -> None:
+    for p in (path, path.with_name(path.name + ".gz"), path.with_name(path.name + ".br")):
+        try:
+            p.unlink()
+        except OSError:
+            pass
+    # prune now-empty directories (module/tax folders of removed pages)
+    parent = path.parent
+    try:
+        while parent != root and root in parent.parents and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+    except OSError:
+        pass
+
+
+def _global_base(app: Flask, sums: _Checksums) -> str:
+    """Inputs shared by every page: templates, UI strings, taxonomy, assets version."""
+    root = get_project_root()
+    parts = [
+        str(app.config.get("STATIC_ASSETS_VERSION")),
+        sums.of(root / "templates"),
+        sums.of(root / "app" / "i18n"),
+        sums.of(get_data_root() / "ui" / "taxonomy"),
+    ]
+    return "|".join(parts)
+
+
+def export_static(app: Flask, out_dir: os.PathLike | str, ui_langs: Iterable[str] = ("es", "en"),
+                  force: bool = False, log: Callable[[str], None] = lambda _msg: None) -> Dict[str, int]:
+    """
+    Render changed pages into out_dir; returns counts
+    {planned, rendered, unchanged, removed, failed}.
+    """
+    out = Path(out_dir)
+    manifest_path = out / MANIFEST_NAME
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        previous = old.get("pages") if old.get("version") == MANIFEST_VERSION else {}
+    except Exception:
+        previous = {}
+    previous = previous or {}
+
+    stats = {"planned": 0, "rendered": 0, "unchanged": 0, "removed": 0, "failed": 0}
+    sums = _Checksums()
+    with app.app_context():
+        base = _global_base(app, sums)
+        pages = plan_pages(list(ui_langs))
+        stats["planned"] = len(pages)
+        # No cookie jar: each request carries only its own lang cookie (article_lang must not leak)
+        client = app.test_client(use_cookies=False)
+        current: Dict[str, Dict[str, str]] = {}
+        for page in pages:
+            key = _page_key(sums, base, page["url"] + f"|ui={page.get('ui')}", page["inputs"], page["extra"])
+            rel = page["out"]
+            prev = previous.get(rel)
+            if not force and prev and prev.get("key") == key and (out / rel).exists():
+                current[rel] = prev
+                stats["unchanged"] += 1
+                continue
+            data = _fetch(client, page)
+            if data is None:
+                # Keep the previous export of this page (if any) rather than deleting it
+                if prev:
+                    current[rel] = prev
+                stats["failed"] += 1
+                log(f"! {page['url']} (ui={page.get('ui')})")
+                continue
+            _write_variants(out / rel, data)
+            current[rel] = {"key": key, "url": page["url"]}
+            stats["rendered"] += 1
+            log(f"+ {rel}")
+
+    for rel in sorted(set(previous) - set(current)):
+        if _safe_rel(rel):
+            _remove_variants(out / rel, out)
+            stats["removed"] += 1
+            log(f"- {rel}")
+
+    out.mkdir(parents=True, exist_ok=True)
+    manifest = {"version": MANIFEST_VERSION, "generated_at": datetime.now(timezone.utc).isoformat(), "pages": current}
+    _write_bytes(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8"))
+    return stats
+
+
+# ─────────────────────────────────────────────────────────────
+# CLI: flask content ...
+# ─────────────────────────────────────────────────────────────
+
+content_cli = AppGroup("content", help="Content maintenance commands.")
+
+
+@content_cli.command("export-static")
+@click.option("--out", "out_dir", default=None, help="Output directory (default: STATIC_EXPORT_DIR).")
+@click.option("--lang", "ui_langs", multiple=True, help="Site-chrome language(s) to export (default: es, en).")
+@click.option("--force", is_flag=True, help="Re-render every page, ignoring the export manifest.")
+@click.option("--verbose", "-v", is_flag=True, help="List every written/removed file.")
+def export_static_command(out_dir: Optional[str], ui_langs: tuple, force: bool, verbose: bool) -> None:
+    """Pre-render published public pages for nginx (incremental)."""
+    app = current_app._get_current_object()
+    target = out_dir or app.config.get("STATIC_EXPORT_DIR")
+    stats = export_static(app, target, ui_langs or ("es", "en"), force=force,
+                          log=click.echo if verbose else (lambda _msg: None))
+    click.echo(f"{target}: " + ", ".join(f"{k} {v}" for k, v in stats.items()))
+    if stats["failed"]:
+        raise SystemExit(1)
@@ -1,11 +1,18 @@
 # app/storage.py
 from __future__ import annotations
 
+import hashlib
 import io
 import json
+import marshal
 import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
 from pathlib import Path
-from typing import Any, Iterable, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
 # ─────────────────────────────────────────────────────────────
 # Project & data roots
@@ -23,20 +30,143 @@ def get_data_root() -> Path:
     """Absolute path to the 'data' directory under project root."""
     return get_project_root() / "data"
 
+# ─────────────────────────────────────────────────────────────
+# Read-through content cache (parsed JSON, validated by stat)
+# ─────────────────────────────────────────────────────────────
+
+class ContentCache:
+    """
+    Process-wide LRU of parsed JSON documents keyed by absolute path.
+
+    Each hit is validated with one os.stat() (mtime_ns, size, inode), so edits
+    made by other processes or by hand are picked up immediately. Documents
+    are kept marshal-encoded and decoded on every read: callers get a private
+    copy they may mutate, at a fraction of the cost of re-reading and
+    re-parsing the file. The cache is bounded by the bytes it holds.
+
+    Reads inside `bypass()` (admin editors) go straight to disk.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, Tuple[Tuple[int, int, int], bytes]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    @staticmethod
+    def _signature(st: os.stat_result) -> Tuple[int, int, int]:
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def load(self, abs_path: os.PathLike | str) -> Any:
+        """
+        Parsed JSON for a file (a fresh copy). Raises FileNotFoundError /
+        ValueError like open() + json.load() would.
+        """
+        key = os.fspath(abs_path)
+        if _CACHE_BYPASS.get():
+            with self._lock:
+                self.bypassed += 1
+            with open(key, "r", encoding="utf-8") as f:
+                return json.load(f)
+        sig = self._signature(os.stat(key))
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] == sig:
+                self._items.move_to_end(key)
+                self.hits += 1
+                blob = item[1]
+            else:
+                blob = None
+                self.misses += 1
+        if blob is not None:
+            return marshal.loads(blob)
+        with open(key, "r", encoding="utf-8") as f:
+            obj = json.load(f)
+        try:
+            blob = marshal.dumps(obj)
+        except ValueError:
+            return obj
+        # Only cache if the file did not change while it was being read
+        if self._signature(os.stat(key)) == sig:
+            self._store(key, sig, blob)
+        return obj
+
+    def _store(self, key: str, sig: Tuple[int, int, int], blob: bytes) -> None:
+        if len(blob) > self.max_bytes // 4:
+            return  # one document may not take over the cache
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._items[key] = (sig, blob)
+            self._bytes += len(blob)
+            while self._bytes > self.max_bytes and self._items:
+                _, (_, dropped) = self._items.popitem(last=False)
+                self._bytes -= len(dropped)
+                self.evictions += 1
+
+    def invalidate(self, abs_path: os.PathLike | str) -> None:
+        with self._lock:
+            old = self._items.pop(os.fspath(abs_path), None)
+            if old is not None:
+                self._bytes -= len(old[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    @contextmanager
+    def bypass(self) -> Iterator[None]:
+        """Read from disk (no cache) for the duration of the block, in this context only."""
+        token = self.begin_bypass()
+        try:
+            yield
+        finally:
+            self.end_bypass(token)
+
+    def begin_bypass(self) -> Token:
+        """Non-block form of bypass(), for before/teardown request hooks."""
+        return _CACHE_BYPASS.set(True)
+
+    def end_bypass(self, token: Token) -> None:
+        try:
+            _CACHE_BYPASS.reset(token)
+        except ValueError:
+            _CACHE_BYPASS.set(False)  # token created in another context
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bypassed": self.bypassed,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+            }
+
+
+_CACHE_BYPASS: ContextVar[bool] = ContextVar("content_cache_bypass", default=False)
+content_cache = ContentCache(int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
+
 # ─────────────────────────────────────────────────────────────
 # Generic JSON read/write (UTF-8, pretty, safe)
 # ─────────────────────────────────────────────────────────────
 
 def read_json(abs_path: os.PathLike | str) -> Optional[dict]:
     """
-    Read a JSON file. Returns dict on success, None if file missing or malformed.
+    Read a JSON file (through content_cache). Returns dict on success, None if file missing or malformed.
     """
-    p = Path(abs_path)
     try:
-        if not p.exists() or not p.is_file():
-            return None
-        with p.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return content_cache.load(abs_path)
     except Exception:
         return None
 
@@ -56,6 +186,7 @@ def write_json(abs_path: os.PathLike | str, obj: Any, *, pretty: bool = True) ->
         with io.open(tmp, "w", encoding="utf-8") as f:
             f.write(data)
         tmp.replace(p)
+        content_cache.invalidate(p)
         return True
     except Exception:
         return False
@@ -145,18 +276,289 @@ def ensure_glossary_audio_dirs(slug: str) -> tuple[Path, Path]:
         d.mkdir(parents=True, exist_ok=True)
     return entry_dir, ex_dir
 
+# ─────────────────────────────────────────────────────────────
+# Sharded article storage
+#   data/articles/<slug>/manifest.json   metadata + shard names (no HTML bodies)
+#   data/articles/<slug>/shards/         base.<h>.json, lang-<code>.<h>.json, module-<NNN>.<h>.json
+# Shard names carry a content hash, so a shard file never changes once written:
+# a save writes the new shards first and then swaps manifest.json, and readers
+# always see one consistent version. Legacy article.json folders are read as-is
+# until migrated (migrate_article_to_shards / scripts/migrate_articles_to_shards.py).
+# ─────────────────────────────────────────────────────────────
+
+ARTICLE_FORMAT = "sharded-v1"
+BASE_BODY_FIELDS = ("html", "html_es", "html_en")
+
+
+def article_manifest_path(slug: str) -> Path:
+    """Absolute path to data/articles/<slug>/manifest.json."""
+    return article_folder(slug) / "manifest.json"
+
+
+def article_shards_dir(slug: str) -> Path:
+    return article_folder(slug) / "shards"
+
+
+def _read_manifest(slug: str) -> Optional[dict]:
+    raw = read_json(article_manifest_path(slug))
+    if isinstance(raw, dict) and raw.get("format") == ARTICLE_FORMAT and isinstance(raw.get("article"), dict):
+        return raw
+    return None
+
+
+def _shard_name(kind: str, body: dict) -> str:
+    blob = json.dumps(body, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return f"{kind}.{hashlib.sha1(blob).hexdigest()[:12]}.json"
+
+
+def _split_article(payload: dict) -> Tuple[dict, dict, Dict[str, dict]]:
+    """
+    Split a full article dict into (article without bodies, shard refs, shard bodies by name).
+    Base HTML fields, i18n[code].html and modules[i].html each go to their own shard.
+    """
+    article = {k: v for k, v in payload.items() if k not in BASE_BODY_FIELDS}
+    bodies: Dict[str, dict] = {}
+    refs: dict = {"base": None, "i18n": {}, "modules": []}
+
+    base = {k: payload[k] for k in BASE_BODY_FIELDS if k in payload}
+    if base:
+        refs["base"] = _shard_name("base", base)
+        bodies[refs["base"]] = base
+
+    i18n = payload.get("i18n")
+    if isinstance(i18n, dict):
+        slots = {}
+        for code, slot in i18n.items():
+            if isinstance(slot, dict) and "html" in slot:
+                body = {"html": slot["html"]}
+                name = _shard_name(f"lang-{code}", body)
+                refs["i18n"][code] = name
+                bodies[name] = body
+                slot = {k: v for k, v in slot.items() if k != "html"}
+            slots[code] = slot
+        article["i18n"] = slots
+
+    modules = payload.get("modules")
+    if isinstance(modules, list):
+        rows = []
+        for i, m in enumerate(modules):
+            name = None
+            if isinstance(m, dict) and "html" in m:
+                body = {"html": m["html"]}
+                name = _shard_name(f"module-{i:03d}", body)
+                bodies[name] = body
+                m = {k: v for k, v in m.items() if k != "html"}
+            refs["modules"].append(name)
+            rows.append(m)
+        article["modules"] = rows
+    return article, refs, bodies
+
+
+def _assemble_article(article: dict, refs: dict, read) -> Optional[dict]:
+    """
+    Put shard bodies back into article (modified in place). read(name) returns
+    a shard body, or None if the shard is missing; then None is returned.
+    """
+    missing = []
+
+    def body(name: str) -> dict:
+        got = read(name)
+        if got is None:
+            missing.append(name)
+            return {}
+        return got
+
+    if refs.get("base"):
+        article.update(body(refs["base"]))
+    i18n_refs = refs.get("i18n") or {}
+    for code, slot in (article.get("i18n") or {}).items():
+        if code in i18n_refs and isinstance(slot, dict):
+            slot["html"] = body(i18n_refs[code]).get("html", "")
+    module_refs = refs.get("modules") or []
+    for i, m in enumerate(article.get("modules") or []):
+        if i < len(module_refs) and module_refs[i] and isinstance(m, dict):
+            m["html"] = body(module_refs[i]).get("html", "")
+    return None if missing else article
+
+
+def _write_sharded(slug: str, payload: dict, drop_legacy: bool = True) -> bool:
+    article, refs, bodies = _split_article(payload)
+    shards_dir = article_shards_dir(slug)
+    for name, body in bodies.items():
+        # Same name => same content: unchanged languages/modules are not rewritten
+        if not (shards_dir / name).exists() and not write_json(shards_dir / name, body, pretty=False):
+            return False
+    manifest = {"format": ARTICLE_FORMAT, "article": article, "shards": refs}
+    if not write_json(article_manifest_path(slug), manifest, pretty=True):
+        return False
+    # The manifest is authoritative now: drop the monolith and unreferenced shards
+    if drop_legacy:
+        _drop_legacy(slug)
+    try:
+        for p in shards_dir.iterdir():
+            if p.name not in bodies:
+                p.unlink()
+    except OSError:
+        pass
+    return True
+
+
+def _drop_legacy(slug: str) -> None:
+    legacy = article_json_path(slug)
+    try:
+        if legacy.exists():
+            legacy.unlink()
+            content_cache.invalidate(legacy)
+    except OSError:
+        pass
+
+
+def _read_shard(slug: str, name: Optional[str]) -> dict:
+    if not name:
+        return {}
+    raw = read_json(article_shards_dir(slug) / name)
+    return raw if isinstance(raw, dict) else {}
+
+
+def _shard_body(slug: str, pick) -> Optional[dict]:
+    """
+    Body of the shard that pick(shard_refs) names, for a sharded article; None
+    for a legacy article. A shard removed by a concurrent save is retried once
+    against the fresh manifest.
+    """
+    for _ in range(2):
+        manifest = _read_manifest(slug)
+        if manifest is None:
+            return None
+        name = pick(manifest.get("shards") or {})
+        if not name:
+            return {}
+        body = _read_shard(slug, name)
+        if body:
+            return body
+    return {}
+
+
+def load_article_meta(slug: str) -> Optional[dict]:
+    """
+    Article metadata without HTML bodies (i18n slots and modules keep their other
+    fields): one small manifest read for sharded articles. Legacy article.json
+    folders return the full article.
+    """
+    manifest = _read_manifest(slug)
+    if manifest is not None:
+        return manifest["article"]
+    return read_json(article_json_path(slug))
+
+
+def load_article_body(slug: str, code: str = "") -> dict:
+    """
+    HTML body fields for one article language: the base/mother body
+    ({html, html_es, html_en} as present) when code is empty, otherwise {html}
+    of the i18n[code] slot. Reads a single shard for sharded articles.
+    """
+    if code:
+        body = _shard_body(slug, lambda refs: (refs.get("i18n") or {}).get(code))
+    else:
+        body = _shard_body(slug, lambda refs: refs.get("base"))
+    if body is not None:
+        return body
+    data = read_json(article_json_path(slug)) or {}
+    if code:
+        slot = (data.get("i18n") or {}).get(code) or {}
+        return {"html": slot["html"]} if isinstance(slot, dict) and "html" in slot else {}
+    return {k: data[k] for k in BASE_BODY_FIELDS if k in data}
+
+
+def load_article_module_html(slug: str, index: int) -> str:
+    """HTML of modules[index]; reads a single shard for sharded articles."""
+    def pick(refs: dict) -> Optional[str]:
+        names = refs.get("modules") or []
+        return names[index] if 0 <= index < len(names) else None
+
+    body = _shard_body(slug, pick)
+    if body is None:
+        modules = (read_json(article_json_path(slug)) or {}).get("modules") or []
+        m = modules[index] if 0 <= index < len(modules) else None
+        body = m if isinstance(m, dict) else {}
+    return body.get("html") or ""
+
+
+def article_version(slug: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Content version of an article: (mtime_ns, size, inode) of manifest.json, or
+    of article.json for legacy folders; None if the article does not exist.
+    Changes on every save, so it keys anything derived from the article.
+    """
+    for p in (article_manifest_path(slug), article_json_path(slug)):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    return None
+
+
+def migrate_article_to_shards(slug: str) -> bool:
+    """
+    Convert a legacy article.json folder to the sharded layout. article.json is
+    removed only once the planned shards reassemble to it in memory and the
+    written manifest + shards read back equal to it; otherwise the manifest is
+    withdrawn and article.json stays authoritative. False if there was nothing
+    to migrate or the check failed.
+    """
+    if _read_manifest(slug) is not None:
+        return False
+    data = read_json(article_json_path(slug))
+    if not isinstance(data, dict):
+        return False
+    article, refs, bodies = _split_article(data)
+    planned = json.loads(json.dumps(article))  # the split shares nested dicts with data
+    if _assemble_article(planned, refs, bodies.get) != data:
+        return False
+    if not _write_sharded(slug, data, drop_legacy=False):
+        return False
+    if load_article(slug) != data:
+        try:
+            article_manifest_path(slug).unlink()
+            content_cache.invalidate(article_manifest_path(slug))
+        except OSError:
+            pass
+        return False
+    _drop_legacy(slug)
+    return True
+
+
 # ─────────────────────────────────────────────────────────────
 # Convenience: safe loaders/savers for articles (extend later)
 # ─────────────────────────────────────────────────────────────
 
 def load_article(slug: str) -> Optional[dict]:
-    """Load article.json for a slug, or None if missing/invalid."""
-    return read_json(article_json_path(slug))
+    """
+    Load the full article for a slug (bodies included), or None if missing/invalid.
+    Sharded articles are reassembled from their manifest and shards; legacy
+    article.json folders are read directly. A shard removed by a concurrent
+    save is retried against the fresh manifest; if shards are still missing
+    the article is treated as unreadable (None) rather than returned with
+    empty bodies that an editor round trip would save back.
+    """
+    for _ in range(3):
+        manifest = _read_manifest(slug)
+        if manifest is None:
+            return read_json(article_json_path(slug))
+        data = _assemble_article(manifest["article"], manifest.get("shards") or {},
+                                 lambda name: read_json(article_shards_dir(slug) / name))
+        if data is not None:
+            return data
+    return None
 
 def save_article(slug: str, payload: dict) -> bool:
-    """Save article.json for a slug; creates folders if needed."""
+    """Save an article (sharded layout) for a slug; creates folders if needed. Also refreshes its catalog row."""
     ensure_article_dirs(slug)
-    return write_json(article_json_path(slug), payload, pretty=True)
+    ok = _write_sharded(slug, payload)
+    if ok:
+        _catalog_update(slug, payload)
+    return ok
 
 def delete_article(slug: str) -> bool:
     """
@@ -171,9 +573,144 @@ def delete_article(slug: str) -> bool:
     try:
         if not root.exists() or not root.is_dir():
             return False
-        # Lazy import to avoid header changes
-        import shutil  # noqa: WPS433
-        shutil.rmtree(root)
-        return True
+        # Moved aside immediately; the tree itself is removed by a background job
+        from app import jobs  # noqa: WPS433 (lazy: app.jobs imports this module)
+        ok = jobs.discard_tree(root)
     except Exception:
         return False
+    _catalog_update(slug, None)
+    return ok
+
+# ─────────────────────────────────────────────────────────────
+# Article catalog (data/articles/_catalog.json)
+# Listing fields only, so article listings never parse article bodies.
+# ─────────────────────────────────────────────────────────────
+
+CATALOG_VERSION = 1
+_CATALOG_LOCK = threading.RLock()
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def article_catalog_path() -> Path:
+    return _domain_root("articles") / "_catalog.json"
+
+
+def article_display_fields(data: dict, slug: str, lang: str) -> Tuple[str, str]:
+    """
+    (title, plain summary) shown for an article in `lang`:
+    i18n[lang] slot first, then base fields, then legacy *_es / *_en fields.
+    """
+    meta = data.get("meta") or {}
+    i18n = data.get("i18n") or {}
+    slot = i18n.get(lang) or {}
+
+    if slot.get("title"):
+        title = slot["title"]
+    else:
+        title_any = data.get("title") or meta.get("title")
+        title_es = data.get("title_es") or meta.get("title_es") or meta.get("title-es")
+        title_en = data.get("title_en") or meta.get("title_en") or meta.get("title-en")
+        title = title_any or (title_es if lang == "es" else title_en) or title_es or title_en or slug
+
+    summary_html = slot.get("summary_html") or data.get("summary_html") or meta.get("summary_html") or ""
+    if summary_html:
+        summary = _TAG_RE.sub("", summary_html).strip()
+    else:
+        summary_es = data.get("summary_es") or meta.get("summary_es")
+        summary_en = data.get("summary_en") or meta.get("summary_en")
+        summary_any = data.get("summary") or meta.get("summary")
+        summary = (summary_es if lang == "es" else summary_en) or summary_any or ""
+    return title, summary
+
+
+def _catalog_row(slug: str, data: dict, mtime_ns: Optional[int]) -> dict:
+    meta = data.get("meta") or {}
+    # Display fields per language: every i18n slot, "es" (legacy *_es fallbacks)
+    # and "*" for any other language without a slot.
+    display = {}
+    for code in sorted(set((data.get("i18n") or {}).keys()) | {"es"}):
+        title, summary = article_display_fields(data, slug, code)
+        display[code] = {"title": title, "summary": summary}
+    title, summary = article_display_fields(data, slug, "*")
+    display["*"] = {"title": title, "summary": summary}
+    return {
+        "slug": slug,
+        "title": data.get("title") or data.get("title_es") or data.get("title_en") or slug,
+        "status": (data.get("status") or "draft").lower(),
+        "published_at": data.get("published_at"),
+        "updated_at": data.get("updated_at"),
+        "image_url": data.get("image_url") or meta.get("image_url"),
+        "tags": data.get("tags") or meta.get("tags") or [],
+        "taxonomy_paths": [p for p in (data.get("taxonomy_paths") or []) if p] if isinstance(data.get("taxonomy_paths"), list) else [],
+        "display": display,
+        "mtime_ns": mtime_ns,
+    }
+
+
+def catalog_display(row: dict, lang: str) -> dict:
+    """{title, summary} for a catalog row in `lang`."""
+    display = row.get("display") or {}
+    return display.get(lang) or display.get("*") or {"title": row.get("slug"), "summary": ""}
+
+
+def _article_mtime(slug: str) -> Optional[int]:
+    version = article_version(slug)
+    return version[0] if version else None
+
+
+def _read_catalog() -> dict:
+    raw = read_json(article_catalog_path())
+    if isinstance(raw, dict) and raw.get("version") == CATALOG_VERSION and isinstance(raw.get("articles"), dict):
+        return raw["articles"]
+    return {}
+
+
+def _write_catalog(rows: dict) -> None:
+    write_json(article_catalog_path(), {"version": CATALOG_VERSION, "articles": rows}, pretty=True)
+
+
+def _catalog_update(slug: str, data: Optional[dict]) -> None:
+    """Upsert (data given) or drop (data=None) one catalog row; best-effort."""
+    try:
+        with _CATALOG_LOCK:
+            rows = _read_catalog()
+            if data is None:
+                rows.pop(slug, None)
+            else:
+                rows[slug] = _catalog_row(slug, data, _article_mtime(slug))
+            _write_catalog(dict(sorted(rows.items())))
+    except Exception:
+        pass
+
+
+def load_article_catalog() -> list[dict]:
+    """
+    Catalog rows for every article folder, in slug order. Rows whose
+    manifest.json / article.json changed on disk (mtime differs) or that are missing are
+    rebuilt from the article and the catalog is written back; folders that
+    disappeared are dropped. Steady state: one JSON read + one stat per article.
+    """
+    with _CATALOG_LOCK:
+        rows = _read_catalog()
+        slugs = list_slugs("articles")
+        changed = set(rows) - set(slugs)
+        for slug in changed:
+            rows.pop(slug, None)
+        for slug in slugs:
+            mtime = _article_mtime(slug)
+            row = rows.get(slug)
+            if row is None or row.get("mtime_ns") != mtime:
+                rows[slug] = _catalog_row(slug, load_article_meta(slug) or {}, mtime)
+                changed.add(slug)
+        if changed:
+            rows = dict(sorted(rows.items()))
+            _write_catalog(rows)
+        return [rows[s] for s in slugs]
+
+
+def rebuild_article_catalog() -> int:
+    """Rebuild _catalog.json from every article; returns the number of rows."""
+    with _CATALOG_LOCK:
+        rows = {s: _catalog_row(s, load_article_meta(s) or {}, _article_mtime(s)) for s in list_slugs("articles")}
+        _write_catalog(rows)
+        return len(rows)
@@ -0,0 +1,288 @@
+# app/topic_index.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+"""
+Cross-content topic index: published articles, exercises and lessons by
+grammar-taxonomy path, answering "everything under <path>" and per-node
+published counts without scanning the stores per request.
+
+Each kind keeps its own postings (every path prefix -> item keys), rebuilt
+only when its store reports a change:
+  article   data/articles/_catalog.json (rewritten by save_article); also at
+            the next scheduled published_at
+  exercise  the in-memory exercise index (its prefix map is reused as is)
+  lesson    SQLAlchemy insert/update/delete events on Lesson/Unit in this
+            process, plus a re-query every LESSONS_RECHECK_SECONDS for
+            writes made by other workers
+Prefix postings give subtree queries directly: the items under
+"verbs/subjunctive" are those tagged with it or any path below it.
+"""
+
+KINDS = ("article", "exercise", "lesson")
+LESSONS_RECHECK_SECONDS = float(os.getenv("TOPIC_INDEX_LESSONS_RECHECK_SECONDS", "30"))
+
+
+def _norm(path: Any) -> str:
+    return str(path or "").strip().strip("/")
+
+
+def _prefixes(paths: Iterable[str]) -> Set[str]:
+    out: Set[str] = set()
+    for p in paths:
+        parts = [seg for seg in _norm(p).split("/") if seg]
+        for i in range(1, len(parts) + 1):
+            out.add("/".join(parts[:i]))
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# Postings
+# ─────────────────────────────────────────────────────────────
+
+class TopicPostings:
+    """Published items of one kind keyed by every taxonomy path prefix."""
+
+    def __init__(self, items: Dict[str, Dict[str, Any]], version: Any, valid_until: Optional[float] = None) -> None:
+        self.version = version
+        self.valid_until = valid_until  # epoch seconds after which the published set changes (scheduled items)
+        self.items = items
+        self.by_prefix: Dict[str, Set[str]] = {}
+        for key, row in items.items():
+            for prefix in _prefixes(row.get("paths") or []):
+                self.by_prefix.setdefault(prefix, set()).add(key)
+
+    def under(self, path: str) -> Set[str]:
+        return self.by_prefix.get(_norm(path), set())
+
+    def row(self, key: str) -> Dict[str, Any]:
+        return self.items[key]
+
+
+class _ExercisePostings:
+    """Exercise postings backed by the in-memory exercise index (no copy of its prefix map)."""
+
+    def __init__(self, view: Any) -> None:
+        self.version = view
+        self.valid_until = None
+        self._view = view
+        self._under: Dict[str, Set[str]] = {}
+
+    def under(self, path: str) -> Set[str]:
+        path = _norm(path)
+        hit = self._under.get(path)
+        if hit is None:
+            tagged = self._view.by_tax.get(path)
+            if not tagged:
+                return set()
+            hit = self._under[path] = {k for k in tagged if k in self._view.published}
+        return hit
+
+    def row(self, key: str) -> Dict[str, Any]:
+        meta = self._view.entries.get(key) or {}
+        ex_type, _, slug = key.partition("/")
+        return {
+            "kind": "exercise",
+            "key": key,
+            "type": ex_type,
+            "slug": slug,
+            "title_es": meta.get("title_es"),
+            "title_en": meta.get("title_en"),
+            "level": meta.get("level"),
+            "version": meta.get("version"),
+            "paths": meta.get("taxonomy_paths") or [],
+            "url": f"/exercises/api/{ex_type}/{slug}",
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+# Sources
+# ─────────────────────────────────────────────────────────────
+
+_lock = threading.Lock()
+_postings: Dict[str, Any] = {}
+_lessons_generation = 0
+_lessons_checked = 0.0
+_lessons_watching = False
+
+
+def _published_now(row: Dict[str, Any], now: datetime) -> Optional[bool]:
+    """True/False for articles; None when published later (scheduled)."""
+    if (row.get("status") or "draft").lower() != "published":
+        return False
+    pub = (row.get("published_at") or "").strip()
+    if not pub:
+        return True
+    try:
+        return True if datetime.fromisoformat(pub.replace("Z", "+00:00")) <= now else None
+    except Exception:
+        return True
+
+
+def _article_postings(cached: Optional[TopicPostings]) -> TopicPostings:
+    from app.storage import article_catalog_path, load_article_catalog
+
+    def _version() -> Any:
+        try:
+            st = os.stat(article_catalog_path())
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    version = _version()
+    if cached is not None and version is not None and cached.version == version and (
+            cached.valid_until is None or time.time() < cached.valid_until):
+        return cached
+    now = datetime.now(timezone.utc)
+    items: Dict[str, Dict[str, Any]] = {}
+    scheduled: List[float] = []
+    for row in load_article_catalog():  # may refresh the catalog file itself
+        state = _published_now(row, now)
+        if state is None:
+            try:
+                scheduled.append(datetime.fromisoformat(row["published_at"].replace("Z", "+00:00")).timestamp())
+            except Exception:
+                pass
+        if not state or not row.get("taxonomy_paths"):
+            continue
+        items[row["slug"]] = {
+            "kind": "article",
+            "key": row["slug"],
+            "slug": row["slug"],
+            "display": row.get("display") or {},
+            "image_url": row.get("image_url"),
+            "published_at": row.get("published_at"),
+            "paths": row.get("taxonomy_paths") or [],
+            "url": f"/articles/{row['slug']}/",
+        }
+    return TopicPostings(items, _version(), min(scheduled) if scheduled else None)
+
+
+def _exercise_postings(cached: Optional[_ExercisePostings]) -> _ExercisePostings:
+    from app.exercises_store import exercise_index
+    view = exercise_index()
+    if cached is not None and cached.version is view:
+        return cached
+    return _ExercisePostings(view)
+
+
+def lessons_changed(*_args: Any) -> None:
+    """Mark lesson postings stale (SQLAlchemy event hook; also callable directly)."""
+    global _lessons_generation
+    _lessons_generation += 1
+
+
+def _watch_lessons() -> None:
+    global _lessons_watching
+    if _lessons_watching:
+        return
+    try:
+        from sqlalchemy import event
+        from domains.lessons.models import Lesson, Unit
+        for model in (Lesson, Unit):
+            for name in ("after_insert", "after_update", "after_delete"):
+                event.listen(model, name, lessons_changed)
+        _lessons_watching = True
+    except Exception:
+        pass
+
+
+def _lesson_paths(value: Any) -> List[str]:
+    """Unit.taxonomy_json: a list of paths, {"paths"|"taxonomy_paths": [...]}, or a JSON/plain string."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return [value] if _norm(value) else []
+    if isinstance(value, dict):
+        value = value.get("paths") or value.get("taxonomy_paths") or []
+    if isinstance(value, list):
+        return [_norm(p) for p in value if isinstance(p, str) and _norm(p)]
+    return []
+
+
+def _lesson_postings(cached: Optional[TopicPostings]) -> TopicPostings:
+    global _lessons_checked
+    _watch_lessons()
+    version = _lessons_generation
+    if cached is not None and cached.version == version and time.monotonic() - _lessons_checked < LESSONS_RECHECK_SECONDS:
+        return cached
+    items: Dict[str, Dict[str, Any]] = {}
+    try:
+        from app.extensions.db import db
+        from domains.lessons.models import Lesson, Unit
+        rows = (
+            db.session.query(Lesson.slug, Lesson.title, Lesson.locale, Unit.taxonomy_json)
+            .outerjoin(Unit, Lesson.unit_id == Unit.id)
+            .filter(Lesson.status == "published")
+            .all()
+        )
+        for slug, title, locale, taxonomy in rows:
+            paths = _lesson_paths(taxonomy)
+            if paths:
+                items[slug] = {"kind": "lesson", "key": slug, "slug": slug, "title": title, "locale": locale,
+                               "paths": paths, "url": f"/lessons/{slug}"}
+    except Exception:
+        if cached is not None:
+            return cached  # keep the last good postings if the DB is unavailable
+    _lessons_checked = time.monotonic()
+    return TopicPostings(items, version)
+
+
+_BUILDERS = {"article": _article_postings, "exercise": _exercise_postings, "lesson": _lesson_postings}
+
+
+def postings(kind: str) -> Any:
+    """Current postings for one kind (rebuilt only after its store changed)."""
+    with _lock:
+        fresh = _BUILDERS[kind](_postings.get(kind))
+        _postings[kind] = fresh
+        return fresh
+
+
+# ─────────────────────────────────────────────────────────────
+# Queries
+# ─────────────────────────────────────────────────────────────
+
+def topic_counts(path: str, kinds: Iterable[str] = KINDS) -> Dict[str, int]:
+    """Published items under path (itself or any descendant) per kind, plus "total"."""
+    out = {kind: len(postings(kind).under(path)) for kind in kinds}
+    out["total"] = sum(out.values())
+    return out
+
+
+def topic_content(path: str, kinds: Iterable[str] = KINDS, limit: Optional[int] = None, lang: str = "es") -> Dict[str, Any]:
+    """
+    Published items under path by kind ({kind: [row, ...]}, sorted by key) and
+    their counts. Article rows get "title"/"summary" resolved for lang.
+    """
+    from app.storage import catalog_display
+    items: Dict[str, List[Dict[str, Any]]] = {}
+    counts: Dict[str, int] = {}
+    for kind in kinds:
+        src = postings(kind)
+        keys = sorted(src.under(path))
+        counts[kind] = len(keys)
+        rows = []
+        for key in keys[:limit] if limit is not None else keys:
+            row = dict(src.row(key))
+            if kind == "article":
+                row.update(catalog_display(row, lang))
+                row.pop("display", None)
+            rows.append(row)
+        items[kind] = rows
+    counts["total"] = sum(counts.values())
+    return {"path": _norm(path), "counts": counts, "items": items}
+
+
+def node_counts(kind: str) -> Dict[str, int]:
+    """{path prefix: published items of kind under it} for every tagged prefix."""
+    src = postings(kind)
+    prefixes = src.by_prefix if isinstance(src, TopicPostings) else src._view.by_tax
+    return {p: n for p in prefixes if (n := len(src.under(p)))}
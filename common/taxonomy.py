@@ -2,19 +2,31 @@
 from __future__ import annotations
 
 import json
-from functools import lru_cache
+import os
+import threading
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
-# Base directory for taxonomy JSON files
-_TAXONOMY_DIR = Path("data/ui/taxonomy")
+# Base directory for taxonomy JSON files (<data root>/ui/taxonomy)
+def _taxonomy_dir() -> Path:
+    try:
+        from app.storage import get_data_root  # honours the app's data root; independent of the CWD
+        return get_data_root() / "ui" / "taxonomy"
+    except Exception:
+        return Path(__file__).resolve().parent.parent / "data" / "ui" / "taxonomy"
+
+# How often (seconds) a compiled taxonomy re-checks its file's mtime/size
+RELOAD_CHECK_SECONDS = float(os.getenv("TAXONOMY_RELOAD_CHECK_SECONDS", "1.0"))
 
 # Public API (documented in the plan):
 # - load_taxonomy(name) -> dict
+# - get_taxonomy(name) -> CompiledTaxonomy
 # - title_for(path, lang)
 # - children_of(path)
 # - ancestors(path)
 # - is_ancestor(ancestor, path)
+# - in_subtree(root, path)
 
 
 def _read_json(path: Path) -> Dict[str, Any]:
@@ -71,7 +83,164 @@ def _index_nodes(nodes: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]]
     return by_path, children
 
 
-@lru_cache(maxsize=8)
+# ─────────────────────────────────────────────────────────────
+# Compiled taxonomy
+# ─────────────────────────────────────────────────────────────
+
+class CompiledTaxonomy:
+    """
+    One taxonomy file compiled for per-request lookups.
+
+    Nodes get integer ids in pre-order over the path tree; each node's subtree
+    is the id interval [tin, tout), so ancestor/descendant tests are two
+    integer comparisons. Titles (per language + fallback) and breadcrumbs are
+    computed once per language and then served from lists indexed by id.
+    Node dicts are the parsed JSON objects: callers must not mutate them.
+    """
+
+    def __init__(self, name: str, raw: Dict[str, Any], version: Any = None) -> None:
+        self.name = name
+        self.raw = raw
+        self.version = version
+        by_path, children = _index_nodes(raw.get("nodes", []) or [])
+        self.by_path = by_path
+        self.children = children
+        self.paths: List[str] = []
+        self.nodes: List[Dict[str, Any]] = []
+        self.ids: Dict[str, int] = {}
+        self.tout: List[int] = []
+
+        # Orphans (parent path not a node) hang under their nearest existing ancestor,
+        # so "a/b/c" stays inside "a"'s interval when "a/b" is missing
+        adopted: Dict[str, List[Dict[str, Any]]] = {}
+        for parent in sorted(p for p in children if p and p not in by_path):
+            anc = parent
+            while anc and anc not in by_path:
+                anc = anc.rpartition("/")[0]
+            adopted.setdefault(anc, []).extend(children[parent])
+
+        def kids(path: str) -> List[Dict[str, Any]]:
+            return children.get(path, []) + adopted.get(path, [])
+
+        # Pre-order walk of the path tree
+        stack: List[Tuple[str, bool]] = [(n["path"].strip().strip("/"), False) for n in reversed(kids(""))]
+        while stack:
+            path, done = stack.pop()
+            if done:
+                self.tout[self.ids[path]] = len(self.paths)
+                continue
+            if path in self.ids:
+                continue
+            self.ids[path] = len(self.paths)
+            self.paths.append(path)
+            self.nodes.append(by_path[path])
+            self.tout.append(0)
+            stack.append((path, True))
+            stack.extend((c["path"].strip().strip("/"), False) for c in reversed(kids(path)))
+        self._titles: Dict[Tuple[str, str], List[str]] = {}
+        self._crumbs: Dict[Tuple[str, str], List[List[Tuple[str, str]]]] = {}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"raw": self.raw, "by_path": self.by_path, "children": self.children}
+
+    def node(self, path: str) -> Optional[Dict[str, Any]]:
+        return self.by_path.get((path or "").strip().strip("/"))
+
+    def has_children(self, path: str) -> bool:
+        return bool(self.children.get((path or "").strip().strip("/")))
+
+    def _title_list(self, lang: str, fallback: str) -> List[str]:
+        key = (lang, fallback)
+        titles = self._titles.get(key)
+        if titles is None:
+            titles = []
+            for path, node in zip(self.paths, self.nodes):
+                t = node.get("title", {}) or {}
+                titles.append(t.get(lang) or t.get(fallback) or path.rsplit("/", 1)[-1].replace("-", " ").title())
+            self._titles[key] = titles
+        return titles
+
+    def title(self, path: str, lang: str = "es", fallback: str = "en") -> Optional[str]:
+        i = self.ids.get((path or "").strip().strip("/"))
+        if i is None:
+            return None
+        titles = self._titles.get((lang, fallback))
+        return (titles or self._title_list(lang, fallback))[i]
+
+    def breadcrumb(self, path: str, lang: str = "es", fallback: str = "en") -> Optional[List[Tuple[str, str]]]:
+        """(path, title) from the root to path, or None if path is not a node."""
+        i = self.ids.get((path or "").strip().strip("/"))
+        if i is None:
+            return None
+        key = (lang, fallback)
+        crumbs = self._crumbs.get(key)
+        if crumbs is None:
+            crumbs = []
+            for p in self.paths:
+                crumbs.append([(a, self.title(a, lang, fallback)) for a in ancestors(p) + [p]])
+            self._crumbs[key] = crumbs
+        return list(crumbs[i])
+
+    def interval(self, path: str) -> Optional[Tuple[int, int]]:
+        """[tin, tout) id interval of path's subtree, or None if unknown."""
+        i = self.ids.get((path or "").strip().strip("/"))
+        return None if i is None else (i, self.tout[i])
+
+    def in_subtree(self, root: str, path: str) -> bool:
+        """True if path is root or one of its descendants."""
+        root = (root or "").strip().strip("/")
+        path = (path or "").strip().strip("/")
+        r, p = self.ids.get(root), self.ids.get(path)
+        if r is None or p is None:
+            return bool(root) and (path == root or path.startswith(root + "/"))
+        return r <= p < self.tout[r]
+
+    def is_ancestor(self, ancestor: str, path: str) -> bool:
+        ancestor = (ancestor or "").strip().strip("/")
+        path = (path or "").strip().strip("/")
+        if not ancestor or not path or ancestor == path:
+            return False
+        return self.in_subtree(ancestor, path)
+
+
+_compiled: Dict[str, Tuple[CompiledTaxonomy, float]] = {}  # name -> (compiled, next stat check)
+_compile_lock = threading.Lock()
+
+
+def _file_version(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def get_taxonomy(name: str = "grammar") -> CompiledTaxonomy:
+    """
+    Compiled taxonomy by name (e.g., 'grammar'). Recompiled when the file's
+    mtime/size changes, checked at most every RELOAD_CHECK_SECONDS.
+    """
+    hit = _compiled.get(name)
+    now = time.monotonic()
+    if hit is not None and now < hit[1]:
+        return hit[0]
+    file_path = (_taxonomy_dir() / f"{name}.json").resolve()
+    version = _file_version(file_path)
+    with _compile_lock:
+        hit = _compiled.get(name)
+        if hit is not None and version is not None and hit[0].version == version:
+            _compiled[name] = (hit[0], now + RELOAD_CHECK_SECONDS)
+            return hit[0]
+        try:
+            tx = CompiledTaxonomy(name, _read_json(file_path), version)
+        except (FileNotFoundError, ValueError):
+            if hit is None:
+                raise
+            tx = hit[0]  # mid-edit or removed: keep serving the last good compile
+        _compiled[name] = (tx, now + RELOAD_CHECK_SECONDS)
+        return tx
+
+
 def load_taxonomy(name: str) -> Dict[str, Any]:
     """
     Load a taxonomy JSON file by name (e.g., 'grammar') and build indices.
@@ -83,17 +252,7 @@ def load_taxonomy(name: str) -> Dict[str, Any]:
         "children": { parent_path: [child_nodes], ... }
       }
     """
-    file_path = (_TAXONOMY_DIR / f"{name}.json").resolve()
-    raw = _read_json(file_path)
-
-    nodes = raw.get("nodes", []) or []
-    by_path, children = _index_nodes(nodes)
-
-    return {
-        "raw": raw,
-        "by_path": by_path,
-        "children": children,
-    }
+    return get_taxonomy(name).as_dict()
 
 
 def title_for(path: str, lang: str = "es", fallback: str = "en") -> Optional[str]:
@@ -101,20 +260,7 @@ def title_for(path: str, lang: str = "es", fallback: str = "en") -> Optional[str
     Get localized title for a topic path, with graceful fallback.
     Returns None if the path is unknown.
     """
-    path = (path or "").strip().strip("/")
-    if not path:
-        return None
-    tx = load_taxonomy("grammar")
-    node = tx["by_path"].get(path)
-    if not node:
-        return None
-    t = node.get("title", {}) or {}
-    if lang in t and t[lang]:
-        return t[lang]
-    if fallback in t and t[fallback]:
-        return t[fallback]
-    # last resort: derive from path segment
-    return path.rsplit("/", 1)[-1].replace("-", " ").title()
+    return get_taxonomy("grammar").title(path, lang=lang, fallback=fallback)
 
 
 def children_of(path: Optional[str]) -> List[Dict[str, Any]]:
@@ -123,8 +269,7 @@ def children_of(path: Optional[str]) -> List[Dict[str, Any]]:
     Root-children: use path=None or ''.
     """
     key = "" if not path else str(path).strip().strip("/")
-    tx = load_taxonomy("grammar")
-    return list(tx["children"].get(key, []))
+    return list(get_taxonomy("grammar").children.get(key, []))
 
 
 def ancestors(path: str) -> List[str]:
@@ -143,17 +288,19 @@ def is_ancestor(ancestor: str, path: str) -> bool:
     """
     True if `ancestor` is an ancestor of `path` (strict), supporting arbitrary depth.
     """
-    ancestor = (ancestor or "").strip().strip("/")
-    path = (path or "").strip().strip("/")
-    if not ancestor or not path or ancestor == path:
-        return False
-    return path.startswith(ancestor + "/")
+    return get_taxonomy("grammar").is_ancestor(ancestor, path)
+
+
+def in_subtree(root: str, path: str) -> bool:
+    """
+    True if `path` is `root` or one of its descendants (O(1) for known paths).
+    """
+    return get_taxonomy("grammar").in_subtree(root, path)
 
 
 # Convenience: safe lookup returning a node dict or None
 def node_for(path: str) -> Optional[Dict[str, Any]]:
-    tx = load_taxonomy("grammar")
-    return tx["by_path"].get((path or "").strip().strip("/"))
+    return get_taxonomy("grammar").node(path)
 
 
 # Convenience: breadcrumb tuples (path, title)
@@ -164,6 +311,9 @@ def breadcrumb(path: str, lang: str = "es") -> List[Tuple[str, str]]:
     path = (path or "").strip().strip("/")
     if not path:
         return []
+    known = get_taxonomy("grammar").breadcrumb(path, lang=lang)
+    if known is not None:
+        return known
     crumbs = []
     for p in ancestors(path) + [path]:
         crumbs.append((p, title_for(p, lang=lang)))
@@ -40,6 +40,30 @@ class BaseConfig:
     # App toggles
     DEBUG_TOOLBAR = os.getenv("DEBUG_TOOLBAR", "false").lower() == "true"
 
+    # Background jobs (app/jobs.py): persistent SQLite queue + runner threads per process
+    JOBS_ENABLED = os.getenv("JOBS_ENABLED", "true").lower() == "true"
+    JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "1"))
+    JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", str(INSTANCE_DIR / "jobs.sqlite3"))
+
+    # Public pages (app/http_cache.py): anonymous responses get ETags + max-age and
+    # honour If-None-Match; signed-in users keep no-store. The in-process page cache is opt-in.
+    PUBLIC_CACHE_ENABLED = os.getenv("PUBLIC_CACHE_ENABLED", "true").lower() == "true"
+    PUBLIC_CACHE_MAX_AGE = int(os.getenv("PUBLIC_CACHE_MAX_AGE", "60"))
+    PUBLIC_CACHE_SWR = int(os.getenv("PUBLIC_CACHE_SWR", "600"))
+    PUBLIC_PAGE_CACHE = os.getenv("PUBLIC_PAGE_CACHE", "false").lower() == "true"
+
+    # Lesson attempts/progress (domains/lessons/writes.py): write-behind buffer flushed in
+    # bulk every FLUSH_MS or FLUSH_ROWS rows; accepted rows are spooled until committed
+    LESSON_WRITE_BEHIND = os.getenv("LESSON_WRITE_BEHIND", "true").lower() == "true"
+    LESSON_WRITES_FLUSH_MS = int(os.getenv("LESSON_WRITES_FLUSH_MS", "200"))
+    LESSON_WRITES_FLUSH_ROWS = int(os.getenv("LESSON_WRITES_FLUSH_ROWS", "500"))
+    LESSON_WRITES_MAX_PENDING = int(os.getenv("LESSON_WRITES_MAX_PENDING", "50000"))
+    LESSON_WRITES_SPOOL_DIR = os.getenv("LESSON_WRITES_SPOOL_DIR", str(INSTANCE_DIR / "lesson_writes"))
+    LESSON_WRITES_FSYNC = os.getenv("LESSON_WRITES_FSYNC", "false").lower() == "true"
+
+    # `flask content export-static` target (app/static_export.py), served by nginx
+    STATIC_EXPORT_DIR = os.getenv("STATIC_EXPORT_DIR", str(INSTANCE_DIR / "static_export"))
+
 
 # ─────────────────────────────────────────────────────────────
 # Environments
@@ -57,6 +81,9 @@ class TestConfig(BaseConfig):
     # Ephemeral in-memory DB for tests unless overridden
     SQLALCHEMY_DATABASE_URI = os.getenv("TEST_DATABASE_URL", "sqlite:///:memory:")
     SESSION_COOKIE_SECURE = False
+    # Tests run maintenance tasks inline
+    JOBS_ENABLED = False
+    LESSON_WRITE_BEHIND = False
 
 
 class ProdConfig(BaseConfig):
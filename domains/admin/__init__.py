@@ -33,6 +33,7 @@ from domains.admin import exercises_pages as _ex_pages  # /admin/exercises (libr
 from domains.admin import glossary_pages    # /admin/glossary (index + validate)
 from domains.admin import lessons_pages     # /admin/lessons (interactive lessons)
 from domains.admin import lessons_api       # /admin/api/lessons (CRUD)
+from domains.admin import jobs_api          # /admin/api/jobs (background job status)
 
 # Safe-import exercises_api so we can surface any import errors
 _exercises_api_error = None
@@ -41,6 +42,27 @@ try:
 except Exception as e:
     _exercises_api_error = f"{type(e).__name__}: {e}"
 
+@bp.before_request
+def _admin_fresh_reads():
+    """Admin editors always read content from disk, never from app.storage.content_cache."""
+    from app.storage import content_cache
+    g._content_cache_bypass = content_cache.begin_bypass()
+
+@bp.teardown_request
+def _admin_fresh_reads_end(exc=None):
+    token = g.pop("_content_cache_bypass", None)
+    if token is not None:
+        from app.storage import content_cache
+        content_cache.end_bypass(token)
+
+@bp.get("/api/cache")
+@login_required
+def _api_content_cache_stats():
+    """Content and rendered-fragment cache counters (entries, size, hits, misses, evictions, bypassed reads)."""
+    from app.fragments import fragment_cache
+    from app.storage import content_cache
+    return jsonify({"ok": True, "cache": content_cache.stats(), "fragments": fragment_cache.stats()})
+
 @bp.get("/api/exercises/_import_status")
 def _api_exercises_import_status():
     """
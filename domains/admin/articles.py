@@ -36,7 +36,7 @@ def admin_articles_new():
 @bp.post("/articles/new")
 def admin_articles_create():
     """
-    Create an article.json under data/articles/<slug>/ with:
+    Create an article (manifest + shards) under data/articles/<slug>/ with:
       - unified 'html' body
       - optional 'image_url' (lead image saved under media/img)
       - optional 'summary_html' (minimal Quill HTML)
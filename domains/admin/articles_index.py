@@ -1,7 +1,7 @@
 # domains/admin/articles_index.py
 from __future__ import annotations
 from flask import render_template, url_for
-from app.storage import list_slugs, load_article
+from app.storage import load_article_catalog
 from . import bp
 
 @bp.get("/articles/")
@@ -11,19 +11,14 @@ def admin_articles_index():
 
     status_filter = (request.args.get("status") or "").lower()  # '', 'draft', 'published', 'archived'
 
-    slugs = list_slugs("articles")
     rows = []
-    for s in slugs:
-        data = load_article(s) or {}
-
-        status = (data.get("status") or "draft").lower()
+    for row in load_article_catalog():
+        status = row.get("status") or "draft"
         if status_filter in ("draft", "published", "archived") and status != status_filter:
             continue
-
-        title = data.get("title") or data.get("title_es") or data.get("title_en") or s
         rows.append({
-            "slug": s,
-            "title": title,
+            "slug": row["slug"],
+            "title": row.get("title") or row["slug"],
             "status": status,
         })
 
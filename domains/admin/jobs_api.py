@@ -0,0 +1,46 @@
+# domains/admin/jobs_api.py
+from __future__ import annotations
+from flask import request, jsonify
+from flask_login import login_required
+from . import bp  # existing admin blueprint
+from app import jobs
+
+
+# ─────────────────────────────────────────────────────────────
+# Background jobs: status + metrics (see app/jobs.py)
+# ─────────────────────────────────────────────────────────────
+@bp.get("/api/jobs")
+@login_required
+def api_jobs_list():
+    """
+    Queue metrics (depth, running, failures, wait/run latency) and recent jobs.
+    Optional: ?status=pending|running|done|failed&limit=N (default 50, max 500).
+    """
+    status = (request.args.get("status") or "").strip() or None
+    try:
+        limit = max(1, min(500, int(request.args.get("limit") or 50)))
+    except Exception:
+        limit = 50
+    return jsonify({"ok": True, "metrics": jobs.metrics(), "jobs": jobs.list_jobs(status, limit)})
+
+
+@bp.get("/api/jobs/<int:job_id>")
+@login_required
+def api_jobs_get(job_id: int):
+    job = jobs.get_job(job_id)
+    if job is None:
+        resp = jsonify({"ok": False, "error": "not found"})
+        resp.status_code = 404
+        return resp
+    return jsonify({"ok": True, "job": job})
+
+
+# ─────────────────────────────────────────────────────────────
+# Lesson attempt/progress write-behind buffer (see domains/lessons/writes.py)
+# ─────────────────────────────────────────────────────────────
+@bp.get("/api/lessons/writes")
+@login_required
+def api_lesson_writes_metrics():
+    """Backlog, flush latency, batch size and lag of this worker's lesson write buffer."""
+    from domains.lessons.writes import write_buffer
+    return jsonify({"ok": True, "metrics": write_buffer.metrics()})
@@ -1,11 +1,15 @@
 # domains/articles/__init__.py
 from __future__ import annotations
-from flask import Blueprint, render_template_string, jsonify, abort
-from app.storage import list_slugs, load_article
+from flask import Blueprint, render_template, render_template_string, jsonify, abort
+from app.fragments import fragment_cache
+from app.storage import article_version, catalog_display, load_article_body, load_article_catalog, load_article_meta
 import re
 
 bp = Blueprint("articles", __name__)
 
+_H3_SPLIT_RE = re.compile(r'(?is)(<h3[^>]*>.*?</h3>)')
+_TAG_RE = re.compile(r'(?is)<[^>]+>')
+
 def _h3_sections_to_accordions(html: str) -> str:
     """
     Robust server-side converter:
@@ -17,7 +21,7 @@ def _h3_sections_to_accordions(html: str) -> str:
         return html or ""
 
     # Split into [pre, <h3>title</h3>, body, <h3>title2</h3>, body2, ...]
-    parts = re.split(r'(?is)(<h3[^>]*>.*?</h3>)', html)
+    parts = _H3_SPLIT_RE.split(html)
     if len(parts) == 1:
         return html  # no h3s — return as-is
 
@@ -28,7 +32,7 @@ def _h3_sections_to_accordions(html: str) -> str:
         body = parts[i+1] if (i+1) < len(parts) else ''
 
         # Extract plain title text
-        title = re.sub(r'(?is)<[^>]+>', '', h3).strip() or 'Sección'
+        title = _TAG_RE.sub('', h3).strip() or 'Sección'
 
         # Build an accordion block
         block = (
@@ -76,7 +80,10 @@ def articles_healthz():
 
 @bp.get("/list")
 def articles_list():
-    slugs = list_slugs("articles")
+    from flask import request
+    lang = (request.cookies.get("lang") or "es").lower()
+    # Titles come from data/articles/_catalog.json (no article bodies parsed)
+    rows = [{"slug": r["slug"], "title": catalog_display(r, lang)["title"]} for r in load_article_catalog()]
     title = "Articles · List"
     html = """
     {% extends "base.html" %}
@@ -84,10 +91,10 @@ def articles_list():
     {% block content %}
       <div class="ppx-card ppx-card--pad">
         <h1 class="ppx-h1">{{ t('Artículos disponibles', 'Available Articles', app_lang) }}</h1>
-        {% if slugs %}
+        {% if rows %}
           <ul style="margin:.5rem 0 0 1rem;">
-            {% for s in slugs %}
-              <li><a class="ppx-link" href="{{ url_for('articles.article_view', slug=s) }}">{{ s }}</a></li>
+            {% for r in rows %}
+              <li><a class="ppx-link" href="{{ url_for('articles.article_view', slug=r.slug) }}">{{ r.title }}</a></li>
             {% endfor %}
           </ul>
         {% else %}
@@ -96,14 +103,17 @@ def articles_list():
       </div>
     {% endblock %}
     """
-    return render_template_string(html, title=title, slugs=slugs)
+    return render_template_string(html, title=title, rows=rows)
 
 @bp.get("/<slug>")
 def article_view(slug: str):
     from flask import request, make_response, url_for
     from urllib.parse import urlencode
 
-    data = load_article(slug)
+    # Manifest only: the accordion-converted body comes from the fragment cache
+    # (keyed by the article's content version) or from its shard
+    version = article_version(slug)
+    data = load_article_meta(slug)
     if not data:
         abort(404)
 
@@ -165,22 +175,24 @@ def article_view(slug: str):
         active_al = best_article_lang()
 
     # Resolve content for chosen language. Mother/base lives at root fields.
-    def resolve_content(lang_code: str):
-        # Legacy root fallbacks: title/title_es/title_en; html/html_es/html_en
+    def resolve_title(lang_code: str) -> str:
+        # Legacy root fallbacks: title/title_es/title_en
         if not lang_code or (mother_lang and lang_code == mother_lang):
-            title_any = data.get("title")
-            title_es = data.get("title_es")
-            title_en = data.get("title_en")
-            display_title = title_any or title_es or title_en or slug
-            html_raw = data.get("html") or data.get("html_es") or data.get("html_en") or ""
-            return display_title, html_raw
-        slot = i18n.get(lang_code) or {}
-        return (slot.get("title") or slug), (slot.get("html") or "")
-
-    display_title, body_raw = resolve_content(active_al)
-
-    # Convert H3 sections into accordions on the server
-    body_html = _h3_sections_to_accordions(body_raw)
+            return data.get("title") or data.get("title_es") or data.get("title_en") or slug
+        return (i18n.get(lang_code) or {}).get("title") or slug
+
+    def render_body() -> str:
+        # Legacy root fallbacks: html/html_es/html_en
+        if not active_al or (mother_lang and active_al == mother_lang):
+            base = load_article_body(slug)
+            body_raw = base.get("html") or base.get("html_es") or base.get("html_en") or ""
+        else:
+            body_raw = load_article_body(slug, active_al).get("html") or ""
+        # Convert H3 sections into accordions on the server
+        return _h3_sections_to_accordions(body_raw)
+
+    display_title = resolve_title(active_al)
+    body_html = fragment_cache.get_or_render(("articles.article_view", slug, active_al), version, render_body)
 
     # Build dropdown options: an "Original" section (mother/base first), separator, then other languages.
     # Original item points to mother_lang (or base '').
@@ -198,91 +210,13 @@ def article_view(slug: str):
             qs["al"] = target_code
         return url_for("articles.article_view", slug=slug) + ("?" + urlencode(qs) if qs else "")
 
-    # Inline template with an article-language dropdown:
+    # Template (templates/articles_view.html) with an article-language dropdown:
     # - Top "Original" block showing native name of mother/base
     # - Divider line
     # - Other available translations (native names)
-    html = """
-    {% extends "base.html" %}
-    {% block title %}{{ page_title }}{% endblock %}
-    {% block content %}
-      <article class="ppx-card ppx-card--pad">
-        <header class="ppx-row" style="align-items:center;justify-content:space-between;gap:.75rem;flex-wrap:wrap;margin-bottom:.75rem;">
-          <h1 class="ppx-h1" style="margin:0;">{{ page_title }}</h1>
-
-          {% if (other_codes|length) or (original_code is not none) %}
-          <details style="position:relative;">
-            <summary class="ppx-btn" style="cursor:pointer;border-radius:999px;">
-              🌐
-              {% if active_al %}
-                {{ native_label(active_al) }}
-              {% else %}
-                {{ 'Original' if (app_lang!='es') else 'Original' }}
-              {% endif %}
-            </summary>
-            <div style="position:absolute;right:0;margin-top:.4rem;min-width:240px;background:#fff;border:1px solid #e5e7eb;border-radius:12px;box-shadow:0 8px 24px rgba(0,0,0,.08);padding:.35rem;">
-              <!-- Original section header -->
-              <div style="padding:.35rem .6rem .25rem .6rem;font:700 12px/1.2 Montserrat,system-ui;color:#475569;letter-spacing:.02em;">
-                {{ 'Original' if (app_lang!='es') else 'Original' }}
-              </div>
-              <ul style="list-style:none;margin:0;padding:.15rem .25rem .25rem .25rem;">
-                <li>
-                  <a href="{{ switch_href(original_code) }}"
-                     style="display:flex;align-items:center;justify-content:space-between;text-decoration:none;color:#0f172a;padding:.45rem .6rem .45rem 1.25rem;border-radius:8px;"
-                     onmouseover="this.style.background='#f3f4ff';"
-                     onmouseout="this.style.background='transparent';"
-                     aria-current="{{ 'true' if (active_al or '') == (original_code or '') else 'false' }}">
-                    <span>{{ native_label(original_code) }}</span>
-                    {% if (active_al or '') == (original_code or '') %}<span aria-hidden="true">✓</span>{% endif %}
-                  </a>
-                </li>
-              </ul>
-
-              <!-- Existing versions header -->
-              <div style="padding:.35rem .6rem .25rem .6rem;font:700 12px/1.2 Montserrat,system-ui;color:#475569;letter-spacing:.02em;">
-                {{ t('Versiones existentes', 'Existing versions', app_lang) }}
-              </div>
-
-              {% if other_codes %}
-              <ul style="list-style:none;margin:0;padding:.15rem .25rem;">
-                {% for code in other_codes %}
-                  <li>
-                    <a href="{{ switch_href(code) }}"
-                       style="display:flex;align-items:center;justify-content:space-between;text-decoration:none;color:#0f172a;padding:.45rem .6rem .45rem 1.25rem;border-radius:8px;"
-                       onmouseover="this.style.background='#f3f4ff';"
-                       onmouseout="this.style.background='transparent';"
-                       aria-current="{{ 'true' if code == active_al else 'false' }}">
-                      <span>{{ native_label(code) }}</span>
-                      {% if code == active_al %}<span aria-hidden="true">✓</span>{% endif %}
-                    </a>
-                  </li>
-                {% endfor %}
-              </ul>
-              {% else %}
-              <div style="padding:.35rem .6rem .25rem 1.25rem;color:#64748b;font:500 12px/1.2 Montserrat,system-ui;">
-                {{ t('No hay otras versiones.', 'No other versions.', app_lang) }}
-              </div>
-              {% endif %}
-            </div>
-          </details>
-          {% endif %}
-        </header>
-
-        {% if body_html %}
-          <div>{{ safe(body_html) }}</div>
-        {% else %}
-          <p class="ppx-muted">{{ t('Este artículo no tiene contenido para este idioma.', 'This article has no content for this language.', app_lang) }}</p>
-        {% endif %}
-      </article>
-    {% endblock %}
-
-    {% block scripts %}
-      <script src="{{ url_for('static', filename='js/public_acc.js') }}"></script>
-    {% endblock %}
-    """
 
-    resp = make_response(render_template_string(
-        html,
+    resp = make_response(render_template(
+        "articles_view.html",
         page_title=display_title,
         body_html=body_html,
         active_al=active_al,
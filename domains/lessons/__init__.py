@@ -19,3 +19,8 @@ def init_app(app):
     app.register_blueprint(bp_public)
     app.register_blueprint(bp_api)
 
+    # Attempts/progress are written behind the request by a flusher thread
+    if app.config.get("LESSON_WRITE_BEHIND", True):
+        from .writes import write_buffer
+        write_buffer.start(app)
+
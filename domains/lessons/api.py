@@ -1,4 +1,8 @@
-from flask import jsonify, request
+import time
+import uuid
+
+from flask import current_app, jsonify, request
+from flask_login import current_user
 
 from . import bp_api
 from domains.lessons.models import Lesson
@@ -66,22 +70,187 @@ def api_get_lesson(slug_or_id: str):
     return jsonify(sample)
 
 
+# ─────────────────────────────────────────────────────────────
+# Attempts / progress (write-behind; see domains/lessons/writes.py)
+# ─────────────────────────────────────────────────────────────
+MAX_ATTEMPT_BYTES = 256 * 1024  # one attempt body, stored as payload_json
+LESSON_ID_TTL_SECONDS = 30.0    # other workers' lesson deletes/renames are seen within this
+LEARNER_TOKEN_SALT = "lesson-learner"
+_LESSON_IDS: dict = {}  # slug or id string -> (lessons.id, expires at); existing lessons only
+_lessons_watching = False
+
+
+def _lessons_changed(*_args) -> None:
+    """Drop cached lesson ids (SQLAlchemy event hook for changes made in this process)."""
+    _LESSON_IDS.clear()
+
+
+def _watch_lessons() -> None:
+    global _lessons_watching
+    if _lessons_watching:
+        return
+    try:
+        from sqlalchemy import event
+        for name in ("after_insert", "after_update", "after_delete"):
+            event.listen(Lesson, name, _lessons_changed)
+        _lessons_watching = True
+    except Exception:
+        pass
+
+
+def _lesson_pk(slug_or_id: str) -> int | None:
+    """Resolve a lesson slug or numeric id to lessons.id; None if no such lesson."""
+    _watch_lessons()
+    now = time.monotonic()
+    hit = _LESSON_IDS.get(slug_or_id)
+    if hit is not None and hit[1] > now:
+        return hit[0]
+    q = db.session.query(Lesson.id)
+    row = q.filter(Lesson.slug == slug_or_id).first()
+    if row is None and slug_or_id.isdigit():
+        row = q.filter(Lesson.id == int(slug_or_id)).first()
+    if row is None:
+        _LESSON_IDS.pop(slug_or_id, None)
+        return None
+    _LESSON_IDS[slug_or_id] = (row[0], now + LESSON_ID_TTL_SECONDS)
+    return row[0]
+
+
+def learner_token(user_id: int) -> str:
+    """Signed learner id for the lesson player (sent as X-Learner-Token or "learner_token")."""
+    from itsdangerous import URLSafeSerializer
+    return URLSafeSerializer(current_app.config["SECRET_KEY"], salt=LEARNER_TOKEN_SALT).dumps(int(user_id))
+
+
+def _learner_id(payload: dict) -> int | None:
+    """The signed-in user, else the learner named by a valid signed token; a bare user_id is not trusted."""
+    try:
+        if getattr(current_user, "is_authenticated", False):
+            return int(current_user.get_id())
+    except (TypeError, ValueError):
+        return None
+    token = request.headers.get("X-Learner-Token") or payload.get("learner_token")
+    if not isinstance(token, str) or not token:
+        return None
+    from itsdangerous import BadSignature, URLSafeSerializer
+    try:
+        uid = URLSafeSerializer(current_app.config["SECRET_KEY"], salt=LEARNER_TOKEN_SALT).loads(token)
+    except BadSignature:
+        return None
+    return uid if isinstance(uid, int) and uid > 0 else None
+
+
+def _number(value) -> float | None:
+    try:
+        return None if value is None or isinstance(value, bool) else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _error(message: str, status: int):
+    resp = jsonify({"ok": False, "error": message})
+    resp.status_code = status
+    return resp
+
+
+def _busy():
+    resp = _error("busy; retry with the same attempt id", 503)
+    resp.headers["Retry-After"] = "1"
+    return resp
+
+
 @bp_api.post("/<lesson_id>/attempt")
 def api_post_attempt(lesson_id: str):
-    """Accept an attempt payload; respond with correctness and score delta.
+    """Record one slide attempt (queued; 202 once accepted).
 
-    TODO: Evaluate server-side where needed; persist attempt.
+    The learner is the signed-in user or the one named by a signed learner
+    token (X-Learner-Token header or "learner_token"; see learner_token()).
+    Body: slide_id, attempt_id (client-generated, <= 64 chars; a
+    retried request with the same id is stored once), correct, score_delta,
+    plus any answer data (kept in payload_json). When the slide embeds a
+    published exercise, send "exercise": {"type", "slug", "version"?,
+    "responses"} instead and correct/score_delta are graded server-side.
     """
+    from .writes import write_buffer
+
+    if request.content_length is None or request.content_length > MAX_ATTEMPT_BYTES:
+        return _error(f"request body required, max {MAX_ATTEMPT_BYTES} bytes", 413)
     payload = request.get_json(silent=True) or {}
-    # Echo back minimal response for now
-    return jsonify({"ok": True, "lesson_id": lesson_id, "received": payload})
+    pk = _lesson_pk(lesson_id)
+    if pk is None:
+        return _error("lesson not found", 404)
+    user_id = _learner_id(payload)
+    if user_id is None:
+        return _error("sign in or send a learner token", 401)
+    slide_id = str(payload.get("slide_id") or "").strip()
+    if not slide_id or len(slide_id) > 64:
+        return _error("slide_id required (max 64 chars)", 400)
+    attempt_id = str(payload.get("attempt_id") or "").strip()
+    if len(attempt_id) > 64:
+        return _error("attempt_id too long (max 64 chars)", 400)
+    if not attempt_id:
+        attempt_id = uuid.uuid4().hex  # accepted, but a retry of this request would be stored twice
+    correct = payload.get("correct")
+    score_delta = _number(payload.get("score_delta"))
+    grade = None
+    if isinstance(payload.get("exercise"), dict):
+        from app.exercise_grading import check_limits, grade_submission
+        too_large = check_limits([payload["exercise"]])
+        if too_large:
+            return _error(too_large, 413)
+        grade = grade_submission(payload["exercise"])
+        if "error" in grade:
+            return _error("exercise not found", 404)
+        correct = bool(grade["total"]) and grade["earned"] >= grade["total"]
+        score_delta = grade["earned"] / grade["total"] if grade["total"] else 0.0
+    accepted = write_buffer.submit_attempt({
+        "user_id": user_id,
+        "lesson_id": pk,
+        "slide_id": slide_id,
+        "attempt_uid": attempt_id,
+        "payload_json": payload,
+        "correct": correct if isinstance(correct, bool) else None,
+        "score_delta": score_delta,
+    })
+    if not accepted:
+        return _busy()
+    body = {"ok": True, "lesson_id": lesson_id, "attempt_id": attempt_id}
+    if grade is not None:
+        body.update(correct=correct, score_delta=score_delta, grade=grade)
+    resp = jsonify(body)
+    resp.status_code = 202
+    return resp
 
 
 @bp_api.post("/<lesson_id>/progress")
 def api_post_progress(lesson_id: str):
-    """Accept progress updates (current slide, completion flag).
+    """Record progress (current slide, score, accuracy, completion); queued, 202 once accepted.
 
-    TODO: Persist progress in DB and update streaks/badges.
+    Safe to retry: an older update never overwrites a newer one and a completed
+    lesson stays completed. The learner is resolved as for attempts.
+    TODO: update streaks/badges.
     """
+    from .writes import write_buffer
+
     payload = request.get_json(silent=True) or {}
-    return jsonify({"ok": True, "lesson_id": lesson_id, "received": payload})
+    pk = _lesson_pk(lesson_id)
+    if pk is None:
+        return _error("lesson not found", 404)
+    user_id = _learner_id(payload)
+    if user_id is None:
+        return _error("sign in or send a learner token", 401)
+    current = payload.get("current_slide")
+    current = str(current).strip()[:64] if current is not None else None
+    accepted = write_buffer.submit_progress({
+        "user_id": user_id,
+        "lesson_id": pk,
+        "current_slide": current or None,
+        "score": _number(payload.get("score")),
+        "accuracy": _number(payload.get("accuracy")),
+        "completed": bool(payload.get("completed")),
+    })
+    if not accepted:
+        return _busy()
+    resp = jsonify({"ok": True, "lesson_id": lesson_id})
+    resp.status_code = 202
+    return resp
@@ -56,6 +56,13 @@ class UserAttempt(db.Model):
     correct = db.Column(db.Boolean, nullable=True)
     score_delta = db.Column(db.Float, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Client-supplied attempt id: retried submissions are stored once (domains/lessons/writes.py)
+    attempt_uid = db.Column(db.String(64), nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_attempts_user_lesson_slide", "user_id", "lesson_id", "slide_id"),
+        db.Index("uq_attempt_user_uid", "user_id", "attempt_uid", unique=True),
+    )
 
 
 class Badge(db.Model):
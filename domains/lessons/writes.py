@@ -0,0 +1,511 @@
+# domains/lessons/writes.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+"""
+Write-behind buffer for learner attempts and progress.
+
+Request handlers hand rows to write_buffer and return; a flusher thread
+started by domains.lessons.init_app() writes them in bulk every FLUSH_MS or as
+soon as FLUSH_ROWS are pending:
+  attempts  INSERT .. ON CONFLICT (user_id, attempt_uid) DO NOTHING
+  progress  INSERT .. ON CONFLICT (user_id, lesson_id) DO UPDATE, newest wins
+(SQLite and PostgreSQL; other databases use a select-then-write fallback.)
+
+Delivery is at-least-once: every accepted row is appended to a spool segment
+(instance/lesson_writes/<pid>-*.jsonl) before the request returns, and the
+segment is deleted only after the batch holding its rows has committed. A
+failed batch stays queued and is retried with backoff; segments left by a
+dead worker are claimed and replayed by the next process that starts.
+Replays are harmless: attempts are keyed by the client-supplied attempt id,
+and a progress row never overwrites a newer one (updated_at) or un-completes
+a lesson.
+
+When no flusher is running (scripts, shells, tests) submissions are written
+inline, so callers behave the same either way.
+"""
+
+FLUSH_MS = 200
+FLUSH_ROWS = 500
+MAX_PENDING = 50000   # beyond this, submissions are refused (HTTP 503) until the backlog drains
+MAX_BACKOFF_SECONDS = 5.0
+METRICS_WINDOW = 512  # recent batches kept for latency / size distributions
+
+
+def _utc(ts: float) -> datetime:
+    # Naive UTC, like the models' datetime.utcnow defaults
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+
+def _merge_progress(a: Optional[Dict[str, Any]], b: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine two progress rows for the same (user, lesson): newest wins, completion is sticky."""
+    if a is None:
+        return b
+    old, new = (a, b) if a["ts"] <= b["ts"] else (b, a)
+    out = dict(new)
+    for key in ("current_slide", "score", "accuracy"):
+        if out.get(key) is None:
+            out[key] = old.get(key)
+    out["completed"] = bool(old.get("completed") or new.get("completed"))
+    done = [r["completed_ts"] for r in (old, new) if r.get("completed_ts")]
+    out["completed_ts"] = min(done) if done else None
+    return out
+
+
+def _dist(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"avg": None, "p50": None, "p95": None, "max": None}
+    values = sorted(values)
+
+    def _q(q: float) -> float:
+        return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+    return {
+        "avg": round(sum(values) / len(values), 1),
+        "p50": round(_q(0.5), 1),
+        "p95": round(_q(0.95), 1),
+        "max": round(values[-1], 1),
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Bulk statements
+# ─────────────────────────────────────────────────────────────
+
+def _dialect_insert(conn: Any, table: Any) -> Any:
+    """INSERT supporting ON CONFLICT for this connection's dialect, or None."""
+    name = conn.dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(table)
+
+
+def _insert_attempts(conn: Any, table: Any, rows: List[Dict[str, Any]]) -> None:
+    stmt = _dialect_insert(conn, table)
+    if stmt is not None:
+        conn.execute(stmt.on_conflict_do_nothing(index_elements=["user_id", "attempt_uid"]), rows)
+        return
+    from sqlalchemy import select
+    existing = {
+        tuple(r) for r in conn.execute(
+            select(table.c.user_id, table.c.attempt_uid)
+            .where(table.c.user_id.in_({r["user_id"] for r in rows}))
+            .where(table.c.attempt_uid.in_({r["attempt_uid"] for r in rows}))
+        )
+    }
+    fresh = [r for r in rows if (r["user_id"], r["attempt_uid"]) not in existing]
+    if fresh:
+        conn.execute(table.insert(), fresh)
+
+
+def _upsert_progress(conn: Any, table: Any, rows: List[Dict[str, Any]]) -> None:
+    import sqlalchemy as sa
+    stmt = _dialect_insert(conn, table)
+    if stmt is not None:
+        ex = stmt.excluded
+        newer = ex.updated_at >= table.c.updated_at
+
+        def _newest(col: str) -> Any:
+            return sa.case((newer, sa.func.coalesce(ex[col], table.c[col])), else_=table.c[col])
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "lesson_id"],
+            set_={
+                "current_slide": _newest("current_slide"),
+                "score": _newest("score"),
+                "accuracy": _newest("accuracy"),
+                "completed": sa.or_(sa.func.coalesce(table.c.completed, sa.false()), ex.completed),
+                "completed_at": sa.func.coalesce(table.c.completed_at, ex.completed_at),
+                "updated_at": sa.case((newer, ex.updated_at), else_=table.c.updated_at),
+            },
+        )
+        conn.execute(stmt, rows)
+        return
+    current = {
+        (r.user_id, r.lesson_id): r for r in conn.execute(
+            sa.select(table)
+            .where(table.c.user_id.in_({r["user_id"] for r in rows}))
+            .where(table.c.lesson_id.in_({r["lesson_id"] for r in rows}))
+        )
+    }
+    inserts, updates = [], []
+    for row in rows:
+        cur = current.get((row["user_id"], row["lesson_id"]))
+        if cur is None:
+            inserts.append(row)
+            continue
+        newest = cur.updated_at is None or row["updated_at"] >= cur.updated_at
+        keep = {c: getattr(cur, c) if not newest or row[c] is None else row[c]
+                for c in ("current_slide", "score", "accuracy")}
+        values = dict(keep, completed=bool(cur.completed or row["completed"]),
+                      completed_at=cur.completed_at or row["completed_at"],
+                      updated_at=row["updated_at"] if newest else cur.updated_at)
+        # Bind names must differ from column names in UPDATE .. SET
+        updates.append(dict({f"v_{c}": v for c, v in values.items()}, v_id=cur.id))
+    if inserts:
+        conn.execute(table.insert(), inserts)
+    if updates:
+        cols = [k[2:] for k in updates[0] if k != "v_id"]
+        conn.execute(
+            table.update().where(table.c.id == sa.bindparam("v_id")).values(
+                {c: sa.bindparam(f"v_{c}") for c in cols}),
+            updates,
+        )
+
+
+# ─────────────────────────────────────────────────────────────
+# Buffer
+# ─────────────────────────────────────────────────────────────
+
+class WriteBehindBuffer:
+    """Pending attempts/progress for this process, their spool segments and flush metrics."""
+
+    def __init__(self) -> None:
+        self.flush_ms = FLUSH_MS
+        self.flush_rows = FLUSH_ROWS
+        self.max_pending = MAX_PENDING
+        self._engine: Any = None
+        self._lock = threading.Lock()          # pending rows, spool handle, counters
+        self._flush_lock = threading.Lock()    # one batch in flight at a time
+        self._wake = threading.Event()
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._attempts: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        self._progress: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self._oldest: Optional[float] = None
+        self._spool_dir: Optional[Path] = None
+        self._fsync = False
+        self._fh: Any = None
+        self._fh_path: Optional[Path] = None
+        self._segment = 0
+        self._held: List[Path] = []            # closed segments whose rows are still pending
+        self._latency_ms: deque = deque(maxlen=METRICS_WINDOW)
+        self._batch_rows: deque = deque(maxlen=METRICS_WINDOW)
+        self._lag_ms: deque = deque(maxlen=METRICS_WINDOW)
+        self._counters = {"submitted": 0, "coalesced": 0, "rejected": 0, "recovered": 0,
+                          "written_attempts": 0, "written_progress": 0, "dropped": 0,
+                          "batches": 0, "failures": 0}
+        self._last_error: Optional[str] = None
+        self._last_flush_at: Optional[float] = None
+
+    # ── lifecycle ───────────────────────────────────────────
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, app: Any = None, engine: Any = None) -> None:
+        """Start the flusher thread (idempotent) and replay spool segments left by dead workers."""
+        if self.is_running():
+            return
+        cfg = app.config if app is not None else {}
+        self.flush_ms = int(cfg.get("LESSON_WRITES_FLUSH_MS", os.getenv("LESSON_WRITES_FLUSH_MS", FLUSH_MS)))
+        self.flush_rows = int(cfg.get("LESSON_WRITES_FLUSH_ROWS", os.getenv("LESSON_WRITES_FLUSH_ROWS", FLUSH_ROWS)))
+        self.max_pending = int(cfg.get("LESSON_WRITES_MAX_PENDING", os.getenv("LESSON_WRITES_MAX_PENDING", MAX_PENDING)))
+        self._fsync = str(cfg.get("LESSON_WRITES_FSYNC", os.getenv("LESSON_WRITES_FSYNC", "false"))).lower() == "true"
+        spool = cfg.get("LESSON_WRITES_SPOOL_DIR") or os.getenv("LESSON_WRITES_SPOOL_DIR")
+        if engine is None and app is not None:
+            from app.extensions.db import db
+            with app.app_context():
+                engine = db.engine
+        self._engine = engine
+        if spool:
+            self._spool_dir = Path(spool)
+            self._spool_dir.mkdir(parents=True, exist_ok=True)
+            self._recover()
+        stop = threading.Event()
+        self._stop = stop
+        self._thread = threading.Thread(target=self._loop, args=(stop,), name="lesson-writes", daemon=True)
+        self._thread.start()
+        import atexit
+        atexit.register(self.stop)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher after a final drain (also registered with atexit)."""
+        if self._stop is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._stop = None
+        self._thread = None
+
+    def _loop(self, stop: threading.Event) -> None:
+        backoff = 0.0
+        while not stop.is_set():
+            self._wake.wait(backoff or self.flush_ms / 1000.0)
+            self._wake.clear()
+            if stop.is_set():
+                break
+            if self.flush():
+                backoff = 0.0
+            else:
+                backoff = min(MAX_BACKOFF_SECONDS, backoff * 2 or self.flush_ms / 1000.0)
+        self.flush()
+
+    # ── submission ──────────────────────────────────────────
+
+    def submit_attempt(self, row: Dict[str, Any]) -> bool:
+        """
+        Queue one attempt: user_id, lesson_id, slide_id, attempt_uid, payload_json,
+        correct, score_delta. False when refused (backlog full) or, inline, when
+        the write failed; the client should retry with the same attempt id.
+        """
+        row = dict(row, ts=row.get("ts") or time.time())
+        return self._submit("attempt", row)
+
+    def submit_progress(self, row: Dict[str, Any]) -> bool:
+        """Queue one progress update: user_id, lesson_id, current_slide, score, accuracy, completed."""
+        ts = row.get("ts") or time.time()
+        row = dict(row, ts=ts, completed=bool(row.get("completed")),
+                   completed_ts=ts if row.get("completed") else None)
+        return self._submit("progress", row)
+
+    def _submit(self, kind: str, row: Dict[str, Any]) -> bool:
+        running = self.is_running()
+        with self._lock:
+            if running and len(self._attempts) + len(self._progress) >= self.max_pending:
+                self._counters["rejected"] += 1
+                return False
+            if running and self._spool_dir is not None:
+                self._spool(kind, row)
+            self._queue(kind, row)
+            self._counters["submitted"] += 1
+            due = len(self._attempts) + len(self._progress) >= self.flush_rows
+        if not running:
+            return self.flush()
+        if due:
+            self._wake.set()
+        return True
+
+    def _queue(self, kind: str, row: Dict[str, Any]) -> None:
+        # Caller holds self._lock
+        if kind == "attempt":
+            key = (row["user_id"], row["attempt_uid"])
+            if key in self._attempts:
+                self._counters["coalesced"] += 1
+                return
+            self._attempts[key] = row
+        else:
+            key = (row["user_id"], row["lesson_id"])
+            if key in self._progress:
+                self._counters["coalesced"] += 1
+            self._progress[key] = _merge_progress(self._progress.get(key), row)
+        if self._oldest is None or row["ts"] < self._oldest:
+            self._oldest = row["ts"]
+
+    # ── spool ───────────────────────────────────────────────
+
+    def _spool(self, kind: str, row: Dict[str, Any]) -> None:
+        # Caller holds self._lock. Written to the page cache before the request is
+        # acknowledged (survives a worker crash); LESSON_WRITES_FSYNC also survives power loss.
+        if self._fh is None:
+            self._segment += 1
+            self._fh_path = self._spool_dir / f"{os.getpid()}-{int(time.time() * 1000)}-{self._segment}.jsonl"
+            self._fh = open(self._fh_path, "a", encoding="utf-8")
+        self._fh.write(json.dumps({"k": kind, "r": row}, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._fh.flush()
+        if self._fsync:
+            os.fsync(self._fh.fileno())
+
+    def _recover(self) -> None:
+        """Claim and queue segments whose writer process is gone (or was a previous run of this pid)."""
+        me = os.getpid()
+        for path in sorted(self._spool_dir.glob("*.jsonl")):
+            try:
+                pid = int(path.name.split("-", 1)[0])
+            except ValueError:
+                continue
+            if pid != me and _alive(pid):
+                continue
+            claimed = path.with_name(f"{me}-recovered-{path.name}")
+            try:
+                os.rename(path, claimed)  # atomic: exactly one process claims a segment
+            except OSError:
+                continue
+            with self._lock:
+                with open(claimed, "r", encoding="utf-8") as fh:
+                    for line in fh:
+                        try:
+                            rec = json.loads(line)
+                        except ValueError:
+                            continue  # torn last line of a crashed writer
+                        if rec.get("k") in ("attempt", "progress") and isinstance(rec.get("r"), dict):
+                            self._queue(rec["k"], rec["r"])
+                            self._counters["recovered"] += 1
+                self._held.append(claimed)
+
+    # ── flushing ────────────────────────────────────────────
+
+    def flush(self) -> bool:
+        """
+        Write everything pending in batches of at most flush_rows rows, one
+        transaction each. False on failure: the unwritten rows stay queued
+        (and their spool segments kept; replaying written rows is idempotent).
+        """
+        with self._flush_lock:
+            with self._lock:
+                attempts = list(self._attempts.values())
+                progress = list(self._progress.values())
+                self._attempts, self._progress = {}, {}
+                oldest, self._oldest = self._oldest, None
+                if self._fh is not None:
+                    self._fh.close()
+                    self._held.append(self._fh_path)
+                    self._fh, self._fh_path = None, None
+                files, self._held = self._held, []
+            if not attempts and not progress:
+                _unlink(files)
+                return True
+            size = max(1, self.flush_rows)
+            rows = [("a", r) for r in attempts] + [("p", r) for r in progress]
+            for start in range(0, len(rows), size):
+                chunk = rows[start:start + size]
+                chunk_attempts = [r for kind, r in chunk if kind == "a"]
+                chunk_progress = [r for kind, r in chunk if kind == "p"]
+                t0 = time.perf_counter()
+                try:
+                    dropped = self._write_batch(chunk_attempts, chunk_progress)
+                except Exception as e:
+                    left = rows[start:]
+                    with self._lock:
+                        for kind, row in left:
+                            if kind == "a":
+                                self._attempts.setdefault((row["user_id"], row["attempt_uid"]), row)
+                            else:
+                                key = (row["user_id"], row["lesson_id"])
+                                self._progress[key] = _merge_progress(self._progress.get(key), row)
+                        if oldest is not None and (self._oldest is None or oldest < self._oldest):
+                            self._oldest = oldest
+                        self._held = files + self._held
+                        self._counters["failures"] += 1
+                        self._last_error = f"{type(e).__name__}: {e}"
+                    try:
+                        from flask import current_app
+                        current_app.logger.warning("lesson writes: batch of %d failed (%d rows left queued): %s",
+                                                   len(chunk), len(left), e)
+                    except Exception:
+                        pass
+                    return False
+                with self._lock:
+                    self._latency_ms.append((time.perf_counter() - t0) * 1000)
+                    self._batch_rows.append(len(chunk))
+                    self._counters["batches"] += 1
+                    self._counters["written_attempts"] += len(chunk_attempts)
+                    self._counters["written_progress"] += len(chunk_progress)
+                    self._counters["dropped"] += dropped
+            now = time.time()
+            _unlink(files)
+            with self._lock:
+                if oldest is not None:
+                    self._lag_ms.append(max(0.0, (now - oldest) * 1000))
+                self._last_flush_at = now
+            return True
+
+    def _write_batch(self, attempts: List[Dict[str, Any]], progress: List[Dict[str, Any]]) -> int:
+        """One transaction for the batch; on a constraint error, row by row so one bad row cannot block the rest."""
+        from sqlalchemy.exc import IntegrityError
+        try:
+            self._write(attempts, progress)
+            return 0
+        except IntegrityError as e:
+            self._last_error = f"IntegrityError: {e}"
+        dropped = 0
+        for kind_rows, is_attempt in ((attempts, True), (progress, False)):
+            for row in kind_rows:
+                try:
+                    self._write([row], []) if is_attempt else self._write([], [row])
+                except IntegrityError:
+                    dropped += 1  # e.g. the lesson was deleted after the row was accepted
+        return dropped
+
+    def _write(self, attempts: List[Dict[str, Any]], progress: List[Dict[str, Any]]) -> None:
+        from domains.lessons.models import UserAttempt, UserProgress
+        engine = self._engine
+        if engine is None:
+            from app.extensions.db import db
+            engine = db.engine
+        with engine.begin() as conn:
+            if attempts:
+                _insert_attempts(conn, UserAttempt.__table__, [{
+                    "user_id": r["user_id"],
+                    "lesson_id": r["lesson_id"],
+                    "slide_id": r["slide_id"],
+                    "attempt_uid": r["attempt_uid"],
+                    "payload_json": r.get("payload_json"),
+                    "correct": r.get("correct"),
+                    "score_delta": r.get("score_delta"),
+                    "created_at": _utc(r["ts"]),
+                } for r in attempts])
+            if progress:
+                _upsert_progress(conn, UserProgress.__table__, [{
+                    "user_id": r["user_id"],
+                    "lesson_id": r["lesson_id"],
+                    "current_slide": r.get("current_slide"),
+                    "score": r.get("score"),
+                    "accuracy": r.get("accuracy"),
+                    "completed": bool(r.get("completed")),
+                    "completed_at": _utc(r["completed_ts"]) if r.get("completed_ts") else None,
+                    "updated_at": _utc(r["ts"]),
+                } for r in progress])
+
+    # ── metrics ─────────────────────────────────────────────
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Backlog, counters and distributions over the last METRICS_WINDOW batches:
+        flush latency (ms), batch size (rows) and lag (oldest row accepted ->
+        committed, ms).
+        """
+        with self._lock:
+            return {
+                "running": self.is_running(),
+                "interval_ms": self.flush_ms,
+                "batch_max_rows": self.flush_rows,
+                "pending_attempts": len(self._attempts),
+                "pending_progress": len(self._progress),
+                "oldest_pending_ms": round((time.time() - self._oldest) * 1000, 1) if self._oldest else None,
+                "spool_segments": len(self._held) + (1 if self._fh is not None else 0),
+                **self._counters,
+                "last_error": self._last_error,
+                "last_flush_at": self._last_flush_at,
+                "flush_latency_ms": _dist(list(self._latency_ms)),
+                "batch_rows": _dist(list(self._batch_rows)),
+                "lag_ms": _dist(list(self._lag_ms)),
+                "sample": len(self._latency_ms),
+            }
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _unlink(paths: List[Path]) -> None:
+    for p in paths:
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+
+
+write_buffer = WriteBehindBuffer()
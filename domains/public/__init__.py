@@ -1,7 +1,16 @@
 # domains/public/__init__.py
-from flask import Blueprint, render_template, render_template_string, request, g, make_response, abort, redirect, url_for
+from flask import Blueprint, render_template, request, g, make_response, abort, redirect, url_for
 from flask_login import current_user
-from app.storage import list_slugs, load_article
+from app.fragments import fragment_cache
+from app.http_cache import public_page
+from app.storage import (
+    article_version,
+    catalog_display,
+    load_article_body,
+    load_article_catalog,
+    load_article_meta,
+    load_article_module_html,
+)
 from app.pos_catalog import get_catalog as get_pos_catalog, get_aliases as get_pos_aliases
 
 public_bp = Blueprint("public", __name__)
@@ -74,14 +83,13 @@ def _inject_lang_helpers():
 def index():
     """
     Public homepage. If ?lang is present, persist it in a cookie (1 year).
-    Also send no-cache headers so admin-enabled markup isn't reused after logout.
+    Anonymous visitors get a cacheable response (ETag over UI strings + language);
+    signed-in users get no-store so admin-enabled markup isn't reused after logout.
     """
-    resp = make_response(render_template("public_index.html"))
+    resp = public_page((), lambda: render_template("public_index.html"))
     qlang = request.args.get("lang")
     if qlang:
         resp.set_cookie("lang", _coerce_lang(qlang), max_age=60 * 60 * 24 * 365, samesite="Lax")
-    resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    resp.headers["Pragma"] = "no-cache"
     return resp
 
 # Stubs to satisfy current links from the homepage and navbar.
@@ -89,11 +97,10 @@ def index():
 def articles_index():
     from datetime import datetime, timezone
 
-    def _is_published(d: dict) -> bool:
-        status = (d.get("status") or "draft").lower()
-        if status != "published":
+    def _is_published(row: dict) -> bool:
+        if row.get("status") != "published":
             return False
-        pub = (d.get("published_at") or "").strip()
+        pub = (row.get("published_at") or "").strip()
         if not pub:
             return True  # allow legacy publishes with no timestamp
         try:
@@ -102,104 +109,67 @@ def articles_index():
             return True
         return ts <= datetime.now(timezone.utc)
 
-    slugs = list_slugs("articles") or []
     articles = []
     lang = getattr(g, "app_lang", DEFAULT_LANG)
 
-    import re
-
-    for s in slugs:
-        data = load_article(s) or {}
-        if not _is_published(data):
+    # Listing fields come from data/articles/_catalog.json; article bodies are never parsed here
+    for row in load_article_catalog():
+        if not _is_published(row):
             continue
+        shown = catalog_display(row, lang)
 
-        meta = data.get("meta") or {}
-        i18n = data.get("i18n") or {}
-        slot = i18n.get(lang) or {}
-
-        # Title preference: i18n[lang].title → base title → other known language fallbacks
-        if slot.get("title"):
-            display_title = slot["title"]
-        else:
-            # legacy fields/base
-            title_any = data.get("title") or meta.get("title")
-            # known EN/ES legacy fields kept as a soft fallback only
-            title_es = data.get("title_es") or meta.get("title_es") or meta.get("title-es")
-            title_en = data.get("title_en") or meta.get("title_en") or meta.get("title-en")
-            display_title = (title_any or (title_es if lang == "es" else title_en) or title_es or title_en or s)
-
-        # Summary preference: i18n[lang].summary_html → base summary_html → plain summary fields
-        summary_html = slot.get("summary_html") or data.get("summary_html") or meta.get("summary_html") or ""
-        if summary_html:
-            display_summary = re.sub(r"<[^>]+>", "", summary_html).strip()
-        else:
-            # very old plain-text summary fields
-            summary_es = data.get("summary_es") or meta.get("summary_es")
-            summary_en = data.get("summary_en") or meta.get("summary_en")
-            summary_any = data.get("summary") or meta.get("summary")
-            display_summary = (summary_es if lang == "es" else summary_en) or summary_any or ""
-
-        image_url = data.get("image_url") or meta.get("image_url")
-        tags = data.get("tags") or meta.get("tags") or []
         # Taxonomy: build display titles for selected paths (deepest level preferred)
         topics = []
         try:
             from common.taxonomy import title_for
-            tx_paths = data.get("taxonomy_paths") or []
-            if isinstance(tx_paths, list):
-                for p in tx_paths:
-                    if not p:
-                        continue
-                    # prefer localized human title; fall back to prettified slug
-                    t = title_for(str(p), lang=lang) or str(p).split("/")[-1].replace("-", " ").title()
-                    topics.append(t)
+            for p in row.get("taxonomy_paths") or []:
+                # prefer localized human title; fall back to prettified slug
+                t = title_for(str(p), lang=lang) or str(p).split("/")[-1].replace("-", " ").title()
+                topics.append(t)
         except Exception:
             pass
 
         articles.append({
-            "slug": s,
-            "title": display_title,
-            "summary": display_summary,
-            "tags": tags,
-            "image_url": image_url,
+            "slug": row["slug"],
+            "title": shown["title"],
+            "summary": shown["summary"],
+            "tags": row.get("tags") or [],
+            "image_url": row.get("image_url"),
             "topics": topics,
+            "mtime_ns": row.get("mtime_ns"),
         })
 
-    resp = make_response(render_template("public_articles_index.html", articles=articles))
-    resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    resp.headers["Pragma"] = "no-cache"
-    return resp
+    # Listed rows (slug + content mtime) version the page; scheduled publishes change the set
+    versions = tuple((a["slug"], a["mtime_ns"]) for a in articles)
+    return public_page(versions, lambda: render_template("public_articles_index.html", articles=articles))
 
 @public_bp.route("/exercises/")
 def exercises_index():
     # Public Exercises library page
     # Grid view with taxonomy navigation/filtering on the left.
-    from app.exercises_store import list_exercises as ex_list
+    from app.exercises_store import exercise_index
     from common.taxonomy import children_of, title_for
 
+    view = exercise_index()
+    ex_version = view.generation
+
     q = (request.args.get("q") or "").strip().lower()
     flt_type = (request.args.get("type") or "").strip().lower()
     flt_level = (request.args.get("level") or "").strip().upper()
     flt_tax = (request.args.get("tax") or "").strip().strip("/")
 
-    raw = ex_list() or {}
+    # Published/type/level/taxonomy filters are set lookups on the in-memory index
+    keys = view.select(status="published", type=flt_type, level=flt_level, tax=flt_tax)
 
     # Build base list (published only)
     items = []
-    for key, meta in raw.items():
+    for key in keys:
+        meta = view.entries[key]
         try:
             ex_type, slug = key.split("/", 1)
         except ValueError:
             continue
-        status = (meta.get("status") or "draft").lower()
-        if status != "published":
-            continue
-
-        if flt_type and ex_type != flt_type:
-            continue
         level = (meta.get("level") or "").strip().upper()
-        if flt_level and level != flt_level:
-            continue
 
         title_es = (meta.get("title_es") or "").strip()
         title_en = (meta.get("title_en") or "").strip()
@@ -209,15 +179,6 @@ def exercises_index():
                 continue
 
         tax_paths = [str(p).strip().strip('/') for p in (meta.get("taxonomy_paths") or []) if str(p).strip()]
-        # Taxonomy filter: include if any path is the selected tax or a descendant of it
-        if flt_tax:
-            keep = False
-            for p in tax_paths:
-                if p == flt_tax or p.startswith(flt_tax + "/"):
-                    keep = True
-                    break
-            if not keep:
-                continue
 
         # Derive up to two sub-topic titles (2nd and 3rd segments of a path)
         sub_topics = []
@@ -226,14 +187,12 @@ def exercises_index():
             parts = first.split('/')
             if len(parts) >= 2:
                 sub = parts[0] + '/' + parts[1]
-                from common.taxonomy import title_for as _tx_title_for
-                st = _tx_title_for(sub, lang=getattr(g, "app_lang", DEFAULT_LANG))
+                st = title_for(sub, lang=getattr(g, "app_lang", DEFAULT_LANG))
                 if st:
                     sub_topics.append(st)
             if len(parts) >= 3:
                 sub2 = parts[0] + '/' + parts[1] + '/' + parts[2]
-                from common.taxonomy import title_for as _tx_title_for
-                st2 = _tx_title_for(sub2, lang=getattr(g, "app_lang", DEFAULT_LANG))
+                st2 = title_for(sub2, lang=getattr(g, "app_lang", DEFAULT_LANG))
                 if st2 and st2 not in sub_topics:
                     sub_topics.append(st2)
 
@@ -276,28 +235,102 @@ def exercises_index():
 
     ordered = sorted(groups.items(), key=lambda kv: group_title(kv[0]).lower())
 
-    # Left taxonomy tree (top-level + their children for quick filtering)
+    # Left taxonomy tree (top-level + their children for quick filtering), with published counts
     top_nodes = children_of(None)
+    from app.topic_index import node_counts
+    tax_counts = node_counts("exercise")
 
-    resp = make_response(render_template(
+    return public_page((ex_version,), lambda: render_template(
         "public_exercises_index.html",
         exercises_groups=ordered,
         group_title=group_title,
         tax_selected=flt_tax,
         tax_top_nodes=top_nodes,
+        tax_counts=tax_counts,
     ))
-    resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    resp.headers["Pragma"] = "no-cache"
+
+# ─────────────────────────────────────────────────────────────
+# Exercise delivery (published only, cacheable)
+#   /exercises/api/<type>/<slug>          → 302 to the current published version
+#   /exercises/api/<type>/<slug>/v/<NNN>  → immutable JSON, ETag = stored checksum
+# ─────────────────────────────────────────────────────────────
+EXERCISE_IMMUTABLE = "public, max-age=31536000, immutable"
+
+@public_bp.get("/exercises/api/<ex_type>/<slug>", endpoint="exercise_api_current")
+def exercise_api_current(ex_type: str, slug: str):
+    from flask import jsonify
+    from app.exercises_store import published_version
+    pub = published_version(ex_type, slug)
+    if not pub:
+        return jsonify({"ok": False, "error": "not_found"}), 404
+    resp = redirect(url_for("public.exercise_api_version", ex_type=ex_type, slug=slug, ver=pub[0]), code=302)
+    # Short-lived: republishing moves the pointer
+    resp.headers["Cache-Control"] = "public, max-age=30"
+    return resp
+
+@public_bp.get("/exercises/api/<ex_type>/<slug>/v/<ver>", endpoint="exercise_api_version")
+def exercise_api_version(ex_type: str, slug: str, ver: str):
+    """
+    One immutable version of a published exercise. The exercise must be
+    published now; older versions are served only if they were published too.
+    """
+    from flask import jsonify
+    from app.exercises_store import load_exercise, published_version
+    pub = published_version(ex_type, slug)
+    if not pub or len(ver) != 3 or not ver.isdigit() or ver > pub[0]:
+        return jsonify({"ok": False, "error": "not_found"}), 404
+
+    etag = pub[1] if ver == pub[0] else ""
+    if etag and request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+    else:
+        ex = load_exercise(ex_type, slug, version=ver)
+        if not ex or str(ex.get("status") or "").lower() != "published":
+            return jsonify({"ok": False, "error": "not_found"}), 404
+        etag = str(ex.get("checksum") or "") or etag
+        if etag and request.if_none_match.contains(etag):
+            resp = make_response("", 304)
+        else:
+            resp = jsonify(ex)
+    if etag:
+        resp.set_etag(etag)
+    resp.headers["Cache-Control"] = EXERCISE_IMMUTABLE
+    return resp
+
+@public_bp.post("/api/exercises/grade", endpoint="exercise_api_grade")
+def exercise_api_grade():
+    """
+    Grade many responses in one call (app/exercise_grading.py).
+    Body: {"lang"?: "es", "submissions": [{"type", "slug", "version"?, "id"?, "diff"?,
+           "responses": [{"item": <id or order>, "answer": ..., "attempt"?: n}]}]}
+    "diff": true adds the character alignment to dictation items.
+    Results come back in submission order; unknown or unpublished exercises
+    get {"error": "not_found"}. Oversized calls (body, submissions, responses,
+    answer length, diff items; see app/exercise_grading.py) get 413.
+    """
+    from flask import jsonify
+    from app.exercise_grading import MAX_BODY_BYTES, check_limits, grade_batch
+    if request.content_length is None or request.content_length > MAX_BODY_BYTES:
+        return jsonify({"ok": False, "error": f"request body required, max {MAX_BODY_BYTES} bytes"}), 413
+    payload = request.get_json(silent=True) or {}
+    subs = payload.get("submissions")
+    if not isinstance(subs, list):
+        return jsonify({"ok": False, "error": "submissions must be a list"}), 400
+    too_large = check_limits(subs)
+    if too_large:
+        return jsonify({"ok": False, "error": too_large}), 413
+    results = grade_batch(subs, lang=normalize_lang(str(payload.get("lang") or "")) or "es")
+    resp = jsonify({"ok": True, "results": results})
+    resp.headers["Cache-Control"] = "no-store"
     return resp
 
 @public_bp.route("/glossary/")
 def glossary_index():
     countries = _enabled_glossary_countries()
     country_map = {row["code"]: row for row in countries}
-    resp = make_response(render_template("public_glossary_index.html", countries=countries, country_map=country_map))
-    resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    resp.headers["Pragma"] = "no-cache"
-    return resp
+    # The enabled-country rows are the page's only content
+    versions = tuple(sorted((row["code"], row.get("flag_url")) for row in countries))
+    return public_page(versions, lambda: render_template("public_glossary_index.html", countries=countries, country_map=country_map))
 
 @public_bp.route("/articles/<slug>")
 def article_detail_noslash(slug):
@@ -322,7 +355,10 @@ def article_detail(slug):
             return True
         return ts <= datetime.now(timezone.utc)
 
-    data = load_article(slug)
+    # Manifest only: the body for the chosen language comes from the fragment cache
+    # (keyed by the article's content version) or from its shard
+    version = article_version(slug)
+    data = load_article_meta(slug)
     if not data or not _is_published(data):
         abort(404)
 
@@ -398,18 +434,22 @@ def article_detail(slug):
                 page_title = title_es or title_any or title_en or slug
             else:
                 page_title = title_en or title_any or title_es or slug
-            html = data.get("html") or data.get(f"html_{ui_lang}") or ""
+            def render_base():
+                base = load_article_body(slug)
+                return base.get("html") or base.get(f"html_{ui_lang}") or ""
+            html = fragment_cache.get_or_render(("public.article_detail", slug, "", ui_lang), version, render_base)
             summary_html = data.get("summary_html") or ""
             return page_title, html, summary_html
         # a translation slot
         slot = i18n.get(lang_code) or {}
         page_title = slot.get("title") or slug
-        html = slot.get("html") or ""
+        html = fragment_cache.get_or_render(
+            ("public.article_detail", slug, lang_code, ""), version,
+            lambda: load_article_body(slug, lang_code).get("html") or "",
+        )
         summary_html = slot.get("summary_html") or ""
         return page_title, html, summary_html
 
-    page_title, body, _summary_html = resolve_content(active_al)
-
     # Build the version dropdown list (mother/base first if present) using native labels
     version_options = []
     if mother_lang:
@@ -433,86 +473,11 @@ def article_detail(slug):
         qs["al"] = ("base" if not target_code else target_code)
         return url_for("public.article_detail", slug=slug) + ("?" + urlencode(qs) if qs else "")
 
-    # Render with inline template (keeps your current pattern)
-    html = """
-    {% extends "public_base.html" %}
-    {% block title %}{{ page_title or slug }} · ProfePanda{% endblock %}
-    {% block public_content %}
-      <article class="ppx-card ppx-card--pad">
-        <header class="ppx-row" style="align-items:center;justify-content:space-between;gap:.75rem;margin-bottom:.75rem;flex-wrap:wrap;">
-          <h1 class="ppx-h1" style="margin:0;">{{ page_title or slug }}</h1>
-
-          {# Article-language dropdown (does NOT change UI lang) #}
-          {% if version_options and (version_options|length) > 1 %}
-          <details style="position:relative;">
-            <summary class="ppx-btn" style="cursor:pointer;border-radius:999px;">
-              🌐 {{ ppx_lang_label(active_al) if active_al else (ppx_lang_label(mother_lang) if mother_lang else 'BASE') }}
-            </summary>
-            <div style="position:absolute;right:0;margin-top:.4rem;min-width:240px;background:#fff;border:1px solid #e5e7eb;border-radius:12px;box-shadow:0 8px 24px rgba(0,0,0,.08);padding:.35rem;">
-              {% set original_code = mother_lang if mother_lang else '' %}
-              {% set original_label = ppx_lang_label(original_code) if original_code else 'BASE' %}
-              {% set other_codes = (version_options | map(attribute='code') | list) | reject('equalto', original_code) | list %}
-
-              <!-- Original (header + single item, indented like editor) -->
-              <div style="padding:.35rem .6rem .25rem .6rem;font:700 12px/1.2 Montserrat,system-ui;color:#475569;letter-spacing:.02em;">
-                {{ 'Original' if app_lang != 'es' else 'Original' }}
-              </div>
-              <ul style="list-style:none;margin:0;padding:.15rem .25rem .25rem .25rem;">
-                <li>
-                  <a href="{{ switch_href(original_code) }}"
-                     style="display:flex;align-items:center;justify-content:space-between;text-decoration:none;color:#0f172a;padding:.45rem .6rem .45rem 1.25rem;border-radius:8px;"
-                     onmouseover="this.style.background='#f3f4ff';"
-                     onmouseout="this.style.background='transparent';"
-                     aria-current="{{ 'true' if (active_al or '') == (original_code or '') else 'false' }}">
-                    <span>{{ original_label }}</span>
-                    {% if (active_al or '') == (original_code or '') %}<span aria-hidden="true">✓</span>{% endif %}
-                  </a>
-                </li>
-              </ul>
-
-              <!-- Existing versions (header + list, indented like editor) -->
-              <div style="padding:.35rem .6rem .25rem .6rem;font:700 12px/1.2 Montserrat,system-ui;color:#475569;letter-spacing:.02em;">
-                {{ t('Versiones existentes', 'Existing versions', app_lang) }}
-              </div>
-
-              {% if other_codes and (other_codes|length) %}
-              <ul style="list-style:none;margin:0;padding:.15rem .25rem;">
-                {% for code in other_codes %}
-                  <li>
-                    <a href="{{ switch_href(code) }}"
-                       style="display:flex;align-items:center;justify-content:space-between;text-decoration:none;color:#0f172a;padding:.45rem .6rem .45rem 1.25rem;border-radius:8px;"
-                       onmouseover="this.style.background='#f3f4ff';"
-                       onmouseout="this.style.background='transparent';"
-                       aria-current="{{ 'true' if code == active_al else 'false' }}">
-                      <span>{{ ppx_lang_label(code) }}</span>
-                      {% if code == active_al %}<span aria-hidden="true">✓</span>{% endif %}
-                    </a>
-                  </li>
-                {% endfor %}
-              </ul>
-              {% else %}
-              <div style="padding:.35rem .6rem .25rem 1.25rem;color:#64748b;font:500 12px/1.2 Montserrat,system-ui;">
-                {{ t('No hay otras versiones.', 'No other versions.', app_lang) }}
-              </div>
-              {% endif %}
-            </div>
-          </details>
-          {% endif %}
-        </header>
-
-        {% if body %}
-          <div>{{ body|safe }}</div>
-        {% else %}
-          <p class="ppx-muted">{{ t('Este artículo no tiene contenido para este idioma.', 'This article has no content for this language.', app_lang) }}</p>
-        {% endif %}
-      </article>
-    {% endblock %}
-    """
 
-    # Set/refresh the article language cookie independently from UI language
-    resp = make_response(
-        render_template_string(
-            html,
+    def render():
+        page_title, body, _summary_html = resolve_content(active_al)
+        return render_template(
+            "public_article_detail.html",
             page_title=page_title,
             slug=slug,
             body=body,
@@ -521,10 +486,13 @@ def article_detail(slug):
             version_options=version_options,
             switch_href=switch_href,
         )
-    )
-    resp.set_cookie("article_lang", active_al, max_age=60 * 60 * 24 * 180, samesite="Lax")
-    resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    resp.headers["Pragma"] = "no-cache"
+
+    # active_al may come from the article_lang cookie, so it is part of the version
+    resp = public_page((version, active_al), render)
+    # Set the article language cookie independently from UI language; only when it
+    # changes, so cacheable responses don't carry a Set-Cookie on every hit
+    if request.cookies.get("article_lang") != active_al:
+        resp.set_cookie("article_lang", active_al, max_age=60 * 60 * 24 * 180, samesite="Lax")
     return resp
 
 
@@ -546,7 +514,10 @@ def article_module(slug: str, module_slug: str):
             return True
         return ts <= datetime.now(timezone.utc)
 
-    data = load_article(slug)
+    # Manifest only: the module page body comes from the fragment cache (keyed by
+    # the article's content version) or is rendered from the current module's shard
+    version = article_version(slug)
+    data = load_article_meta(slug)
     if not data or not _is_published(data):
         abort(404)
 
@@ -555,30 +526,28 @@ def article_module(slug: str, module_slug: str):
         # If no modules, fall back to the single-article page
         return redirect(url_for("public.article_detail", slug=slug), code=302)
 
-    # Normalize modules list and locate current index
-    normalized = []
-    cur_index = -1
-    for idx, m in enumerate(modules):
-        title = (m.get("title") or "").strip() or f"Module {idx+1}"
-        mslug = (m.get("slug") or "").strip() or f"m{idx+1}"
-        html = (m.get("html") or "").strip()
-        row = {"title": title, "slug": mslug, "html": html}
-        normalized.append(row)
-        if cur_index < 0 and mslug == module_slug:
-            cur_index = idx
-
-    if cur_index < 0:
-        abort(404)
-
-    prev_mod = normalized[cur_index - 1] if cur_index > 0 else None
-    next_mod = normalized[cur_index + 1] if cur_index < (len(normalized) - 1) else None
-
     page_title = (data.get("title") or slug)
 
-    # Render dedicated template
-    resp = make_response(
-        render_template(
-            "public_article_module.html",
+    def render_content():
+        # Normalize modules list and locate current index
+        normalized = []
+        cur_index = -1
+        for idx, m in enumerate(modules):
+            title = (m.get("title") or "").strip() or f"Module {idx+1}"
+            mslug = (m.get("slug") or "").strip() or f"m{idx+1}"
+            row = {"title": title, "slug": mslug, "html": ""}
+            normalized.append(row)
+            if cur_index < 0 and mslug == module_slug:
+                cur_index = idx
+
+        if cur_index < 0:
+            return None
+        normalized[cur_index]["html"] = load_article_module_html(slug, cur_index).strip()
+
+        prev_mod = normalized[cur_index - 1] if cur_index > 0 else None
+        next_mod = normalized[cur_index + 1] if cur_index < (len(normalized) - 1) else None
+        return render_template(
+            "_public_article_module_content.html",
             slug=slug,
             page_title=page_title,
             modules=normalized,
@@ -587,10 +556,14 @@ def article_module(slug: str, module_slug: str):
             prev_mod=prev_mod,
             next_mod=next_mod,
         )
-    )
-    resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    resp.headers["Pragma"] = "no-cache"
-    return resp
+
+    ui_lang = getattr(g, "app_lang", DEFAULT_LANG)
+    content = fragment_cache.get_or_render(("public.article_module", slug, module_slug, ui_lang), version, render_content)
+    if content is None:
+        abort(404)
+
+    # Only the page chrome (admin bar, language switcher) is rendered per request
+    return public_page((version,), lambda: render_template("public_article_module.html", page_title=page_title, content=content))
 
 # -------------------------------
 # Regional Glossary (public)
@@ -647,9 +620,23 @@ def glossary_api_list():
     if f_countries:
         country = None
 
-    base = glossary.search_entries(q=q, country=country, allowed_countries=allowed, limit=2000)
-    # Sort by word for stable paging
-    base.sort(key=lambda r: (r.get("word") or r.get("slug") or "").lower())
+    fuzzy = (request.args.get('fuzzy') or '').strip() in ('1', 'true', 'yes')
+    ranked = (request.args.get('mode') or '').strip().lower() == 'ranked'
+    if ranked and q:
+        # Full-text mode: BM25 over every sense/example; rows carry `score` and a highlighted `snippet`
+        base = glossary.ranked_search_entries(q=q, country=country, allowed_countries=allowed, limit=2000)
+    elif fuzzy and q:
+        # Typo-tolerant mode: rows carry `distance` and stay ranked closest-first
+        try:
+            max_distance = int(request.args.get('distance')) if request.args.get('distance') else None
+        except Exception:
+            max_distance = None
+        base = glossary.fuzzy_search_entries(q=q, country=country, allowed_countries=allowed, limit=2000,
+                                             max_distance=max_distance)
+    else:
+        base = glossary.search_entries(q=q, country=country, allowed_countries=allowed, limit=2000)
+        # Sort by word for stable paging
+        base.sort(key=lambda r: (r.get("word") or r.get("slug") or "").lower())
 
     def _bucket_word(m):
         w = (m.get("word") or m.get("slug") or "").strip()
@@ -668,58 +655,52 @@ def glossary_api_list():
     slice_items = filtered[offset: offset + limit]
     has_more = (offset + limit) < total_filtered
 
+    filters = {
+        'countries': f_countries or ({country} if country else set()),
+        'pos': f_pos_set,
+        'register': f_reg_set,
+        'freq': f_freq_set,
+        'status': f_status_set,
+        'sensitivity': f_sens_set,
+        'domain': f_domain,
+        'tone': f_tone,
+    }
+    with_counts = (request.args.get('facets') or '').strip() in ('1', 'true', 'yes')
+    has_filters = any([f_pos_set, f_reg_set, f_freq_set, f_status_set, f_sens_set, f_domain, f_tone, f_countries])
+
     # If no filters beyond q/country, return quickly
-    if not any([f_pos_set, f_reg_set, f_freq_set, f_status_set, f_sens_set, f_domain, f_tone, f_countries]):
+    if not has_filters and not with_counts:
         return jsonify({'ok': True, 'count': total_filtered, 'items': slice_items, 'has_more': has_more, 'letters': letters})
 
-    # Load each entry and keep if any sense matches all provided filters
-    out_all = []
-    for meta in filtered:
-        data = glossary.load_entry(meta.get('slug') or '') or {}
-        senses = data.get('senses') or []
-        matched = False
-        for s in senses:
-            # country constraint per sense
-            sc = set((s.get('countries') or []))
-            if country and country not in sc:
-                continue
-            if f_countries and not (sc & f_countries):
-                continue
-            if f_pos_set and (s.get('pos') or None) not in f_pos_set:
-                continue
-            if f_reg_set and (s.get('register') or None) not in f_reg_set:
-                continue
-            if f_freq_set and (s.get('freq') or None) not in f_freq_set:
-                continue
-            # status/sensitivity may be arrays; treat match as set intersection
-            if f_status_set:
-                st = s.get('status')
-                if isinstance(st, list):
-                    if not (set(st) & f_status_set):
-                        continue
-                else:
-                    if (st or None) not in f_status_set:
-                        continue
-            if f_sens_set:
-                se = s.get('sensitivity')
-                if isinstance(se, list):
-                    if not (set(se) & f_sens_set):
-                        continue
-                else:
-                    if (se or None) not in f_sens_set:
-                        continue
-            if f_domain and not (set(s.get('domain') or []) & f_domain):
-                continue
-            if f_tone and not (set(s.get('tone') or []) & f_tone):
-                continue
-            matched = True
-            break
-        if matched:
-            out_all.append(meta)
+    # Keep entries where any sense matches all provided filters (per-sense bitmaps in the in-memory index).
+    # facets=1 adds entry counts per filter token over the same q/country/letter scope.
+    matched, counts = glossary.facet_filter([m.get('slug') or '' for m in filtered], filters, with_counts)
+    out_all = [m for m in filtered if (m.get('slug') or '') in matched] if has_filters else filtered
     total = len(out_all)
     slice_filtered = out_all[offset: offset + limit]
     has_more_filtered = (offset + limit) < total
-    return jsonify({'ok': True, 'count': total, 'items': slice_filtered, 'has_more': has_more_filtered, 'letters': letters})
+    resp = {'ok': True, 'count': total, 'items': slice_filtered, 'has_more': has_more_filtered, 'letters': letters}
+    if with_counts:
+        resp['facets'] = counts
+    return jsonify(resp)
+
+@public_bp.get('/glossary/api/suggest', endpoint='glossary_api_suggest')
+def glossary_api_suggest():
+    """Autocomplete for the glossary search box: entries whose word or alt spelling starts with q.
+    Served from the sorted prefix list of the in-memory index; honours enabled_countries.
+    """
+    from flask import jsonify, request
+    from app import glossary_store as glossary
+    cfg = glossary.load_config()
+    allowed = cfg.get('enabled_countries') or []
+    q = (request.args.get('q') or '').strip()
+    country = (request.args.get('country') or '').strip().upper() or None
+    try:
+        limit = max(1, min(50, int(request.args.get('limit') or 10)))
+    except Exception:
+        limit = 10
+    items = glossary.suggest_entries(q, country=country, limit=limit, allowed_countries=allowed)
+    return jsonify({'ok': True, 'items': items})
 
 def _enabled_glossary_countries():
     from app import glossary_store as glossary
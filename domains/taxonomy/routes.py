@@ -4,7 +4,7 @@ from __future__ import annotations
 from flask import Blueprint, jsonify, request, abort
 from typing import Dict, Any, List
 
-from common.taxonomy import load_taxonomy, node_for, children_of, title_for, breadcrumb
+from common.taxonomy import get_taxonomy, load_taxonomy, node_for, children_of, title_for, breadcrumb
 
 bp = Blueprint("taxonomy", __name__)
 
@@ -14,10 +14,8 @@ def _serialize_node(n: Dict[str, Any], lang: str | None = None) -> Dict[str, Any
         "title": n.get("title", {"es": "", "en": ""}),
         "has_children": False,
     }
-    # detect children using the indexed map
-    tx = load_taxonomy("grammar")
-    parent_key = n["path"]
-    data["has_children"] = len(tx["children"].get(parent_key, [])) > 0
+    # detect children using the compiled taxonomy
+    data["has_children"] = get_taxonomy("grammar").has_children(n["path"])
     # optional computed display title
     if lang in ("es", "en"):
         data["display_title"] = title_for(n["path"], lang=lang)
@@ -62,6 +60,38 @@ def grammar_topic(topic: str) -> Any:
         "children": [_serialize_node(c, lang=lang) for c in kids],
     })
 
+@bp.route("/grammar/<path:topic>/content", methods=["GET"])
+def grammar_topic_content(topic: str) -> Any:
+    """
+    All published content under a topic (the topic itself and every
+    descendant), from the cross-content topic index.
+    Optional: ?lang=es|en (titles), ?kind=article,exercise,lesson, ?limit=N
+    (items per kind, default 50, max 500; counts are always complete).
+    """
+    from app.topic_index import KINDS, topic_content, topic_counts
+
+    lang = request.args.get("lang") or "es"
+    topic = (topic or "").strip().strip("/")
+    if not node_for(topic):
+        abort(404, description=f"Unknown grammar topic: {topic}")
+    wanted = [k.strip() for k in ",".join(request.args.getlist("kind")).split(",") if k.strip()]
+    kinds = [k for k in KINDS if k in wanted] if wanted else list(KINDS)
+    try:
+        limit = max(0, min(int(request.args.get("limit", 50)), 500))
+    except ValueError:
+        limit = 50
+
+    data = topic_content(topic, kinds=kinds, limit=limit, lang=lang)
+    data["title"] = title_for(topic, lang=lang)
+    data["children"] = [
+        {"path": c["path"], "title": title_for(c["path"], lang=lang), "counts": topic_counts(c["path"], kinds=kinds)}
+        for c in children_of(topic)
+    ]
+    resp = jsonify(data)
+    resp.headers["Cache-Control"] = "public, max-age=60"
+    return resp
+
+
 @bp.route("/grammar/browse", methods=["GET"])
 def grammar_browse() -> str:
     from flask import render_template
@@ -85,8 +115,8 @@ def grammar_browse() -> str:
         breadcrumb_list = []
         title = title_for("grammar", lang=lang) or "Grammar"
 
-    for c in children:
-        c["display_title"] = title_for(c.get("path"), lang=lang)
+    # Copies: the nodes belong to the shared compiled taxonomy
+    children = [dict(c, display_title=title_for(c.get("path"), lang=lang)) for c in children]
 
     return render_template(
         "taxonomy/grammar_browse.html",
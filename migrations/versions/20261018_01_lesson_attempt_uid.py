@@ -0,0 +1,30 @@
+"""lesson attempts: client attempt id for idempotent write-behind inserts
+
+Revision ID: 20261018_01_lesson_attempt_uid
+Revises: 20251118_01_lessons_mvp
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Revision identifiers, used by Alembic.
+revision = "20261018_01_lesson_attempt_uid"
+down_revision = "20251118_01_lessons_mvp"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable: rows written before this revision have no client id. The unique
+    # index is the ON CONFLICT target of the bulk insert (NULLs never conflict).
+    op.add_column("lesson_user_attempts", sa.Column("attempt_uid", sa.String(length=64), nullable=True))
+    op.create_index("uq_attempt_user_uid", "lesson_user_attempts", ["user_id", "attempt_uid"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("uq_attempt_user_uid", table_name="lesson_user_attempts")
+    with op.batch_alter_table("lesson_user_attempts") as batch:
+        batch.drop_column("attempt_uid")
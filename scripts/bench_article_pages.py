@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark article page rendering (requests/second through the Flask test client).
+
+Writes two large synthetic articles into a temporary data directory (nothing
+under data/ is touched): one with many modules, one single-page article with
+several i18n slots. Compares
+  before  legacy article.json, fragment cache disabled
+  after   sharded layout (manifest + shards), fragment cache enabled
+for the module page (/articles/<slug>/<module>/) and the article page in each
+language (/articles/<slug>/?al=..).
+
+Usage:
+  python scripts/bench_article_pages.py                  # 40 modules x 30 KB, 5 languages
+  python scripts/bench_article_pages.py 80 60000         # custom modules / bytes per module
+"""
+from __future__ import annotations
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("JOBS_ENABLED", "false")
+
+from app import storage  # noqa: E402
+from app.fragments import fragment_cache  # noqa: E402
+
+SLUG = "bench-large-article"
+SLUG_SINGLE = "bench-large-single"
+LANGS = ["en", "fr", "pt", "de", "it"]
+WORDS = ["ser", "estar", "haber", "tener", "hacer", "quedar", "resultar", "parecer", "el", "la",
+         "uso", "ejemplo", "cambio", "estado", "lugar", "origen", "hora", "fecha", "evento", "precio"]
+
+
+def _html(rng: random.Random, size: int) -> str:
+    parts = []
+    n = 0
+    while n < size:
+        block = (f"<h3>{' '.join(rng.choice(WORDS) for _ in range(3))}</h3>"
+                 + "".join(f"<p>{' '.join(rng.choice(WORDS) for _ in range(40))}</p>" for _ in range(4)))
+        parts.append(block)
+        n += len(block)
+    return "".join(parts)
+
+
+def synthetic_article(slug: str, modules: int, module_bytes: int) -> dict:
+    rng = random.Random(13)
+    return {
+        "slug": slug,
+        "title": "Bench: a very long guide",
+        "status": "published",
+        "published_at": "2024-01-01T00:00:00Z",
+        "mother_lang": "es",
+        "html": _html(rng, module_bytes),
+        "summary_html": "<p>bench</p>",
+        "i18n": {code: {"title": f"Bench ({code})", "html": _html(rng, module_bytes), "summary_html": ""}
+                 for code in LANGS},
+        "modules": [{"slug": f"m{i + 1}", "title": f"Module {i + 1}", "html": _html(rng, module_bytes)}
+                    for i in range(modules)],
+    }
+
+
+def _rps(client, urls, seconds: float = 2.0) -> float:
+    for u in urls:  # warm-up (template compile, caches)
+        assert client.get(u).status_code == 200, u
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        for u in urls:
+            client.get(u)
+        done += len(urls)
+    return done / (time.perf_counter() - started)
+
+
+def main() -> None:
+    args = [int(a) for a in sys.argv[1:]]
+    modules = args[0] if args else 40
+    module_bytes = args[1] if len(args) > 1 else 30_000
+
+    tmp = Path(tempfile.mkdtemp(prefix="ppx-bench-"))
+    storage.get_data_root = lambda: tmp / "data"
+    try:
+        from app import create_app
+        app = create_app()
+        client = app.test_client()
+        articles = {SLUG: synthetic_article(SLUG, modules, module_bytes),
+                    SLUG_SINGLE: synthetic_article(SLUG_SINGLE, 0, module_bytes * 4)}
+        module_urls = [f"/articles/{SLUG}/m{i + 1}/" for i in range(0, modules, max(1, modules // 10))]
+        view_urls = [f"/articles/{SLUG_SINGLE}/?al={code}" for code in ["es"] + LANGS]
+
+        # before: legacy monolith, no fragment cache
+        for slug, article in articles.items():
+            storage.ensure_article_dirs(slug)
+            storage.write_json(storage.article_json_path(slug), article)
+        max_chars = fragment_cache.max_chars
+        fragment_cache.max_chars = 0
+        before = (_rps(client, module_urls), _rps(client, view_urls))
+
+        # after: sharded layout + fragment cache
+        for slug in articles:
+            storage.migrate_article_to_shards(slug)
+        fragment_cache.max_chars = max_chars
+        fragment_cache.clear()
+        after = (_rps(client, module_urls), _rps(client, view_urls))
+
+        print(f"articles: {modules} modules x ~{module_bytes // 1000} KB, {len(LANGS) + 1} languages")
+        for label, b, a in (("module page", before[0], after[0]), ("article page", before[1], after[1])):
+            print(f"  {label:<13} before {b:8.1f} req/s   after {a:8.1f} req/s   x{a / max(b, 1e-9):.1f}")
+        print(f"  fragment cache: {fragment_cache.stats()}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
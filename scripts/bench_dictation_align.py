@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the dictation aligner (app/dictation_align.py) against a
+port of the player's full-table renderDiff() (static/js/ppx-dictation.js).
+
+For each transcript length, a learner answer is derived from a generated
+Spanish text with typos, accent/case slips, dropped and extra words, then
+aligned three ways, single core:
+  full    the player's (m+1) x (n+1) DP table + backtrace
+  chars   align() on graphemes (Hirschberg, same costs, linear memory)
+  score   score_dictation(): the player's character diff + word view + pill score
+Prints time per call and tracemalloc peak memory for each.
+
+Usage:
+  python scripts/bench_dictation_align.py                  # 50 200 1000 5000 characters
+  python scripts/bench_dictation_align.py 300 3000         # custom lengths
+  python scripts/bench_dictation_align.py --check          # same cost, extras and pill score as the player on random cases
+"""
+from __future__ import annotations
+import random
+import sys
+import time
+import tracemalloc
+
+from app.dictation_align import _is_punct, _key, align, edit_cost, graphemes, score_dictation
+from app.exercise_grading import DICTATION_DEFAULTS
+
+WORDS = ("el la los una que de en por para con sin muy más también después ahora siempre "
+         "casa ciudad mañana corazón árbol niño canción música estación lección "
+         "vivir comer hablar escribir estábamos fuimos había tenía quería podría").split()
+PUNCT = [",", ".", "¿", "?", "¡", "!", ";"]
+LENGTHS = [50, 200, 1000, 5000]
+
+
+def full_table(user: str, ref: str, opts: dict) -> dict:
+    """The player's renderDiff() alignment, cell for cell (quadratic memory)."""
+    a, b = graphemes(user), graphemes(ref)
+    free = bool(opts.get("ignorePunctuation"))
+    ca = [0 if free and _is_punct(g) else 1 for g in a]
+    cb = [0 if free and _is_punct(g) else 1 for g in b]
+    ka, kb = [_key(g, opts) for g in a], [_key(g, opts) for g in b]
+    m, n = len(a), len(b)
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    bt = [[""] * (n + 1) for _ in range(m + 1)]
+    for i in range(1, m + 1):
+        dp[i][0], bt[i][0] = dp[i - 1][0] + ca[i - 1], "extra"
+    for j in range(1, n + 1):
+        dp[0][j], bt[0][j] = dp[0][j - 1] + cb[j - 1], "miss"
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            match = ka[i - 1] == kb[j - 1]
+            best = dp[i - 1][j - 1] + (0 if match else 2)
+            tag = ("soft" if a[i - 1] != b[j - 1] else "match") if match else "sub"
+            if dp[i - 1][j] + ca[i - 1] < best:
+                best, tag = dp[i - 1][j] + ca[i - 1], "extra"
+            if dp[i][j - 1] + cb[j - 1] < best:
+                best, tag = dp[i][j - 1] + cb[j - 1], "miss"
+            dp[i][j], bt[i][j] = best, tag
+    correct, extras, i, j = 0, 0, m, n
+    while i > 0 or j > 0:
+        tag = bt[i][j]
+        if tag in ("match", "soft", "sub"):
+            if tag != "sub" and not (free and _is_punct(b[j - 1])):
+                correct += 1
+            i, j = i - 1, j - 1
+        elif tag == "extra":
+            extras += ca[i - 1]
+            i -= 1
+        else:
+            j -= 1
+    total = sum(1 for g in b if not (free and _is_punct(g)))
+    pill = int(100 * correct / (total + extras) + 0.5) if total + extras else 0
+    return {"cost": dp[m][n], "correct": correct, "extras": extras, "score": pill}
+
+
+def make_text(rng: random.Random, length: int) -> str:
+    out = []
+    while sum(len(w) + 1 for w in out) < length:
+        w = rng.choice(WORDS)
+        if not out or out[-1].endswith("."):
+            w = w.capitalize()
+        if rng.random() < 0.12:
+            w += rng.choice(PUNCT[:2])
+        out.append(w)
+    return " ".join(out)[:length].rstrip()
+
+
+def mutate(rng: random.Random, text: str, rate: float = 0.15) -> str:
+    out = []
+    for w in text.split(" "):
+        r = rng.random()
+        if r < rate * 0.2:
+            continue                                            # dropped word
+        if r < rate * 0.4:
+            out.append(rng.choice(WORDS))                       # extra word
+        elif r < rate * 0.7:
+            w = w.lower().replace("á", "a").replace("é", "e").replace("ó", "o").replace("ñ", "n")
+        elif r < rate and len(w) > 2:
+            k = rng.randrange(len(w))
+            w = w[:k] + rng.choice("aeiourstln") + w[k + 1:]    # typo
+        out.append(w)
+    return " ".join(out)
+
+
+def measure(fn, *args) -> tuple:
+    """(seconds per call, peak bytes) for fn(*args)."""
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    rounds, t0 = 0, time.perf_counter()
+    while True:
+        fn(*args)
+        rounds += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed > 0.5 or rounds >= 200:
+            return elapsed / rounds, peak
+
+
+def chars_align(user: str, ref: str, opts: dict) -> list:
+    a, b = graphemes(user), graphemes(ref)
+    free = bool(opts.get("ignorePunctuation"))
+    return align([_key(g, opts) for g in a], [0 if free and _is_punct(g) else 1 for g in a],
+                 [_key(g, opts) for g in b], [0 if free and _is_punct(g) else 1 for g in b])
+
+
+def check(cases: int = 400) -> int:
+    rng = random.Random(25)
+    failed = 0
+    for n in range(cases):
+        opts = dict(DICTATION_DEFAULTS, ignorePunctuation=rng.random() < 0.5,
+                    ignoreAccents=rng.random() < 0.5, ignoreCase=rng.random() < 0.5)
+        ref = make_text(rng, rng.randint(0, 160))
+        user = mutate(rng, ref, rate=rng.choice([0.0, 0.2, 0.6])) if rng.random() < 0.8 else make_text(rng, 80)
+        if not user.strip():
+            continue  # the player does not check an empty answer (score_dictation: "checked": false)
+        want = full_table(user, ref, opts)
+        a, b = graphemes(user), graphemes(ref)
+        free = bool(opts.get("ignorePunctuation"))
+        ops = chars_align(user, ref, opts)
+        cost = edit_cost(ops, [0 if free and _is_punct(g) else 1 for g in a],
+                         [0 if free and _is_punct(g) else 1 for g in b])
+        got = score_dictation(user, ref, options=opts)
+        if cost != want["cost"] or [got[k] for k in ("correct", "extras", "score")] != [
+                want[k] for k in ("correct", "extras", "score")]:
+            failed += 1
+            print(f"case {n}: cost {cost}/{want['cost']} correct {got['correct']}/{want['correct']} "
+                  f"extras {got['extras']}/{want['extras']} score {got['score']}/{want['score']}"
+                  f"\n  ref  {ref!r}\n  user {user!r}")
+        drawn = sum(1 for op, _, b in got["diff"] if op in ("match", "soft")
+                    for g in graphemes(b) if not (free and _is_punct(g)))
+        if drawn != want["correct"]:
+            failed += 1
+            print(f"case {n}: diff draws {drawn} matched characters, player {want['correct']}")
+    print(f"{cases} case(s), {failed} mismatch(es) in alignment cost, score or diff")
+    return failed
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--check" in args:
+        sys.exit(1 if check() else 0)
+
+    opts = dict(DICTATION_DEFAULTS, ignorePunctuation=True)
+    rng = random.Random(1)
+    print(f"{'chars':>6}  {'full ms':>9} {'full KiB':>9}  {'chars ms':>9} {'chars KiB':>9}  "
+          f"{'score ms':>9} {'score KiB':>9}  score/player")
+    for length in [int(a) for a in args] or LENGTHS:
+        ref = make_text(rng, length)
+        user = mutate(rng, ref)
+        row = []
+        for fn in (full_table, chars_align, score_dictation):
+            if fn is full_table and length > 2000:
+                row.append(None)  # quadratic: minutes and gigabytes
+                continue
+            row.append(measure(fn, user, ref, opts) if fn is not score_dictation
+                       else measure(fn, user, ref, None, opts))
+        cells = "  ".join("{:>9} {:>9}".format("-", "-") if r is None else
+                          f"{r[0] * 1000:9.2f} {r[1] / 1024:9.0f}" for r in row)
+        player = full_table(user, ref, opts)["score"] if row[0] else "-"
+        print(f"{length:>6}  {cells}  {score_dictation(user, ref, options=opts)['score']}/{player}")
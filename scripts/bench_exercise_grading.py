@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark server-side exercise grading (app/exercise_grading.py), single core.
+
+For every published exercise, builds a perfect response set from the exercise
+itself and a wrong one, then grades a batch mixing them through grade_batch()
+(the code path of POST /api/exercises/grade, minus HTTP). Prints graded items
+per second, the cold compile time per exercise and the cache counters.
+
+Usage:
+  python scripts/bench_exercise_grading.py              # 200000 graded items
+  python scripts/bench_exercise_grading.py 1000000      # custom item count
+  python scripts/bench_exercise_grading.py --check      # perfect answers must score 100, wrong ones 0
+"""
+from __future__ import annotations
+import sys
+import time
+
+from app.exercise_grading import _graders, cache_stats, grade_batch, grader_for
+from app.exercises_store import load_exercise, published_versions
+
+TARGET_ITEMS_PER_SECOND = 10000
+
+
+def responses_for(ex: dict, perfect: bool) -> list:
+    out = []
+    for pos, it in enumerate(ex.get("items") or []):
+        ref = it.get("id") or it.get("order") or pos + 1
+        t = ex["type"]
+        if t == "tf":
+            ans = str(it.get("answer")).lower() == "true"
+            out.append({"item": ref, "answer": ans if perfect else not ans})
+        elif t == "mcq":
+            opts = it.get("options_es") or it.get("options_en") or it.get("options") or []
+            picked = [i for i, o in enumerate(opts) if isinstance(o, dict) and o.get("correct") == perfect]
+            out.append({"item": ref, "answer": picked})
+        elif t == "fitb":
+            vals = [((b.get("options") or [""])[0] if perfect else "~") for b in it.get("blanks") or []]
+            if vals:
+                out.append({"item": ref, "answer": vals})
+        elif t == "dnd":
+            out.append({"item": ref, "answer": {tok["id"]: (tok.get("correct") if perfect else "~")
+                                                for tok in it.get("tokens") or []}})
+        elif t == "dictation":
+            out.append({"item": ref, "answer": it.get("transcript") if perfect else "~"})
+    return out
+
+
+def submissions(perfect: bool) -> list:
+    subs = []
+    for key, (ver, _) in sorted(published_versions().items()):
+        ex_type, slug = key.split("/", 1)
+        ex = load_exercise(ex_type, slug, version=ver)
+        if ex:
+            subs.append({"id": key, "type": ex_type, "slug": slug, "responses": responses_for(ex, perfect)})
+    return subs
+
+
+if __name__ == "__main__":
+    good, bad = submissions(True), submissions(False)
+    if not good:
+        print("no published exercises")
+        sys.exit(1)
+
+    if "--check" in sys.argv[1:]:
+        failed = 0
+        for perfect, subs in ((True, good), (False, bad)):
+            for res in grade_batch(subs):
+                want = 100 if perfect else 0
+                if res.get("error") or res["score"] != want:
+                    failed += 1
+                    print(f'{res.get("id")}: {"perfect" if perfect else "wrong"} answers scored {res.get("score")} '
+                          f'{res.get("error") or ""}')
+        print(f"{len(good)} exercise(s) checked, {failed} mismatch(es)")
+        sys.exit(1 if failed else 0)
+
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    t0 = time.perf_counter()
+    for sub in good:
+        _graders.clear()
+        grader_for(sub["type"], sub["slug"])
+    compile_ms = (time.perf_counter() - t0) * 1000 / len(good)
+    for sub in good:
+        grader_for(sub["type"], sub["slug"])
+
+    batch = good + bad
+    per_batch = sum(len(s["responses"]) for s in batch)
+    rounds = max(1, target // max(per_batch, 1))
+    t0 = time.perf_counter()
+    graded = 0
+    for _ in range(rounds):
+        for res in grade_batch(batch):
+            graded += res.get("answered", 0)
+    elapsed = time.perf_counter() - t0
+    rate = graded / elapsed
+    print(f"{len(good)} published exercise(s), {per_batch} responses per batch, {rounds} batches")
+    print(f"cold compile: {compile_ms:.2f} ms per exercise (load + answer key)")
+    print(f"graded {graded} items in {elapsed:.2f}s: {rate:,.0f} items/s "
+          f"({1e6 * elapsed / graded:.1f} us/item); target {TARGET_ITEMS_PER_SECOND:,}/s")
+    print(f"cache: {cache_stats()}")
+    sys.exit(0 if rate >= TARGET_ITEMS_PER_SECOND else 1)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark typo-tolerant glossary lookup: BK-tree vs linear edit-distance scan.
+
+Builds synthetic normalized terms in memory and times FuzzyIndex.search() against
+computing the edit distance to every term, for misspelled queries at distance 1 and 2.
+
+Usage:
+  python scripts/bench_glossary_fuzzy.py                # 10k / 100k terms
+  python scripts/bench_glossary_fuzzy.py 50000          # custom sizes
+"""
+from __future__ import annotations
+import random
+import sys
+import time
+from typing import List
+
+from app.glossary_search import FuzzyIndex, distance_to
+
+SYLLABLES = ["ba", "che", "chi", "co", "da", "fa", "gu", "ja", "la", "lle", "ma", "na", "no", "pi",
+             "que", "ra", "rro", "sa", "ta", "to", "va", "ye", "zo", "cion", "on", "ero", "ita"]
+LETTERS = "abcdefghijlmnopqrstuvyz"
+
+
+def _term(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def _typo(rng: random.Random, term: str) -> str:
+    i = rng.randrange(len(term))
+    op = rng.choice(("drop", "swap", "sub"))
+    if op == "drop":
+        return term[:i] + term[i + 1:]
+    if op == "swap" and i + 1 < len(term):
+        return term[:i] + term[i + 1] + term[i] + term[i + 2:]
+    return term[:i] + rng.choice(LETTERS) + term[i + 1:]
+
+
+def bench(n: int) -> None:
+    rng = random.Random(n)
+    terms: List[str] = []
+    seen = set()
+    while len(terms) < n:
+        t = _term(rng) + (str(len(terms) % 7) if len(seen) > n // 2 else "")
+        if t not in seen:
+            seen.add(t)
+            terms.append(t)
+
+    index = FuzzyIndex()
+    started = time.perf_counter()
+    for i, term in enumerate(terms):
+        index.add(f"k{i}", [term])
+    build_s = time.perf_counter() - started
+
+    queries = [_typo(rng, rng.choice(terms)) for _ in range(20)]
+    print(f"{n:>7} terms  build {build_s:6.2f}s")
+    for k in (1, 2):
+        started = time.perf_counter()
+        hits = 0
+        for q in queries:
+            hits += len(index.search(q, k))
+        tree_ms = (time.perf_counter() - started) * 1e3 / len(queries)
+
+        scan_queries = queries[:5]
+        started = time.perf_counter()
+        for q in scan_queries:
+            dist = distance_to(q)
+            [t for t in terms if dist(t) <= k]
+        scan_ms = (time.perf_counter() - started) * 1e3 / len(scan_queries)
+        print(f"        k={k}  bk-tree {tree_ms:8.2f} ms/query  scan {scan_ms:8.2f} ms/query"
+              f"  speedup x{scan_ms / max(tree_ms, 1e-9):.1f}  avg hits {hits / len(queries):.1f}")
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    for n in sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark glossary substring search: linear scan vs trigram index.
+
+Indexes synthetic entries in memory (nothing is read from or written to data/)
+and times GlossaryIndex.search() with and without the trigram postings.
+
+Usage:
+  python scripts/bench_glossary_search.py                 # 1k / 10k / 100k entries
+  python scripts/bench_glossary_search.py 5000 20000      # custom sizes
+"""
+from __future__ import annotations
+import random
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.glossary_store import GlossaryIndex, _norm
+
+SYLLABLES = ["ba", "che", "chi", "co", "da", "fa", "gu", "ja", "la", "lle", "ma", "ña", "no", "pi",
+             "que", "ra", "rro", "sa", "ta", "to", "va", "ye", "zo", "ción", "ón", "ero", "ita"]
+WORDS_EN = ["money", "friend", "steal", "party", "work", "bus", "guy", "girl", "food", "drink",
+            "angry", "tired", "cheap", "fast", "slowly", "house", "street", "boss", "joke", "lie"]
+COUNTRIES = ["AR", "UY", "CL", "MX", "ES", "CO", "PE"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def synthetic_entries(n: int, seed: int = 7) -> List[Tuple[str, Dict[str, Any]]]:
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        word = _word(rng)
+        slug = f"{_norm(word)}-{i}"
+        out.append((slug, {
+            "word": word,
+            "slug": slug,
+            "alt_spellings": [_word(rng)] if rng.random() < 0.2 else [],
+            "senses": [{
+                "countries": rng.sample(COUNTRIES, rng.randint(1, 2)),
+                "definition_es": " ".join(_word(rng) for _ in range(rng.randint(4, 10))),
+                "definition_en": " ".join(rng.choice(WORDS_EN) for _ in range(rng.randint(4, 10))),
+                "alt_forms": [{"form": _word(rng)}] if rng.random() < 0.1 else [],
+            }],
+        }))
+    return out
+
+
+def _time(fn, queries: List[str], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - started) / (repeat * len(queries))
+
+
+def bench(n: int) -> None:
+    entries = synthetic_entries(n)
+    index = GlossaryIndex()
+    started = time.perf_counter()
+    index.load(entries)
+    build_s = time.perf_counter() - started
+
+    rng = random.Random(n)
+    queries = [_norm(_word(rng))[:rng.randint(3, 6)] for _ in range(40)] + ["money", "friend", "chey", "xyz"]
+    repeat = max(1, 20000 // n)
+    scan = _time(lambda q: index.search(q, use_trigrams=False), queries, repeat)
+    tri = _time(lambda q: index.search(q), queries, repeat)
+    # Typical public call: one country, capped result list
+    scan_c = _time(lambda q: index.search(q, "AR", None, 2000, use_trigrams=False), queries, repeat)
+    tri_c = _time(lambda q: index.search(q, "AR", None, 2000), queries, repeat)
+
+    print(f"{n:>7} entries  build {build_s:6.2f}s  grams {len(index.trigrams.postings):>6}")
+    print(f"        scan    {scan * 1e3:8.3f} ms/query   country=AR {scan_c * 1e3:8.3f} ms/query")
+    print(f"        trigram {tri * 1e3:8.3f} ms/query   country=AR {tri_c * 1e3:8.3f} ms/query"
+          f"   speedup x{scan / max(tri, 1e-9):.1f}")
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    for n in sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
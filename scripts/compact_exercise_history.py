@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Convert exercise version history to reverse deltas / gzip keyframes
+(app.exercises_store.compact_history). The latest and current version of each
+exercise stay plain; load_exercise() rebuilds older versions transparently.
+New saves compact the previous version on their own (job
+"exercises.compact_history"); this converts existing history in bulk.
+
+Prints disk usage before/after and the time to rebuild every version.
+
+Usage:
+  python scripts/compact_exercise_history.py            # compact every exercise
+  python scripts/compact_exercise_history.py --check    # list plain older versions, no writes
+"""
+import os
+import sys
+import time
+
+from app.exercises_store import (
+    _base_path,
+    _current_path,
+    _list_versions,
+    _version_path,
+    compact_history,
+    load_exercise,
+)
+
+
+def _exercises():
+    base = _base_path()
+    for ex_type in sorted(os.listdir(base)) if os.path.isdir(base) else []:
+        type_dir = os.path.join(base, ex_type)
+        if ex_type.startswith(('_', '.')) or not os.path.isdir(type_dir):
+            continue
+        for slug in sorted(os.listdir(type_dir)):
+            if os.path.exists(_current_path(ex_type, slug)):
+                yield ex_type, slug
+
+
+def _rebuild_times(ex_type, slug):
+    out = []
+    for ver in _list_versions(ex_type, slug):
+        t0 = time.perf_counter()
+        ok = load_exercise(ex_type, slug, ver) is not None
+        out.append(((time.perf_counter() - t0) * 1000, ok))
+    return out
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv[1:]:
+        pending = 0
+        for ex_type, slug in _exercises():
+            vers = _list_versions(ex_type, slug)
+            plain = [v for v in vers[:-1] if os.path.exists(_version_path(ex_type, slug, v))]
+            if plain:
+                pending += len(plain)
+                print(f'{ex_type}/{slug}: {len(plain)} plain older version(s)')
+        print(f'{pending} version(s) to compact')
+        sys.exit(1 if pending else 0)
+
+    before = after = converted = 0
+    times = []
+    for ex_type, slug in _exercises():
+        st = compact_history(ex_type, slug)
+        before += st['bytes_before']
+        after += st['bytes_after']
+        converted += st['converted']
+        if st['converted']:
+            print(f'{ex_type}/{slug}: {st["converted"]}/{st["versions"]} converted, '
+                  f'{st["bytes_before"]} -> {st["bytes_after"]} bytes')
+        times.extend(_rebuild_times(ex_type, slug))
+
+    saved = before - after
+    print(f'{converted} version(s) converted; history {before} -> {after} bytes '
+          f'({saved} saved, {100 * saved / max(before, 1):.1f}%)')
+    failed = sum(1 for _, ok in times if not ok)
+    if times:
+        ms = sorted(t for t, _ in times)
+        print(f'rebuild latency over {len(ms)} version(s): median {ms[len(ms) // 2]:.2f} ms, '
+              f'max {ms[-1]:.2f} ms')
+    if failed:
+        print(f'{failed} version(s) failed to load')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Compact the exercise index: fold each type's append-only journal
+(data/exercises/_index/<type>.journal.jsonl) into its snapshot. A legacy
+index.json is migrated into shards first. Writers also compact on their own
+once a journal passes EXERCISES_JOURNAL_COMPACT_OPS; run this from cron to keep
+journals short on quiet libraries.
+
+Usage:
+  python scripts/compact_exercise_index.py            # compact every non-empty journal
+  python scripts/compact_exercise_index.py --check    # report pending journal ops, no writes
+"""
+import sys
+
+from app.exercises_store import _current_shard, _index_path, _shard_types, compact_index, exercise_index
+
+if __name__ == '__main__':
+    if '--check' in sys.argv[1:]:
+        import os
+        if os.path.exists(_index_path()):
+            print('legacy index.json (not migrated yet)')
+            sys.exit(1)
+        pending = 0
+        for ex_type in _shard_types():
+            shard, _ = _current_shard(ex_type)
+            ops = shard.seq - shard.snap_seq
+            pending += ops
+            print(f'{ex_type:<10} {len(shard.entries):>6} entries  {ops:>5} journal op(s)')
+        sys.exit(1 if pending else 0)
+    before = dict(exercise_index().entries)
+    folded = compact_index(force=True)
+    for ex_type, ops in sorted(folded.items()):
+        print(f'{ex_type:<10} folded {ops} op(s)')
+    ok = dict(exercise_index().entries) == before
+    print('ok' if ok else 'MISMATCH after compaction')
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Load test for lesson attempt/progress writes: N concurrent learners (threads,
+one Flask test client each) answer a lesson through POST /api/lessons/<id>/attempt
+and /progress, against a temporary SQLite database (instance/ is not touched).
+
+Modes
+  sync    LESSON_WRITE_BEHIND=false: every request writes its own transaction
+  behind  write-behind buffer (domains/lessons/writes.py) with a spool dir
+
+A share of attempts is re-sent with the same attempt id (client retries), so the
+run also checks idempotency: afterwards the table must hold exactly one row per
+distinct attempt id, and one completed progress row per learner.
+
+Usage:
+  python scripts/loadtest_lesson_writes.py                     # 1000 learners x 20 answers, both modes
+  python scripts/loadtest_lesson_writes.py 1000 20 behind      # learners, answers each, mode
+"""
+from __future__ import annotations
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+DUP_RATE = 0.05       # share of attempts re-sent with the same attempt id
+PROGRESS_EVERY = 5    # answers between progress updates
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))] if values else 0.0
+
+
+def run(mode: str, learners: int, answers: int) -> bool:
+    tmp = tempfile.mkdtemp(prefix="ppx-lesson-writes-")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'load.db')}",
+        "JOBS_ENABLED": "false",
+        "LESSON_WRITE_BEHIND": "true" if mode == "behind" else "false",
+        "LESSON_WRITES_SPOOL_DIR": os.path.join(tmp, "spool"),
+    })
+    # config.py reads the environment at import time: import fresh for each mode
+    for name in [m for m in sys.modules if m in ("config", "app", "domains") or m.startswith(("app.", "domains."))]:
+        del sys.modules[name]
+    from app import create_app
+    from app.extensions.db import db
+    from domains.lessons.api import learner_token
+    from domains.lessons.models import Lesson, UserAttempt, UserProgress
+    from domains.lessons.writes import write_buffer
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        lesson = Lesson(slug="loadtest", title="Load test", status="published", json={"slides": []})
+        db.session.add(lesson)
+        db.session.commit()
+        lesson_id = lesson.id
+        tokens = [learner_token(i + 1) for i in range(learners)]
+
+    latencies = []
+    statuses = {}
+    sent_ids, accepted_ids = set(), set()
+    lock = threading.Lock()
+    barrier = threading.Barrier(learners)
+
+    def learner(i: int) -> None:
+        rng = random.Random(i)
+        client = app.test_client()
+        lat, codes, ids, accepted = [], {}, [], []
+
+        def post(path, body):
+            t0 = time.perf_counter()
+            r = client.post(f"/api/lessons/{lesson_id}/{path}", json=body,
+                            headers={"X-Learner-Token": tokens[i]})
+            lat.append((time.perf_counter() - t0) * 1000)
+            codes[r.status_code] = codes.get(r.status_code, 0) + 1
+            return r.status_code
+
+        barrier.wait()
+        for n in range(answers):
+            body = {"slide_id": f"s{n + 1}", "attempt_id": f"{i + 1}-{n + 1}",
+                    "correct": rng.random() < 0.7, "score_delta": 1.0, "answer": rng.choice("abcd")}
+            ids.append(body["attempt_id"])
+            codes_sent = [post("attempt", body)]
+            if rng.random() < DUP_RATE:
+                codes_sent.append(post("attempt", body))
+            if 202 in codes_sent:
+                accepted.append(body["attempt_id"])
+            if (n + 1) % PROGRESS_EVERY == 0 or n + 1 == answers:
+                post("progress", {"current_slide": f"s{n + 1}",
+                                  "score": float(n + 1), "completed": n + 1 == answers})
+        with lock:
+            latencies.extend(lat)
+            sent_ids.update((i + 1, a) for a in ids)
+            accepted_ids.update((i + 1, a) for a in accepted)
+            for code, c in codes.items():
+                statuses[code] = statuses.get(code, 0) + c
+
+    threads = [threading.Thread(target=learner, args=(i,)) for i in range(learners)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    served = time.perf_counter() - t0
+    write_buffer.stop()  # final drain (no-op in sync mode)
+    if not write_buffer.is_running():
+        write_buffer.flush()  # sync mode: rows kept queued by a failed inline write
+    drained = time.perf_counter() - t0
+    metrics = write_buffer.metrics()
+
+    with app.app_context():
+        stored = db.session.query(UserAttempt.user_id, UserAttempt.attempt_uid).all()
+        progress = db.session.query(UserProgress).all()
+    db_ids = {tuple(r) for r in stored}
+    # Every accepted attempt stored exactly once; refused ones (503) may still have been kept queued
+    ok = (len(stored) == len(db_ids) and accepted_ids <= db_ids <= sent_ids
+          and len(progress) == learners and all(p.completed for p in progress))
+
+    requests = len(latencies)
+    print(f"\n[{mode}] {learners} learners x {answers} answers: {requests} requests in {served:.2f}s "
+          f"({requests / served:.0f} req/s); all rows committed after {drained:.2f}s")
+    print(f"  request latency ms  p50 {_pct(latencies, .5):.1f}  p95 {_pct(latencies, .95):.1f}  "
+          f"p99 {_pct(latencies, .99):.1f}  max {max(latencies):.1f}")
+    print(f"  status codes        {dict(sorted(statuses.items()))}")
+    print(f"  batches {metrics['batches']}  rows/batch {metrics['batch_rows']}  "
+          f"flush ms {metrics['flush_latency_ms']}  lag ms {metrics['lag_ms']}")
+    print(f"  coalesced in buffer {metrics['coalesced']}  failures {metrics['failures']}  "
+          f"dropped {metrics['dropped']}")
+    print(f"  stored attempts {len(stored)} (distinct ids sent {len(sent_ids)}, "
+          f"accepted {len(accepted_ids)}), progress rows {len(progress)}: {'ok' if ok else 'MISMATCH'}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    return ok
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    n_learners = int(args[0]) if len(args) > 0 else 1000
+    n_answers = int(args[1]) if len(args) > 1 else 20
+    modes = [args[2]] if len(args) > 2 else ["sync", "behind"]
+    results = [run(m, n_learners, n_answers) for m in modes]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Convert legacy data/articles/<slug>/article.json folders to the sharded layout
+(manifest.json + shards/ per language and per module). Already-sharded folders
+are skipped; reads stay compatible either way (app.storage.load_article).
+article.json is only removed once the shards read back equal to it; a FAILED
+article keeps its article.json.
+
+Usage:
+  python scripts/migrate_articles_to_shards.py            # migrate every article
+  python scripts/migrate_articles_to_shards.py --check    # list legacy folders, no writes
+"""
+import sys
+
+from app.storage import article_json_path, list_slugs, migrate_article_to_shards
+
+if __name__ == '__main__':
+    check = '--check' in sys.argv[1:]
+    legacy = [s for s in list_slugs('articles') if article_json_path(s).exists()]
+    if check:
+        for slug in legacy:
+            print(f'legacy  {slug}')
+        print(f'{len(legacy)} legacy article(s)')
+        sys.exit(1 if legacy else 0)
+    failed = 0
+    for slug in legacy:
+        ok = migrate_article_to_shards(slug)  # verified before article.json is removed
+        print(f'{"ok" if ok else "FAILED"}  {slug}')
+        failed += 0 if ok else 1
+    print(f'{len(legacy) - failed} migrated, {failed} failed')
+    sys.exit(1 if failed else 0)
@@ -1,7 +1,21 @@
 #!/usr/bin/env python3
-from app.glossary_store import rebuild_indexes
+"""
+Full rebuild of the derived glossary indexes (by_country, country views, search.json, _master/all.json).
+
+Usage:
+  python scripts/rebuild_glossary_indexes.py           # full rebuild
+  python scripts/rebuild_glossary_indexes.py --check   # compare on-disk indexes with a full rebuild, no writes
+"""
+import sys
+
+from app.glossary_store import rebuild_indexes, check_indexes
 
 if __name__ == '__main__':
+    if '--check' in sys.argv[1:]:
+        problems = check_indexes()
+        for p in problems:
+            print(f'! {p}')
+        print('consistent' if not problems else f'{len(problems)} problem(s)')
+        sys.exit(1 if problems else 0)
     ok = rebuild_indexes()
     print('ok' if ok else 'failed')
-
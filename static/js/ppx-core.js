@@ -122,6 +122,12 @@
         const url = version
           ? `/admin/api/exercises/${encodeURIComponent(type)}/${encodeURIComponent(slug)}?version=${encodeURIComponent(version)}`
           : `/admin/api/exercises/${encodeURIComponent(type)}/${encodeURIComponent(slug)}`;
+        // Public pages read the published version through the cacheable public API
+        // (redirects to an immutable /v/NNN URL); admin previews need drafts.
+        const isAdminPage = (W.location && W.location.pathname || '').startsWith('/admin');
+        const publicUrl = (!version && !isAdminPage && !(context && context.source === 'admin-preview'))
+          ? `/exercises/api/${encodeURIComponent(type)}/${encodeURIComponent(slug)}`
+          : null;
 
         // Open modal early with skeleton to guarantee layout stability
         PPXModal.open({
@@ -138,10 +144,15 @@
         });
 
         const t0 = performance.now();
-        // Avoid cached payloads: add cache-busting param and request no-store
-        const bust = `_=${Date.now()}`;
-        const urlBusted = url + (url.includes('?') ? '&' : '?') + bust;
-        const res = await fetch(urlBusted, { headers: { 'Accept': 'application/json' }, credentials: 'same-origin', cache: 'no-store' });
+        let res = publicUrl
+          ? await fetch(publicUrl, { headers: { 'Accept': 'application/json' }, credentials: 'same-origin' })
+          : null;
+        if (!res || res.status === 404) {
+          // Admin/draft path: add cache-busting param and request no-store
+          const bust = `_=${Date.now()}`;
+          const urlBusted = url + (url.includes('?') ? '&' : '?') + bust;
+          res = await fetch(urlBusted, { headers: { 'Accept': 'application/json' }, credentials: 'same-origin', cache: 'no-store' });
+        }
         if (!res.ok) {
           throw new Error(`HTTP ${res.status}`);
         }
@@ -0,0 +1,33 @@
+# tests/test_exercise_index_journal.py
+"""Exercise index journal: appends after a crashed writer's partial line."""
+import app.exercises_store as es
+import app.storage as storage
+
+
+def _tf(slug):
+    return {"type": "tf", "slug": slug, "title_es": "x", "instructions_es": "y", "status": "published",
+            "items": [{"statement_es": "a", "answer": "true", "order": 1}]}
+
+
+def test_append_after_torn_journal_line(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "get_data_root", lambda: tmp_path)
+    monkeypatch.setattr(es, "_shards", {})
+    monkeypatch.setattr(es, "_index_view", None)
+
+    assert es.save_exercise(_tf("prueba-1"))[0]
+    es.exercise_index()
+    with open(es._journal_path("tf"), "a", encoding="utf-8") as f:
+        f.write('{"seq":2,"op":"put","key":"tf/crashed"')  # writer died mid-append
+    assert es.save_exercise(_tf("prueba-2"))[0]
+    assert es.save_exercise(_tf("prueba-3"))[0]
+
+    with open(es._journal_path("tf"), "rb") as f:
+        data = f.read()
+    assert b"tf/crashed" not in data and data.endswith(b"\n")
+    for fresh in (False, True):
+        if fresh:
+            es._shards.clear()
+            es._index_view = None
+        entries = es.exercise_index().entries
+        assert {"tf/prueba-1", "tf/prueba-2", "tf/prueba-3"} <= set(entries)
+        assert "tf/crashed" not in entries